@@ -0,0 +1,153 @@
+"""
+Operational diagnostics endpoints (admin only).
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.core.audit import audit_logger
+from app.core.loop_monitor import loop_monitor
+from app.core.vault import vault_client
+from app.core.lease_revoker import lease_revoker
+from app.core.github_ratelimit import github_rate_limiter
+from app.core.github_cache import github_cache, github_refresher
+from app.core.dns_cache import dns_cache
+from app.core.github_sync import github_repo_sync
+from app.core.refresh_tokens import refresh_token_store
+from app.core.token_denylist import token_denylist
+from app.middleware.admission import admission_controller
+from app.middleware.auth import require_admin, CurrentUser
+
+router = APIRouter()
+
+
+@router.get(
+    "/admin/loop",
+    summary="Event-loop lag and stalls",
+    description="Event-loop lag histogram and recent blocking-call offenders with stacks (admin only)"
+)
+async def get_loop_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get event-loop lag statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns lag histogram, recent stalls and top offenders by blocked time
+    """
+    return loop_monitor.snapshot()
+
+
+@router.get(
+    "/admin/vault",
+    summary="Vault client call coalescing and circuit",
+    description="Single-flight counters for Vault reads and re-authentication, plus circuit breaker state (admin only)"
+)
+async def get_vault_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get Vault client statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns executed vs coalesced calls per operation and breaker/retry/hedge counters
+    """
+    return vault_client.get_stats()
+
+
+@router.get(
+    "/admin/leases",
+    summary="Lease revocation queue",
+    description="Pending and completed background lease revocations (admin only)"
+)
+async def get_lease_revocation_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get lease revocation queue statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns pending leases, the highest retry attempt count and revoked/failed/expired totals
+    """
+    return lease_revoker.get_stats()
+
+
+@router.get(
+    "/admin/github",
+    summary="GitHub quota, cache, refresher and repo sync",
+    description="Rate-limit state per GitHub token, cache hit ratio, background refresh and repo sync counters (admin only)"
+)
+async def get_github_quota_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get GitHub rate-limit statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns remaining quota, reset time and delayed/rejected counts per user,
+      plus cache hit ratio, background refresher and repo sync counters
+    """
+    return {
+        **github_rate_limiter.get_stats(),
+        "cache": github_cache.get_stats(),
+        "refresher": github_refresher.get_stats(),
+        "sync": github_repo_sync.get_stats(),
+    }
+
+
+@router.get(
+    "/admin/admission",
+    summary="Admission control and load shedding",
+    description="Adaptive concurrency limits, queue depth and shed/rate-limited counts per route group (admin only)"
+)
+async def get_admission_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get admission control statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns current limit, in-flight and waiting requests, shed counts and
+      token-bucket rejections per route group
+    """
+    return admission_controller.get_stats()
+
+
+@router.get(
+    "/admin/auth",
+    summary="Token refresh and revocation",
+    description="Refresh token rotation counters and access token denylist state (admin only)"
+)
+async def get_auth_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get token statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns refresh token issue/rotate/reuse counts, plus denylist buckets,
+      filter hits, confirmed revocations and false positives
+    """
+    return {
+        "refresh_tokens": refresh_token_store.get_stats(),
+        "denylist": token_denylist.get_stats(),
+    }
+
+
+@router.get(
+    "/admin/dns",
+    summary="Outbound DNS cache",
+    description="Cached names, hit rate, negative hits and evictions of the shared DNS cache (admin only)"
+)
+async def get_dns_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get DNS cache statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns entries, hits, negative hits, misses, failures, evictions,
+      hit rate and lookups coalesced while in flight
+    """
+    return dns_cache.get_stats()
+
+
+@router.get(
+    "/admin/audit",
+    summary="Audit log writer",
+    description="Audit event queue, write counts and partition maintenance (admin only)"
+)
+async def get_audit_stats(current_user: CurrentUser = Depends(require_admin)):
+    """
+    Get audit log statistics.
+
+    - Protected route (requires ADMIN_USERNAMES membership)
+    - Returns queued, written and dropped events, write failures, and the
+      partitions created/dropped by the last maintenance pass
+    """
+    return audit_logger.get_stats()
@@ -0,0 +1,58 @@
+"""
+Audit log endpoints (the current user's own history).
+"""
+
+import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+
+from app.core.audit import encode_cursor, decode_cursor
+from app.core.database import db_manager
+from app.middleware.auth import get_current_user, CurrentUser
+from app.models.queries import get_audit_events
+from app.models.schemas import AuditEvent, AuditEventPage
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get(
+    "/audit",
+    response_model=AuditEventPage,
+    status_code=status.HTTP_200_OK,
+    summary="List audit events",
+    description="Page through the current user's audit events, newest first (protected route)"
+)
+async def list_audit_events(
+    action: Optional[str] = Query(None, max_length=100, description="Only events with this action (e.g. login)"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="next_cursor from the previous page"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    List the current user's audit events.
+
+    - Protected route (requires JWT token)
+    - Keyset-paginated on (created_at, id): every page is an index range scan
+      of the newest partitions it needs, however long the history
+    - Optionally filtered by action
+    - Events are written in the background, so one from the last moment may
+      not be listed yet
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    # One extra row tells whether there is a next page
+    async with db_manager.get_session(readonly=True) as session:
+        rows = await get_audit_events(session, current_user.user_id, limit + 1, action=action, after=after)
+
+    items = [AuditEvent.model_validate(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+
+    return AuditEventPage(items=items, next_cursor=next_cursor)
@@ -2,15 +2,27 @@
 Authentication endpoints (register, login, user info).
 """
 
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, status, Depends, Response
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from sqlalchemy.engine import Row
+
+from app.config import settings
+from app.core.audit import audit_logger
 from app.core.database import db_manager
-from app.core.auth import hash_password, verify_password, create_access_token, get_token_expiration_seconds, set_auth_cookie, clear_auth_cookie
+from app.core.auth import (
+    hash_password, verify_password, create_access_token, get_token_expiration_seconds,
+    set_auth_cookie, clear_auth_cookie, set_refresh_cookie, clear_refresh_cookie,
+)
+from app.core.password_hashing import password_hasher
+from app.core.refresh_tokens import refresh_token_store, RefreshTokenError
+from app.core.token_denylist import token_denylist
+from app.middleware.admission import client_ip
 from app.middleware.auth import get_current_user, CurrentUser
 from app.models.models import User
+from app.models.queries import get_user_by_username, get_user_by_id, find_user_conflict, update_password_hash
 from app.models.schemas import UserCreate, UserLogin, UserResponse, TokenResponse, AuthResponse, MessageResponse
 
 logger = logging.getLogger(__name__)
@@ -31,37 +43,28 @@ async def register(user_data: UserCreate):
 
     - Validates username, email, and password
     - Checks if username or email already exists
-    - Hashes password with bcrypt
+    - Hashes password (configured scheme/cost, in a worker thread)
     - Creates user in database
     - Returns success message (user must login to get token)
     """
     async with db_manager.get_session() as session:
-        # Check if username already exists
-        result = await session.execute(
-            select(User).where(User.username == user_data.username)
-        )
-        existing_user = result.scalar_one_or_none()
+        # Check if username or email already exists (single query)
+        conflict = await find_user_conflict(session, user_data.username, user_data.email)
 
-        if existing_user:
+        if conflict == "username":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already registered"
             )
 
-        # Check if email already exists
-        result = await session.execute(
-            select(User).where(User.email == user_data.email)
-        )
-        existing_email = result.scalar_one_or_none()
-
-        if existing_email:
+        if conflict == "email":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
-        # Hash password
-        password_hash = hash_password(user_data.password)
+        # Hash password (CPU-bound - keep it off the event loop)
+        password_hash = await asyncio.to_thread(hash_password, user_data.password)
 
         # Create new user
         new_user = User(
@@ -80,6 +83,31 @@ async def register(user_data: UserCreate):
         )
 
 
+async def _rehash_password(user_id: int, username: str, password: str) -> None:
+    """Store a hash with the current scheme/cost. Failures only log - the login already succeeded."""
+    try:
+        # The hash came from the replica - a login moments ago may already have
+        # upgraded it on the primary
+        async with db_manager.get_session() as session:
+            current = await get_user_by_username(session, username)
+        if current is None or not password_hasher.needs_rehash(current.password_hash):
+            return
+        password_hash = await asyncio.to_thread(hash_password, password)
+        async with db_manager.get_session() as session:
+            await update_password_hash(session, user_id, password_hash)
+            await session.commit()
+        logger.info(f"🔄 Password hash upgraded for user {user_id} "
+                    f"({password_hasher.scheme}, cost {password_hasher.cost})")
+    except Exception as e:
+        logger.warning(f"⚠️  Password rehash failed for user {user_id}: {e}")
+
+
+async def _get_login_user(username: str, readonly: bool) -> Optional[Row]:
+    """Login columns for a username, from the replica (readonly) or the primary."""
+    async with db_manager.get_session(readonly=readonly) as session:
+        return await get_user_by_username(session, username)
+
+
 @router.post(
     "/login",
     response_model=AuthResponse,
@@ -87,56 +115,105 @@ async def register(user_data: UserCreate):
     summary="User login",
     description="Authenticate user and set httpOnly cookie with JWT token"
 )
-async def login(login_data: UserLogin, response: Response):
+async def login(login_data: UserLogin, request: Request, response: Response):
     """
     User login.
 
     - Validates username and password
     - Fetches user from database
-    - Verifies password with bcrypt
-    - Generates JWT token
-    - Sets httpOnly cookie (token NOT returned in response body)
+    - Verifies password (in a worker thread)
+    - Re-hashes it if the stored scheme/cost is outdated
+    - Generates JWT token and a rotating refresh token
+    - Sets httpOnly cookies (tokens NOT returned in response body)
+    - Records the login (or failed attempt) in the audit log
     - Returns success message and user data
     """
-    async with db_manager.get_session() as session:
-        # Fetch user by username
-        result = await session.execute(
-            select(User).where(User.username == login_data.username)
+    # Fetch user by username (login columns only). A replica miss is checked on
+    # the primary - the user may have just registered and the replica lag behind
+    user = await _get_login_user(login_data.username, readonly=True)
+    if not user:
+        user = await _get_login_user(login_data.username, readonly=False)
+
+    if not user:
+        logger.warning(f"Login attempt for non-existent user: {login_data.username}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
         )
-        user = result.scalar_one_or_none()
 
-        if not user:
-            logger.warning(f"Login attempt for non-existent user: {login_data.username}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password",
-            )
+    # Verify password (CPU-bound - off the event loop, with the connection already returned)
+    if not await asyncio.to_thread(verify_password, login_data.password, user.password_hash):
+        logger.warning(f"Failed login attempt for user: {login_data.username}")
+        audit_logger.record(user.id, "login_failed", ip_address=client_ip(request),
+                            user_agent=request.headers.get("user-agent"))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+        )
 
-        # Verify password
-        if not verify_password(login_data.password, user.password_hash):
-            logger.warning(f"Failed login attempt for user: {login_data.username}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password",
-            )
+    if settings.PASSWORD_REHASH_ON_LOGIN and password_hasher.needs_rehash(user.password_hash):
+        await _rehash_password(user.id, user.username, login_data.password)
+
+    # Create access token
+    token_data = {
+        "user_id": user.id,
+        "username": user.username
+    }
+    access_token = create_access_token(token_data)
 
-        # Create access token
-        token_data = {
-            "user_id": user.id,
-            "username": user.username
-        }
-        access_token = create_access_token(token_data)
+    # Set httpOnly cookies - the refresh token renews the session without another password verify
+    set_auth_cookie(response, access_token)
+    set_refresh_cookie(response, await refresh_token_store.issue(user.id))
 
-        # Set httpOnly cookie
-        set_auth_cookie(response, access_token)
+    audit_logger.record(user.id, "login", ip_address=client_ip(request), user_agent=request.headers.get("user-agent"))
+    logger.info(f"User logged in: {user.username}")
+
+    return AuthResponse(
+        message="Login successful",
+        user=UserResponse.model_validate(user)
+    )
 
-        logger.info(f"User logged in: {user.username}")
 
-        return AuthResponse(
-            message="Login successful",
-            user=UserResponse.model_validate(user)
+@router.post(
+    "/refresh",
+    response_model=AuthResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Refresh session",
+    description="Exchange the refresh token cookie for a new access token and a rotated refresh token"
+)
+async def refresh(request: Request, response: Response):
+    """
+    Refresh the session.
+
+    - Reads the httpOnly refresh token cookie (no password, no bcrypt)
+    - Rotates it; replaying an already rotated token revokes the whole login
+    - Sets fresh access and refresh cookies
+    - Returns success message and user data
+    """
+    token = request.cookies.get("refresh_token")
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated - no refresh token found",
+        )
+
+    try:
+        new_token, user = await refresh_token_store.rotate(token)
+    except RefreshTokenError as e:
+        logger.warning(f"Refresh rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
         )
 
+    set_auth_cookie(response, create_access_token({"user_id": user.id, "username": user.username}))
+    set_refresh_cookie(response, new_token)
+
+    return AuthResponse(
+        message="Session refreshed",
+        user=UserResponse.model_validate(user)
+    )
+
 
 @router.post(
     "/logout",
@@ -145,16 +222,27 @@ async def login(login_data: UserLogin, response: Response):
     summary="User logout",
     description="Clear authentication cookie and logout user"
 )
-async def logout(response: Response, current_user: CurrentUser = Depends(get_current_user)):
+async def logout(request: Request, response: Response, current_user: CurrentUser = Depends(get_current_user)):
     """
     User logout.
 
     - Protected route (requires valid JWT token)
-    - Clears the httpOnly authentication cookie
+    - Revokes the refresh token family of this login
+    - Revokes the access token itself (by jti) until it expires
+    - Clears the httpOnly authentication and refresh cookies
+    - Records the logout in the audit log
     - Returns success message
     """
+    refresh_token = request.cookies.get("refresh_token")
+    if refresh_token:
+        await refresh_token_store.revoke(refresh_token)
+    if settings.TOKEN_DENYLIST_ENABLED and current_user.jti and current_user.exp:
+        await token_denylist.revoke(current_user.jti, current_user.exp)
     clear_auth_cookie(response)
+    clear_refresh_cookie(response)
 
+    audit_logger.record(current_user.user_id, "logout", ip_address=client_ip(request),
+                        user_agent=request.headers.get("user-agent"))
     logger.info(f"User logged out: {current_user.username}")
 
     return MessageResponse(
@@ -176,12 +264,9 @@ async def get_me(current_user: CurrentUser = Depends(get_current_user)):
     - Protected route (requires valid JWT token)
     - Returns user data from database
     """
-    async with db_manager.get_session() as session:
+    async with db_manager.get_session(readonly=True) as session:
         # Fetch user from database
-        result = await session.execute(
-            select(User).where(User.id == current_user.user_id)
-        )
-        user = result.scalar_one_or_none()
+        user = await get_user_by_id(session, current_user.user_id)
 
         if not user:
             raise HTTPException(
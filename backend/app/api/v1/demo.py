@@ -4,14 +4,15 @@ Each scenario attempts a network connection from the backend pod and
 reports whether it was allowed or blocked, along with context.
 """
 
-import asyncio
-import socket
 import logging
 import time
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from urllib.parse import urlparse
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from app.core import connect_latency
+from app.core.probe_monitor import probe_monitor, tcp_probe, OPENBAO_HOST, SPIRE_SERVER_HOST
 from app.core.spire import spire_client
 from app.core.vault import vault_client
 from app.core.database import db_manager
@@ -40,19 +41,6 @@ class RotationResult(BaseModel):
     rotation_duration_ms: int
 
 
-def _tcp_probe(host: str, port: int, timeout: float = 3.0) -> bool:
-    """Returns True if TCP connection succeeds, False if blocked/timeout."""
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.settimeout(timeout)
-    try:
-        s.connect((host, port))
-        return True
-    except Exception:
-        return False
-    finally:
-        s.close()
-
-
 @router.get("/demo/scenarios", summary="List available demo scenarios")
 async def list_scenarios():
     return {
@@ -82,7 +70,7 @@ async def list_scenarios():
             {
                 "id": "dynamic-db-credentials",
                 "title": "Dynamic DB Credentials",
-                "description": "Show the ephemeral PostgreSQL credentials currently in use — issued by OpenBao, never stored anywhere, rotated every 50 minutes.",
+                "description": "Show the ephemeral PostgreSQL credentials currently in use — issued by OpenBao, never stored anywhere, renewed and rotated from the lease TTL.",
                 "expected": "allowed",
                 "category": "allowed",
             },
@@ -101,19 +89,103 @@ async def list_scenarios():
                 "expected": "blocked",
                 "category": "blocked",
             },
+            # --- LATENCY scenarios (what enforcement costs per hop) ---
+            {
+                "id": "latency-backend-to-postgres",
+                "title": "Connect Latency → PostgreSQL",
+                "description": "Sequential and concurrent TCP connects plus TLS handshakes (SSLRequest) to PostgreSQL. Compare p50/p95/p99 with Cilium enforcement on and off to see what policy adds to each hop.",
+                "expected": "allowed",
+                "category": "latency",
+            },
+            {
+                "id": "latency-backend-to-openbao",
+                "title": "Connect Latency → OpenBao",
+                "description": "Sequential and concurrent TCP connects to VAULT_ADDR, with TLS handshakes when it is HTTPS. Reports connect/handshake percentiles and failure rate.",
+                "expected": "allowed",
+                "category": "latency",
+            },
         ]
     }
 
 
+def _latency_targets() -> dict:
+    """Latency scenario -> (host, port, TLS offered, PostgreSQL SSLRequest)."""
+    vault = urlparse(settings.VAULT_ADDR)
+    return {
+        "latency-backend-to-postgres": (settings.DB_HOST, settings.DB_PORT, True, True),
+        "latency-backend-to-openbao": (
+            vault.hostname, vault.port or (443 if vault.scheme == "https" else 80), vault.scheme == "https", False,
+        ),
+    }
+
+
+def _flatten(summary: dict, prefix: str) -> dict:
+    """{"connect": {"p50_ms": 1.2}} -> {"<prefix>_connect_p50_ms": 1.2}, for the scenario card."""
+    flat = {}
+    for key, value in summary.items():
+        if key == "errors":
+            flat[f"{prefix}_errors"] = ", ".join(f"{error} x{count}" for error, count in value.items()) or "none"
+        elif isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}_{key}"))
+        else:
+            flat[f"{prefix}_{key}"] = value
+    return flat
+
+
+async def _run_latency_scenario(scenario_id: str, title: str, sequential: int, concurrent: int,
+                                tls: bool) -> ScenarioResult:
+    host, port, tls_offered, postgres = _latency_targets()[scenario_id]
+    context = connect_latency.handshake_context() if tls and tls_offered else None
+    result = await connect_latency.measure(
+        host, port, sequential=sequential, concurrent=concurrent,
+        timeout=settings.PROBE_MONITOR_TIMEOUT, tls=context, postgres=postgres,
+    )
+    seq, conc = result["sequential"], result["concurrent"]
+    attempts = seq["attempts"] + conc["attempts"]
+    failures = seq["failures"] + conc["failures"]
+    unreachable = seq["connect_failures"] + conc["connect_failures"]
+
+    def ms(value):
+        return "n/a" if value is None else f"{value} ms"
+
+    detail = (f"{sequential} sequential connects: p50 {ms(seq['connect']['p50_ms'])}, "
+              f"p95 {ms(seq['connect']['p95_ms'])}, p99 {ms(seq['connect']['p99_ms'])}. "
+              f"{concurrent} concurrent: p50 {ms(conc['connect']['p50_ms'])}, p99 {ms(conc['connect']['p99_ms'])}.")
+    if context is not None:
+        detail += f" TLS handshake p50 {ms(seq['handshake']['p50_ms'])}."
+    detail += f" {failures}/{attempts} failed."
+
+    return ScenarioResult(
+        scenario=scenario_id,
+        title=title,
+        description=f"Connect{' + TLS handshake' if context else ''} latency to {host}:{port}.",
+        status="allowed" if unreachable < attempts else "blocked",
+        detail=detail,
+        expected="allowed",
+        policy_enforced=unreachable == 0,
+        extra={"host": host, "port": port, "tls": context is not None,
+               **_flatten(seq, "sequential"), **_flatten(conc, "concurrent")},
+    )
+
+
 @router.get("/demo/run/{scenario_id}", response_model=ScenarioResult, summary="Run a demo scenario")
-async def run_scenario(scenario_id: str):
+async def run_scenario(
+    scenario_id: str,
+    sequential: int = Query(20, ge=1, le=200, description="Latency scenarios: connects made one after another"),
+    concurrent: int = Query(10, ge=1, le=100, description="Latency scenarios: connects started at once"),
+    tls: bool = Query(True, description="Latency scenarios: also time TLS handshakes where offered"),
+):
+
+    if scenario_id == "latency-backend-to-postgres":
+        return await _run_latency_scenario(scenario_id, "Connect Latency → PostgreSQL", sequential, concurrent, tls)
+
+    elif scenario_id == "latency-backend-to-openbao":
+        return await _run_latency_scenario(scenario_id, "Connect Latency → OpenBao", sequential, concurrent, tls)
 
-    if scenario_id == "backend-to-postgres":
+    elif scenario_id == "backend-to-postgres":
         host = settings.DB_HOST
         port = settings.DB_PORT
-        reachable = await asyncio.get_event_loop().run_in_executor(
-            None, _tcp_probe, host, port
-        )
+        reachable, connect_ms = await tcp_probe(host, port)
         return ScenarioResult(
             scenario=scenario_id,
             title="Backend → PostgreSQL",
@@ -122,15 +194,13 @@ async def run_scenario(scenario_id: str):
             detail=f"TCP probe to {host}:{port} {'succeeded' if reachable else 'timed out — Cilium dropped the packet'}.",
             expected="allowed",
             policy_enforced=reachable,
-            extra={"host": host, "port": port, "policy": "postgresql-ingress-policy"},
+            extra={"host": host, "port": port, "policy": "postgresql-ingress-policy", "connect_ms": round(connect_ms, 1)},
         )
 
     elif scenario_id == "backend-to-openbao":
-        host = "openbao.openbao.svc.cluster.local"
+        host = OPENBAO_HOST
         port = 8200
-        reachable = await asyncio.get_event_loop().run_in_executor(
-            None, _tcp_probe, host, port
-        )
+        reachable, connect_ms = await tcp_probe(host, port)
         return ScenarioResult(
             scenario=scenario_id,
             title="Backend → OpenBao",
@@ -139,7 +209,7 @@ async def run_scenario(scenario_id: str):
             detail=f"TCP probe to {host}:{port} {'succeeded' if reachable else 'timed out — Cilium dropped the packet'}.",
             expected="allowed",
             policy_enforced=reachable,
-            extra={"host": host, "port": port, "policy": "openbao-ingress-policy"},
+            extra={"host": host, "port": port, "policy": "openbao-ingress-policy", "connect_ms": round(connect_ms, 1)},
         )
 
     elif scenario_id == "backend-spiffe-identity":
@@ -153,29 +223,29 @@ async def run_scenario(scenario_id: str):
                 expected="allowed",
                 policy_enforced=False,
             )
-        spiffe_id = spire_client.get_spiffe_id()
-        svid = spire_client.get_svid()
-        cert = svid.cert_chain[0]
-        not_after = cert.not_valid_after_utc.isoformat() if hasattr(cert, 'not_valid_after_utc') else str(cert.not_valid_after)
-        not_before = cert.not_valid_before_utc.isoformat() if hasattr(cert, 'not_valid_before_utc') else str(cert.not_valid_before)
+        snapshot = spire_client.get_snapshot()
+        not_after = snapshot.not_after.isoformat()
         return ScenarioResult(
             scenario=scenario_id,
             title="Backend SPIFFE Identity",
             description="X.509-SVID issued by SPIRE server, rotated every hour. Used to authenticate to OpenBao.",
             status="allowed",
-            detail=f"SVID issued to {spiffe_id}, valid until {not_after}.",
+            detail=f"SVID issued to {snapshot.spiffe_id}, valid until {not_after}.",
             expected="allowed",
             policy_enforced=True,
             extra={
-                "spiffe_id": spiffe_id,
-                "not_before": not_before,
+                "spiffe_id": snapshot.spiffe_id,
+                "not_before": snapshot.not_before.isoformat(),
                 "not_after": not_after,
-                "trust_domain": "demo.local",
+                "seconds_to_expiry": int(snapshot.seconds_to_expiry()),
+                "trust_domain": snapshot.trust_domain,
+                "bundle_fingerprint": snapshot.bundle_fingerprint,
             },
         )
 
     elif scenario_id == "dynamic-db-credentials":
-        if not db_manager._current_lease_id:
+        primary = db_manager.primary
+        if not primary.lease_id:
             return ScenarioResult(
                 scenario=scenario_id,
                 title="Dynamic DB Credentials",
@@ -185,22 +255,25 @@ async def run_scenario(scenario_id: str):
                 expected="allowed",
                 policy_enforced=False,
             )
-        engine_url = str(db_manager._engine.url) if db_manager._engine else "unknown"
         # Extract username from SQLAlchemy URL safely
-        username = db_manager._engine.url.username if db_manager._engine else "unknown"
-        lease_short = db_manager._current_lease_id[:30] + "..." if db_manager._current_lease_id else "none"
+        username = primary.engine.url.username if primary.engine else "unknown"
+        lease_short = primary.lease_id[:30] + "..." if primary.lease_id else "none"
+        lease = primary.get_lease_info()
         return ScenarioResult(
             scenario=scenario_id,
             title="Dynamic DB Credentials",
-            description="OpenBao issues a temporary PostgreSQL user per backend instance. Credentials rotate every 50 minutes.",
+            description="OpenBao issues a temporary PostgreSQL user per backend instance. The lease is renewed while possible and rotated only near its max TTL.",
             status="allowed",
-            detail=f"Current DB user: {username}. Lease: {lease_short}. Rotates every {settings.DB_CREDENTIAL_ROTATION_INTERVAL}s.",
+            detail=f"Current DB user: {username}. Lease: {lease_short}. Expires in {lease['seconds_remaining']}s, next action: {lease['next_action']}.",
             expected="allowed",
             policy_enforced=True,
             extra={
                 "db_username": username,
                 "lease_id": lease_short,
-                "rotation_interval_seconds": settings.DB_CREDENTIAL_ROTATION_INTERVAL,
+                "lease_ttl_seconds": lease['lease_duration'],
+                "lease_remaining_seconds": lease['seconds_remaining'],
+                "lease_renewable": lease['renewable'],
+                "next_lease_action": lease['next_action'],
                 "db_host": settings.DB_HOST,
                 "db_name": settings.DB_NAME,
             },
@@ -208,11 +281,9 @@ async def run_scenario(scenario_id: str):
 
     elif scenario_id == "blocked-spire-direct":
         # SPIRE server gRPC port — only spire-system agents are allowed by policy
-        host = "spire-server.spire-system.svc.cluster.local"
+        host = SPIRE_SERVER_HOST
         port = 8081
-        reachable = await asyncio.get_event_loop().run_in_executor(
-            None, _tcp_probe, host, port, 3.0
-        )
+        reachable, _ = await tcp_probe(host, port, 3.0)
         return ScenarioResult(
             scenario=scenario_id,
             title="Unauthorised → SPIRE Server",
@@ -233,9 +304,7 @@ async def run_scenario(scenario_id: str):
         host = "postgresql.99-apps.svc.cluster.local"
         port = 5432
         # Backend is allowed, so we explain the simulation explicitly
-        reachable = await asyncio.get_event_loop().run_in_executor(
-            None, _tcp_probe, host, port, 3.0
-        )
+        reachable, _ = await tcp_probe(host, port, 3.0)
         return ScenarioResult(
             scenario=scenario_id,
             title="OpenBao NS → PostgreSQL (Simulated)",
@@ -268,27 +337,50 @@ async def run_scenario(scenario_id: str):
         )
 
 
+@router.get("/demo/monitor", summary="Background probe history for all scenarios")
+async def get_monitor():
+    """
+    Aggregates from the background probe monitor, served from memory.
+
+    - Per monitored scenario: last sample, connect rate, share of probes matching
+      the expected outcome, connect latency percentiles and outcome transitions
+    """
+    return probe_monitor.get_stats()
+
+
+@router.get("/demo/monitor/{scenario_id}", summary="Background probe history for one scenario")
+async def get_monitor_history(scenario_id: str, limit: int = Query(120, ge=1, le=settings.PROBE_MONITOR_HISTORY)):
+    """
+    Recent probe samples (newest first) and aggregates for one scenario.
+    """
+    history = probe_monitor.get_history(scenario_id, limit)
+    if history is None:
+        raise HTTPException(status_code=404, detail=f"Scenario '{scenario_id}' is not monitored")
+    return history
+
+
 @router.post("/demo/rotate-credentials", response_model=RotationResult, summary="Force-rotate database credentials")
 async def rotate_credentials():
     """
     Immediately rotate the database credentials via OpenBao.
     Returns the old and new ephemeral PostgreSQL usernames so you can see the change live.
     """
-    if not db_manager._engine:
+    primary = db_manager.primary
+    if not primary.engine:
         raise HTTPException(status_code=503, detail="Database manager not connected")
 
-    old_username = db_manager._engine.url.username or "unknown"
-    old_lease_id = db_manager._current_lease_id or "none"
+    old_username = primary.engine.url.username or "unknown"
+    old_lease_id = primary.lease_id or "none"
 
     start = time.monotonic()
     try:
-        await db_manager._rotate_credentials()
+        await primary.rotate_credentials()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Rotation failed: {e}")
 
     duration_ms = int((time.monotonic() - start) * 1000)
-    new_username = db_manager._engine.url.username or "unknown"
-    new_lease_id = db_manager._current_lease_id or "none"
+    new_username = primary.engine.url.username or "unknown"
+    new_lease_id = primary.lease_id or "none"
 
     logger.info(f"Manual credential rotation complete: {old_username} → {new_username} in {duration_ms}ms")
 
@@ -3,20 +3,28 @@ GitHub integration endpoints (configure, repos, user profile).
 """
 
 import logging
+import math
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Any, Awaitable, Callable, Literal, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit import audit_logger
 from app.core.database import db_manager
 from app.core.vault import vault_client
-from app.core.github import github_client, GitHubAPIError
+from app.core.github import github_client, GitHubAPIError, GitHubRateLimitError, GitHubUnavailableError
+from app.core.github_cache import github_cache, fetch_repo_index, REPOS, PROFILE
+from app.core.resilience import CircuitOpenError
+from app.middleware.admission import client_ip
 from app.middleware.auth import get_current_user, CurrentUser
 from app.models.models import User, GitHubIntegration
+from app.models.queries import delete_github_repositories, touch_github_integration
 from app.models.schemas import (
     GitHubConfigRequest,
     GitHubConfigResponse,
-    GitHubRepository,
+    GitHubRepositoryPage,
     GitHubUser,
     MessageResponse
 )
@@ -35,6 +43,7 @@ router = APIRouter()
 )
 async def configure_github(
     config_data: GitHubConfigRequest,
+    request: Request,
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
@@ -43,6 +52,8 @@ async def configure_github(
     - Protected route (requires JWT token)
     - Stores GitHub token in Vault at secret/data/github/user-{user_id}/token
     - Updates github_integrations table with configuration status
+    - Drops the repository snapshot synced with the previous token
+    - Records the change in the audit log (the token itself is never logged)
     - Returns success response with configuration timestamp
     """
     user_id = current_user.user_id
@@ -54,6 +65,9 @@ async def configure_github(
     try:
         await vault_client.write_secret(vault_path, token_data)
         logger.info(f"GitHub token stored in Vault for user {user_id}")
+        # Cached data belongs to the previous token; in-flight fetches and syncs
+        # with it are discarded (before the snapshot is dropped below)
+        github_cache.invalidate(user_id)
     except Exception as e:
         logger.error(f"Failed to store GitHub token in Vault: {e}")
         raise HTTPException(
@@ -76,6 +90,13 @@ async def configure_github(
             integration.is_configured = True
             integration.configured_at = now
             integration.updated_at = now
+            # The stored snapshot and sync state belong to the previous token -
+            # the next sync starts over with a full one
+            integration.repos_etag = None
+            integration.repos_since = None
+            integration.repos_synced_at = None
+            integration.repos_full_synced_at = None
+            await delete_github_repositories(session, user_id)
         else:
             # Create new record
             integration = GitHubIntegration(
@@ -87,6 +108,8 @@ async def configure_github(
 
         await session.commit()
 
+        audit_logger.record(user_id, "configure_github", resource_type="github", resource_id=vault_path,
+                            ip_address=client_ip(request), user_agent=request.headers.get("user-agent"))
         logger.info(f"GitHub integration configured for user {user_id}")
 
         return GitHubConfigResponse(
@@ -96,48 +119,69 @@ async def configure_github(
         )
 
 
-@router.get(
-    "/repos",
-    response_model=list[GitHubRepository],
-    status_code=status.HTTP_200_OK,
-    summary="List GitHub repositories",
-    description="Fetch user's GitHub repositories (protected route)"
-)
-async def list_repositories(current_user: CurrentUser = Depends(get_current_user)):
+async def _get_github_token(user_id: int) -> str:
     """
-    List user's GitHub repositories.
+    Read the user's GitHub token from Vault.
 
-    - Protected route (requires JWT token)
-    - Retrieves GitHub token from Vault
-    - Calls GitHub API /user/repos
-    - Updates last_accessed timestamp
-    - Returns list of repositories
+    Raises:
+        HTTPException: 404 if not configured, 503 if the Vault circuit is open
     """
-    user_id = current_user.user_id
-
-    # Retrieve token from Vault
-    vault_path = f"github/user-{user_id}/token"
-
     try:
-        token_data = await vault_client.read_secret(vault_path)
-        github_token = token_data.get("token")
-
-        if not github_token:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="GitHub token not configured. Please configure first."
-            )
-
+        token_data = await vault_client.read_secret(f"github/user-{user_id}/token")
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Secrets backend unavailable, try again later",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
     except Exception as e:
         logger.error(f"Failed to retrieve GitHub token from Vault: {e}")
+        token_data = {}
+
+    github_token = token_data.get("token")
+    if not github_token:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="GitHub token not configured. Please configure first."
         )
+    return github_token
+
 
-    # Fetch repositories from GitHub
+async def _get_cached(user_id: int, kind: str, fetch: Callable[[str, int], Awaitable[Any]]) -> Any:
+    """
+    Serve GitHub data from the cache, fetching it on a miss.
+
+    Args:
+        user_id: Owning user ID
+        kind: REPOS or PROFILE
+        fetch: Coroutine function taking the GitHub token and its generation
+
+    Raises:
+        HTTPException: 429/503 with Retry-After when GitHub is rate-limited or
+            unavailable, 502 for other GitHub errors
+    """
+    cached = github_cache.get(user_id, kind)
+    if cached is not None:
+        return cached
+
+    # Read before the token: a token change in between leaves this fetch uncached
+    generation = github_cache.generation(user_id)
+    github_token = await _get_github_token(user_id)
     try:
-        repos = await github_client.fetch_repositories(github_token)
+        return await github_cache.fetch(user_id, kind, lambda: fetch(github_token, generation), generation)
+    except GitHubRateLimitError as e:
+        # Quota exhausted - tell the client when to come back instead of a 502
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+    except GitHubUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
     except GitHubAPIError as e:
         logger.error(f"GitHub API error: {e}")
         raise HTTPException(
@@ -145,21 +189,59 @@ async def list_repositories(current_user: CurrentUser = Depends(get_current_user
             detail=str(e)
         )
 
-    # Update last_accessed timestamp
-    async with db_manager.get_session() as session:
-        result = await session.execute(
-            select(GitHubIntegration).where(GitHubIntegration.user_id == user_id)
+
+@router.get(
+    "/repos",
+    response_model=GitHubRepositoryPage,
+    status_code=status.HTTP_200_OK,
+    summary="List GitHub repositories",
+    description="Search, sort and page user's GitHub repositories (protected route)"
+)
+async def list_repositories(
+    q: Optional[str] = Query(None, max_length=100, description="Terms matched against name/description word prefixes"),
+    language: Optional[str] = Query(None, max_length=50, description="Primary language (case-insensitive)"),
+    sort: Literal["updated", "stars", "name"] = "updated",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(30, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="next_cursor from the previous page"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    List user's GitHub repositories.
+
+    - Protected route (requires JWT token)
+    - Served from the per-user cache (kept warm for active users), which holds
+      the repos indexed by sort field and name/description tokens
+    - On a miss: retrieves GitHub token from Vault, syncs the stored repo
+      snapshot incrementally from GitHub API /user/repos and indexes it; if
+      GitHub is rate-limited, down or slow, the stored snapshot is served
+      (X-Repos-Source: snapshot)
+    - Filters by q/language, sorts, and returns one page with a keyset cursor
+    - Updates last_accessed timestamp
+    - Serialized by orjson straight from the cached records (response_model
+      only documents the shape)
+    """
+    user_id = current_user.user_id
+
+    index = await _get_cached(user_id, REPOS, lambda token, generation: fetch_repo_index(
+        token, user_id, generation=generation))
+
+    try:
+        page = index.query(q=q, language=language, sort=sort, order=order, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        integration = result.scalar_one_or_none()
 
-        if integration:
-            integration.last_accessed_at = datetime.utcnow()
-            integration.updated_at = datetime.utcnow()
-            await session.commit()
+    # Update last_accessed timestamp (also marks the user active for the refresher)
+    async with db_manager.get_session() as session:
+        await touch_github_integration(session, user_id)
+        await session.commit()
 
-    logger.info(f"User {user_id} fetched {len(repos)} repositories")
+    logger.info(f"User {user_id} fetched {len(page['items'])}/{page['total']} of {len(index)} repositories")
 
-    return repos
+    return ORJSONResponse(page, headers={"X-Repos-Source": "snapshot" if index.stale else "github"})
 
 
 @router.get(
@@ -174,41 +256,15 @@ async def get_github_user(current_user: CurrentUser = Depends(get_current_user))
     Get user's GitHub profile.
 
     - Protected route (requires JWT token)
-    - Retrieves GitHub token from Vault
-    - Calls GitHub API /user
+    - Served from the per-user cache (kept warm for active users)
+    - On a miss: retrieves GitHub token from Vault and calls GitHub API /user
     - Returns GitHub user profile
     """
     user_id = current_user.user_id
 
-    # Retrieve token from Vault
-    vault_path = f"github/user-{user_id}/token"
-
-    try:
-        token_data = await vault_client.read_secret(vault_path)
-        github_token = token_data.get("token")
-
-        if not github_token:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="GitHub token not configured. Please configure first."
-            )
-
-    except Exception as e:
-        logger.error(f"Failed to retrieve GitHub token from Vault: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="GitHub token not configured. Please configure first."
-        )
-
-    # Fetch user profile from GitHub
-    try:
-        user_profile = await github_client.fetch_user_profile(github_token)
-    except GitHubAPIError as e:
-        logger.error(f"GitHub API error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=str(e)
-        )
+    user_profile = await _get_cached(
+        user_id, PROFILE, lambda token, generation: github_client.fetch_user_profile(token, user_id=user_id)
+    )
 
     logger.info(f"User {user_id} fetched GitHub profile")
 
@@ -2,11 +2,18 @@
 Health check endpoints for Kubernetes liveness/readiness probes.
 """
 
-from fastapi import APIRouter, status
+import asyncio
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from pydantic import BaseModel
+from app.config import settings
+from app.core.shutdown import shutdown_coordinator
 from app.core.spire import spire_client
 from app.core.vault import vault_client
+from app.core.github import github_client
 from app.core.database import db_manager
+from app.core.resilience import OPEN
 
 router = APIRouter()
 
@@ -18,6 +25,23 @@ class HealthResponse(BaseModel):
     spire: str = "not_initialized"
     vault: str = "not_initialized"
     database: str = "not_initialized"
+    database_replica: str = "not_configured"
+    circuits: Dict[str, str] = {}  # Circuit breaker state per outbound dependency
+    svid_expires_in: Optional[int] = None  # Seconds until the current X.509-SVID expires
+
+
+def _svid_expires_in() -> Optional[int]:
+    """Seconds to SVID expiry, read from the SPIRE snapshot (no Workload API call)."""
+    snapshot = spire_client.snapshot
+    return int(snapshot.seconds_to_expiry()) if snapshot is not None else None
+
+
+def _circuit_states() -> Dict[str, str]:
+    """Breaker state ("closed", "open", "half_open") per outbound dependency."""
+    return {
+        "vault": vault_client.guard.breaker.get_state(),
+        "github": github_client.guard.breaker.get_state(),
+    }
 
 
 @router.get(
@@ -33,11 +57,9 @@ async def health_check():
     Returns 200 if the application is running.
     Includes component status checks.
     """
-    from app.config import settings
-
     # Check component status
     spire_status = "connected" if spire_client.is_connected() else "not_initialized"
-    vault_status = "authenticated" if vault_client.is_authenticated() else "not_initialized"
+    vault_status = "authenticated" if await asyncio.to_thread(vault_client.is_authenticated) else "not_initialized"
     database_status = "connected" if await db_manager.is_healthy() else "not_initialized"
 
     return HealthResponse(
@@ -46,6 +68,9 @@ async def health_check():
         spire=spire_status,
         vault=vault_status,
         database=database_status,
+        database_replica=await db_manager.replica_status(),
+        circuits=_circuit_states(),
+        svid_expires_in=_svid_expires_in(),
     )
 
 
@@ -56,18 +81,27 @@ async def health_check():
     summary="Readiness check",
     description="Readiness check endpoint - verifies all dependencies are ready"
 )
-async def readiness_check():
+async def readiness_check(response: Response):
     """
     Readiness check endpoint.
     Returns 200 only if SPIRE, Vault, and Database are ready.
+    Returns 503 once the pod is draining for shutdown.
+    The read replica is reported but not required - reads fall back to the primary.
+    Circuit breaker states are reported; an open Vault circuit means not ready,
+    an open GitHub circuit does not (only the GitHub endpoints degrade).
     """
-    from app.config import settings
+    if shutdown_coordinator.draining:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return HealthResponse(status="draining", version=settings.APP_VERSION, circuits=_circuit_states())
+
+    circuits = _circuit_states()
 
     # Check SPIRE connection
     spire_status = "ready" if spire_client.is_connected() else "not_ready"
 
-    # Check Vault authentication
-    vault_status = "ready" if vault_client.is_authenticated() else "not_ready"
+    # Check Vault authentication (skip the round trip while its circuit is open)
+    vault_ready = circuits["vault"] != OPEN and await asyncio.to_thread(vault_client.is_authenticated)
+    vault_status = "ready" if vault_ready else "not_ready"
 
     # Check database connection
     database_status = "ready" if await db_manager.is_healthy() else "not_ready"
@@ -78,4 +112,29 @@ async def readiness_check():
         spire=spire_status,
         vault=vault_status,
         database=database_status,
+        database_replica=await db_manager.replica_status(),
+        circuits=circuits,
+        svid_expires_in=_svid_expires_in(),
     )
+
+
+@router.post(
+    "/health/drain",
+    status_code=status.HTTP_200_OK,
+    summary="Start draining",
+    description="preStop hook: flip readiness to not-ready and keep serving until the load balancer has caught up"
+)
+async def drain(request: Request):
+    """
+    Start draining for shutdown.
+
+    - Only accepted from inside the pod (loopback) - called by the preStop hook
+    - Readiness answers 503 from now on; requests are still served
+    - Returns after SHUTDOWN_PRESTOP_DELAY seconds, after which Kubernetes sends SIGTERM
+    """
+    if not request.client or request.client.host not in ("127.0.0.1", "::1"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Drain is only accepted from localhost")
+
+    shutdown_coordinator.begin_drain()
+    await asyncio.sleep(settings.SHUTDOWN_PRESTOP_DELAY)
+    return shutdown_coordinator.get_stats()
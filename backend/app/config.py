@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
+    # Optional routers - a disabled router isn't imported at all
+    DEMO_ENABLED: bool = True  # /demo/* scenario endpoints (demo UI)
+    ADMIN_API_ENABLED: bool = True  # /admin/* diagnostics
+
     # CORS (httpOnly cookie authentication requires allow_credentials=True)
     CORS_ORIGINS: list[str] = [
         "http://localhost:3000",
@@ -55,6 +59,7 @@ class Settings(BaseSettings):
     VAULT_KV_PATH: str = "secret"  # KV v2 mount path
     VAULT_DB_PATH: str = "database"  # Database secrets engine path
     VAULT_DB_ROLE: str = "backend-role"  # Database role name
+    VAULT_DB_REPLICA_ROLE: str = "backend-readonly-role"  # SELECT-only role for the read replica
 
     # PostgreSQL
     DB_HOST: str = os.getenv(
@@ -63,13 +68,31 @@ class Settings(BaseSettings):
     )
     DB_PORT: int = 5432
     DB_NAME: str = "appdb"
+    DB_REPLICA_HOST: Optional[str] = None  # Read replica for readonly sessions (unset = primary only)
+    DB_REPLICA_PORT: int = 5432
     # Dynamic credentials from Vault - no static username/password
     DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
-    DB_CREDENTIAL_ROTATION_INTERVAL: int = 3000  # 50 minutes in seconds
+    DB_WARMUP_CONNECTIONS: int = 5  # Pool connections pre-warmed with hot statements (0 disables)
+    DB_CREDENTIAL_ROTATION_INTERVAL: int = 3000  # Fallback (seconds) when Vault returns no lease TTL
+    DB_LEASE_RENEW_FRACTION: float = 0.67  # Renew/rotate after this fraction of the lease TTL has elapsed
+    DB_LEASE_JITTER: float = 0.1  # +/-10% jitter so replicas don't hit OpenBao in lockstep
+    DB_ROTATION_RETRY_BASE: int = 5  # First retry delay (seconds) after a failed renew/rotation
+    DB_ROTATION_RETRY_MAX: int = 300  # Backoff cap (seconds)
     DB_ECHO: bool = False  # SQLAlchemy SQL logging
 
+    # Graceful shutdown (app.core.shutdown)
+    SHUTDOWN_PRESTOP_DELAY: float = 5.0  # Seconds /health/drain keeps serving after flipping readiness
+    SHUTDOWN_DRAIN_TIMEOUT: float = 10.0  # Wait for background tasks before closing resources (uvicorn waits for requests)
+
+    # Background lease revocation
+    LEASE_REVOKE_BATCH_SIZE: int = 20  # Revocations issued concurrently per batch
+    LEASE_REVOKE_RETRY_BASE: int = 5  # First retry delay (seconds) after a failed revoke
+    LEASE_REVOKE_RETRY_MAX: int = 300  # Backoff cap (seconds)
+    LEASE_REVOKE_DRAIN_TIMEOUT: float = 10.0  # Final drain budget at shutdown (seconds)
+    LEASE_REVOKE_JOURNAL_PATH: Optional[str] = "/tmp/lease-revocations.json"  # Pending revocations across restarts
+
     # JWT Authentication
     JWT_SECRET_KEY: str = os.getenv(
         "JWT_SECRET_KEY",
@@ -77,12 +100,108 @@ class Settings(BaseSettings):
     )
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
-
-    # Password Hashing
-    BCRYPT_ROUNDS: int = 12
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 14  # Sliding - every refresh issues a token with a fresh expiry
+    JWT_REFRESH_REUSE_GRACE_SECONDS: int = 10  # A just-rotated token replayed this soon is a racing tab, not theft
+
+    # Access Token Revocation (app.core.token_denylist)
+    TOKEN_DENYLIST_ENABLED: bool = True
+    TOKEN_DENYLIST_SYNC_INTERVAL: float = 2.0  # Seconds before other replicas see a logout
+    TOKEN_DENYLIST_BUCKET_SECONDS: int = 900  # One filter per slice of token exp, dropped when it has passed
+    TOKEN_DENYLIST_BUCKET_CAPACITY: int = 50000  # Revocations per bucket at the sized false-positive rate (~100 KiB)
+
+    # Audit log (app.core.audit) - monthly partitions of audit_log
+    AUDIT_LOG_ENABLED: bool = True
+    AUDIT_RETENTION_MONTHS: int = 12  # Whole months kept before the current one; older partitions are dropped (0 = keep all)
+    AUDIT_PARTITIONS_AHEAD: int = 2  # Future months that always have a partition
+    AUDIT_MAINTENANCE_INTERVAL: float = 3600.0  # Seconds between partition create/drop passes
+    AUDIT_QUEUE_SIZE: int = 10000  # Events buffered for the writer; more are dropped (and counted)
+    AUDIT_BATCH_SIZE: int = 500  # Events per INSERT
+
+    # Password Hashing (app.core.password_hashing)
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # "bcrypt" or "scrypt" (memory-hard)
+    BCRYPT_ROUNDS: int = 12  # bcrypt cost (log2 rounds) unless calibrated
+    SCRYPT_LOG_N: int = 15  # scrypt cost (log2 N; 128 * r * N bytes per hash) unless calibrated
+    SCRYPT_R: int = 8
+    SCRYPT_P: int = 1
+    PASSWORD_HASH_CALIBRATE: bool = False  # Raise the cost at startup up to PASSWORD_HASH_TARGET_MS (configured cost is the floor)
+    PASSWORD_HASH_TARGET_MS: float = 250.0  # Target hash/verify latency for calibration
+    PASSWORD_REHASH_ON_LOGIN: bool = True  # Upgrade hashes with another scheme or a weaker cost on login
 
     # GitHub API
     GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_MAX_CONCURRENCY_PER_TOKEN: int = 4  # Concurrent requests per token (secondary limits punish bursts)
+    GITHUB_RATELIMIT_BACKGROUND_RESERVE: float = 0.2  # Fraction of the limit background calls leave to interactive ones
+    GITHUB_RATELIMIT_MAX_WAIT: float = 5.0  # Longest an interactive request is held back (seconds) before 429
+    GITHUB_RATELIMIT_BACKGROUND_MAX_WAIT: float = 30.0  # Same for background refreshes
+    GITHUB_SECONDARY_LIMIT_BACKOFF: int = 60  # First backoff (seconds) after a secondary limit without Retry-After
+
+    # GitHub cache + background refresh of recently active users
+    GITHUB_CACHE_TTL: int = 300  # Seconds a cached repo list/profile is served
+    GITHUB_CACHE_MAX_USERS: int = 1000  # LRU bound on cached users
+    GITHUB_REFRESH_ENABLED: bool = True
+    GITHUB_REFRESH_INTERVAL: int = 60  # Seconds between refresh cycles
+    GITHUB_REFRESH_ACTIVE_WINDOW: int = 1800  # Keep users warm this long after their last access (seconds)
+    GITHUB_REFRESH_MAX_PER_CYCLE: int = 50  # Users considered per cycle (most recently active first)
+    GITHUB_REFRESH_CONCURRENCY: int = 4  # Users refreshed in parallel
+    GITHUB_REFRESH_MIN_QUOTA: float = 0.5  # Skip tokens with less than this fraction of their quota left
+
+    # GitHub repository snapshot (github_repositories) + incremental sync
+    GITHUB_REPOS_PER_PAGE: int = 100  # /user/repos page size (GitHub maximum)
+    GITHUB_REPO_FULL_SYNC_INTERVAL: int = 86400  # Seconds between full syncs (catch deletions, star counts)
+    GITHUB_SNAPSHOT_FALLBACK_AFTER: float = 2.0  # Serve the stored snapshot if an interactive sync takes longer (seconds)
+
+    # Outbound resilience (GitHub + OpenBao): circuit breaker, retries, hedging
+    VAULT_TIMEOUT: float = 5.0  # hvac request timeout (seconds)
+    GITHUB_TIMEOUT: float = 10.0  # httpx request timeout (seconds)
+    BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open a dependency's circuit
+    BREAKER_RECOVERY_TIMEOUT: float = 30.0  # Seconds open before a half-open probe
+    RETRY_MAX_ATTEMPTS: int = 2  # Extra attempts for idempotent calls
+    RETRY_BASE_DELAY: float = 0.1  # First retry delay (seconds), doubled and jittered
+    VAULT_HEDGE_ENABLED: bool = True  # Hedge idempotent Vault reads after their p95 latency
+    GITHUB_HEDGE_ENABLED: bool = False  # Off by default - every hedge spends GitHub quota
+
+    # Admission control / load shedding for expensive routes (app.middleware.admission)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_QUEUE_SIZE: int = 32  # Requests waiting per route group before 503
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0  # Longest wait for a slot (seconds) before 503
+    ADMISSION_AUTH_MAX_CONCURRENCY: int = 4  # login/register (bcrypt is CPU-bound)
+    ADMISSION_AUTH_TARGET_LATENCY: float = 1.0  # Seconds; slower requests shrink the limit
+    ADMISSION_AUTH_IP_RATE: float = 1.0  # login/register requests per second per client IP
+    ADMISSION_AUTH_IP_BURST: int = 10
+    ADMISSION_GITHUB_MAX_CONCURRENCY: int = 32  # /github/* (Vault + GitHub)
+    ADMISSION_GITHUB_TARGET_LATENCY: float = 2.0
+    ADMISSION_DEMO_MAX_CONCURRENCY: int = 2  # /demo/run/* (multi-second socket probes)
+    ADMISSION_DEMO_TARGET_LATENCY: float = 8.0
+    ADMISSION_USER_RATE: float = 5.0  # /github and /demo/run requests per second per user
+    ADMISSION_USER_BURST: int = 20
+    ADMISSION_FORWARDED_FOR_HOPS: int = 0  # Trusted proxies appending X-Forwarded-For; the client is the Nth hop from the right (0 = peer address)
+
+    # Event-loop monitoring
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.1  # Heartbeat interval (seconds)
+    LOOP_STALL_THRESHOLD: float = 0.25  # Capture the loop thread's stack when lag exceeds this (seconds)
+    LOOP_STALL_HISTORY: int = 50  # Recent stalls kept for /admin/loop
+    LOOP_STALL_STACK_DEPTH: int = 15  # Innermost frames kept per stall
+
+    # Outbound DNS cache (app.core.dns_cache) - demo probes and GitHub client
+    # GitHub calls bypass it when HTTPS_PROXY/ALL_PROXY applies to GITHUB_API_URL (NO_PROXY honoured)
+    DNS_CACHE_TTL: float = 30.0  # Seconds an answer is reused (getaddrinfo exposes no record TTL)
+    DNS_CACHE_NEGATIVE_TTL: float = 5.0  # Seconds a failed lookup is remembered
+    DNS_CACHE_MAX_ENTRIES: int = 512
+    DNS_CLUSTER_DOMAIN: str = "cluster.local"  # *.svc.<domain> resolved as absolute names, skipping search domains
+
+    # Network-policy probe monitor (demo scenarios probed in the background)
+    PROBE_MONITOR_ENABLED: bool = True  # Only runs when DEMO_ENABLED
+    PROBE_MONITOR_INTERVAL: float = 30.0  # Seconds between probe rounds
+    PROBE_MONITOR_TIMEOUT: float = 3.0  # Connect timeout - a Cilium drop shows up as a timeout
+    PROBE_MONITOR_HISTORY: int = 2880  # Samples kept per scenario (24h at 30s)
+
+    # Admin endpoints - computed property to avoid Pydantic JSON parsing
+    @property
+    def ADMIN_USERNAMES(self) -> list[str]:
+        """Get usernames allowed on /admin endpoints from comma-separated env var."""
+        usernames_str = os.getenv("ADMIN_USERNAMES", "")
+        return [name.strip() for name in usernames_str.split(",") if name.strip()]
 
     # Logging
     LOG_LEVEL: str = "INFO"
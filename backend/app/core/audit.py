@@ -0,0 +1,279 @@
+"""
+Audit trail: buffered writes to the month-partitioned audit_log, partition
+maintenance and keyset cursors for reading a user's history.
+
+Request handlers only enqueue events; a writer task inserts them in batches,
+so auditing adds no round trip to login or logout. A maintenance task keeps
+AUDIT_PARTITIONS_AHEAD future monthly partitions in place and drops whole
+partitions older than AUDIT_RETENTION_MONTHS through audit_log_maintain()
+(init-db.sql) - retention never DELETEs rows or leaves bloat behind.
+
+Pages are read newest first by (created_at, id); a page costs an index probe
+in the newest partitions it touches whatever the total history size.
+"""
+
+import asyncio
+import base64
+import ipaddress
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.config import settings
+from app.core.database import db_manager
+from app.models.queries import insert_audit_events, maintain_audit_partitions
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop(): the writer finishes the batch it holds, then exits
+_STOP = object()
+
+
+def encode_cursor(created_at: datetime, event_id: int) -> str:
+    """Opaque cursor for the events after (created_at, event_id), newest first."""
+    return base64.urlsafe_b64encode(orjson.dumps([created_at.isoformat(), event_id])).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor issued by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, event_id = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(event_id, int):
+            raise TypeError(event_id)
+        return (datetime.fromisoformat(created_at), event_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class AuditLogger:
+    """
+    Batched audit_log writer plus the partition maintenance loop.
+    """
+
+    def __init__(self, queue_size: int = settings.AUDIT_QUEUE_SIZE, batch_size: int = settings.AUDIT_BATCH_SIZE):
+        """
+        Initialize audit logger.
+
+        Args:
+            queue_size: Events buffered before new ones are dropped
+            batch_size: Events per INSERT
+        """
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stopping = False  # _STOP has been taken off the queue
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._last_maintenance: Optional[Dict[str, Any]] = None
+        self._stats = {"recorded": 0, "written": 0, "dropped": 0, "write_failures": 0,
+                       "partitions_created": 0, "partitions_dropped": 0}
+
+    def record(
+        self,
+        user_id: Optional[int],
+        action: str,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> None:
+        """
+        Queue an audit event. Returns immediately; a no-op until start().
+
+        Args:
+            user_id: Acting user
+            action: Event name (e.g., "login", "configure_github")
+            resource_type: Kind of resource acted on
+            resource_id: Resource identifier
+            details: Additional context stored as JSONB
+            ip_address: Client address (stored as NULL if not an IP literal)
+            user_agent: Client User-Agent header
+        """
+        if self._writer_task is None:
+            return
+        if ip_address is not None:
+            try:
+                ipaddress.ip_address(ip_address)
+            except ValueError:
+                ip_address = None
+        event = {
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent[:512] if user_agent else None,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            self._queue.put_nowait(event)
+            self._stats["recorded"] += 1
+        except asyncio.QueueFull:
+            self._stats["dropped"] += 1
+            logger.warning(f"⚠️  Audit queue full - dropped {action} event for user {user_id}")
+
+    async def start(self) -> None:
+        """Create upcoming partitions, then start the writer and maintenance loop."""
+        try:
+            await self.maintain()
+        except Exception:
+            pass  # Logged by maintain(); retried every AUDIT_MAINTENANCE_INTERVAL
+        self._stopping = False
+        self._writer_task = asyncio.create_task(self._writer())
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+        logger.info(f"✅ Audit log started - {settings.AUDIT_PARTITIONS_AHEAD} month(s) ahead, "
+                    f"retention {settings.AUDIT_RETENTION_MONTHS or 'unlimited'} month(s)")
+
+    async def stop(self, drain_timeout: float = settings.SHUTDOWN_DRAIN_TIMEOUT) -> Dict[str, int]:
+        """
+        Stop the maintenance loop, let the writer finish the batch it holds,
+        then write what is still queued.
+
+        Args:
+            drain_timeout: Seconds allowed for the writer to finish; past it the
+                writer is cancelled and its batch and the queue are dropped
+
+        Returns:
+            Dict with audit_events_dropped - events recorded but never written
+            during shutdown (for the drain report)
+        """
+        dropped_before = self._stats["dropped"]
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+
+        writer, finished = self._writer_task, True
+        if writer:
+            async def finish_writer() -> None:
+                await self._queue.put(_STOP)
+                await writer
+
+            try:
+                await asyncio.wait_for(finish_writer(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                finished = False  # The writer was cancelled with the wait
+        self._maintenance_task = self._writer_task = None
+
+        if finished:
+            # Events recorded while the writer was finishing
+            while not self._queue.empty():
+                await self._write(self._take_batch([]))
+        else:
+            batch = self._take_batch([])
+            while batch:
+                self._stats["dropped"] += len(batch)
+                batch = self._take_batch([])
+            logger.warning(f"⚠️  Audit writer did not finish within {drain_timeout}s")
+
+        dropped = self._stats["dropped"] - dropped_before
+        if dropped:
+            logger.warning(f"⚠️  {dropped} audit event(s) not written at shutdown")
+        logger.info("Audit log stopped")
+        return {"audit_events_dropped": dropped}
+
+    def _take_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill a batch with already queued events, up to batch_size (stopping at _STOP)."""
+        while len(batch) < self.batch_size and not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is _STOP:
+                self._stopping = True
+                break
+            batch.append(event)
+        return batch
+
+    async def _writer(self) -> None:
+        """Wait for an event, then insert it with everything queued behind it, until _STOP."""
+        while not self._stopping:
+            event = await self._queue.get()
+            if event is _STOP:
+                return
+            await self._write(self._take_batch([event]))
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert one batch; on failure (or cancellation) it is logged and counted as dropped."""
+        try:
+            async with db_manager.get_session() as session:
+                await insert_audit_events(session, batch)
+                await session.commit()
+            self._stats["written"] += len(batch)
+        except asyncio.CancelledError:
+            self._stats["dropped"] += len(batch)
+            logger.error(f"❌ Cancelled while writing {len(batch)} audit event(s)")
+            raise
+        except Exception as e:
+            self._stats["write_failures"] += 1
+            self._stats["dropped"] += len(batch)
+            logger.error(f"❌ Failed to write {len(batch)} audit event(s): {e}")
+
+    async def maintain(self) -> Dict[str, Any]:
+        """
+        Create missing partitions and drop expired ones.
+
+        Returns:
+            Dict with created and dropped partition names and the time it ran
+        """
+        try:
+            async with db_manager.get_session() as session:
+                changes = await maintain_audit_partitions(
+                    session, settings.AUDIT_PARTITIONS_AHEAD, settings.AUDIT_RETENTION_MONTHS
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"❌ Audit partition maintenance failed: {e}")
+            raise
+
+        result = {
+            "created": [row.partition_name for row in changes if row.change == "created"],
+            "dropped": [row.partition_name for row in changes if row.change == "dropped"],
+            "at": time.time(),
+        }
+        self._stats["partitions_created"] += len(result["created"])
+        self._stats["partitions_dropped"] += len(result["dropped"])
+        self._last_maintenance = result
+        if result["created"] or result["dropped"]:
+            logger.info(f"🔄 Audit partitions - created {result['created']}, dropped {result['dropped']}")
+        return result
+
+    async def _maintenance_loop(self) -> None:
+        """Run maintain() every AUDIT_MAINTENANCE_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(settings.AUDIT_MAINTENANCE_INTERVAL)
+            try:
+                await self.maintain()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass  # Logged by maintain(); partitions exist AUDIT_PARTITIONS_AHEAD months out
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get audit log statistics.
+
+        Returns:
+            Dict with queued, recorded, written and dropped event counts,
+            write failures, partitions created/dropped and the last
+            maintenance result
+        """
+        return {
+            "running": self._writer_task is not None,
+            "queued": self._queue.qsize(),
+            **self._stats,
+            "last_maintenance": self._last_maintenance,
+        }
+
+
+# Global audit logger instance
+audit_logger = AuditLogger()
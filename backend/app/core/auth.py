@@ -3,20 +3,21 @@ Authentication utilities for password hashing and JWT token management.
 """
 
 import logging
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-import bcrypt
 from jose import JWTError, jwt
 from fastapi import Response, Request, HTTPException, status
 
 from app.config import settings
+from app.core.password_hashing import password_hasher
 
 logger = logging.getLogger(__name__)
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password with the configured scheme and cost (bcrypt by default).
 
     Args:
         password: Plain text password
@@ -24,14 +25,12 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return password_hash.decode('utf-8')
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against its hash.
+    Verify a password against its hash (any supported scheme/cost).
 
     Args:
         plain_password: Plain text password
@@ -41,7 +40,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         True if password matches, False otherwise
     """
     try:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return password_hasher.verify(plain_password, hashed_password)
     except Exception as e:
         logger.error(f"Password verification error: {e}")
         return False
@@ -66,7 +65,8 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    # jti lets a single token be revoked before exp (app.core.token_denylist)
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": secrets.token_urlsafe(16)})
 
     # Encode token
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
@@ -146,6 +146,44 @@ def clear_auth_cookie(response: Response) -> None:
     logger.debug("Auth cookie cleared")
 
 
+def set_refresh_cookie(response: Response, token: str) -> None:
+    """
+    Set httpOnly refresh token cookie in response.
+    Scoped to /api so pages never carry it.
+
+    Args:
+        response: FastAPI Response object
+        token: Opaque refresh token
+    """
+    response.set_cookie(
+        key="refresh_token",
+        value=token,
+        httponly=True,
+        secure=False,  # Set to True in production (HTTPS only)
+        samesite="strict",  # Only ever sent by our own frontend
+        max_age=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+        path="/api",
+    )
+    logger.debug("Refresh cookie set (httpOnly, SameSite=Strict)")
+
+
+def clear_refresh_cookie(response: Response) -> None:
+    """
+    Clear refresh token cookie (for logout).
+
+    Args:
+        response: FastAPI Response object
+    """
+    response.delete_cookie(
+        key="refresh_token",
+        httponly=True,
+        secure=False,
+        samesite="strict",
+        path="/api",
+    )
+    logger.debug("Refresh cookie cleared")
+
+
 def get_token_from_cookie(request: Request) -> str:
     """
     Extract JWT token from httpOnly cookie.
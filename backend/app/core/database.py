@@ -1,10 +1,13 @@
 """
 Database connection manager with Vault dynamic credentials and automatic rotation.
+Supports an optional read replica with its own credentials, rotation and health.
 """
 
 import logging
 import asyncio
-from typing import Optional
+import random
+import time
+from typing import Optional, Dict, Any
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
@@ -12,6 +15,7 @@ from sqlalchemy.pool import NullPool
 
 from app.config import settings
 from app.core.vault import vault_client
+from app.core.lease_revoker import lease_revoker
 
 logger = logging.getLogger(__name__)
 
@@ -19,20 +23,51 @@ logger = logging.getLogger(__name__)
 Base = declarative_base()
 
 
-class DatabaseManager:
+class ManagedEngine:
     """
-    Database connection manager with dynamic credentials from Vault.
-    Handles connection pool creation, credential rotation, and graceful migration.
+    A single connection pool backed by Vault dynamic credentials.
+    Handles connection pool creation, credential rotation, and graceful migration
+    for one database host / Vault role pair.
     """
 
-    def __init__(self):
-        """Initialize database manager."""
+    def __init__(self, name: str, host: str, port: int, vault_role: str, readonly: bool = False):
+        """
+        Initialize managed engine.
+
+        Args:
+            name: Label used in logs and health output (e.g., "primary")
+            host: Database host
+            port: Database port
+            vault_role: Vault database role issuing credentials for this engine
+            readonly: Engine serves read-only sessions (replica) - only plain
+                SELECTs are warmed on it
+        """
+        self.name = name
+        self.host = host
+        self.port = port
+        self.vault_role = vault_role
+        self.readonly = readonly
+        self.healthy = False  # Result of the last health check
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[sessionmaker] = None
         self._current_lease_id: Optional[str] = None
+        self._lease_duration: int = 0  # TTL granted at issue - used as renewal increment
+        self._lease_expires_at: float = 0.0  # time.monotonic() deadline of current lease
+        self._lease_renewable = False
+        self._lease_capped = False  # Last renewal was clipped by the role's max_ttl
+        self._lease_changed = asyncio.Event()  # Wakes the scheduler after a manual rotation
         self._rotation_task: Optional[asyncio.Task] = None
         self._is_rotating = False
-        logger.info("Database manager initialized")
+
+    @property
+    def engine(self) -> Optional[AsyncEngine]:
+        """Current engine (replaced on every rotation)."""
+        return self._engine
+
+    @property
+    def lease_id(self) -> Optional[str]:
+        """Vault lease ID of the credentials in use."""
+        return self._current_lease_id
 
     async def connect(self) -> None:
         """
@@ -40,31 +75,19 @@ class DatabaseManager:
         Creates initial connection pool.
         """
         try:
-            logger.info("Fetching database credentials from Vault...")
+            logger.info(f"[{self.name}] Fetching database credentials from Vault (role: {self.vault_role})...")
 
             # Get dynamic credentials from Vault
-            creds = await vault_client.get_database_credentials()
+            creds = await vault_client.get_database_credentials(role=self.vault_role)
 
             username = creds['username']
             password = creds['password']
-            self._current_lease_id = creds['lease_id']
+            self._track_lease(creds)
 
-            logger.info(f"✅ Database credentials obtained - User: {username}, Lease: {self._current_lease_id[:8]}...")
-
-            # Create connection string
-            db_url = (
-                f"postgresql+asyncpg://{username}:{password}"
-                f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-            )
+            logger.info(f"✅ [{self.name}] Database credentials obtained - User: {username}, Lease: {self._current_lease_id[:8]}...")
 
             # Create async engine with connection pool
-            self._engine = create_async_engine(
-                db_url,
-                pool_size=settings.DB_POOL_SIZE,
-                max_overflow=settings.DB_MAX_OVERFLOW,
-                pool_pre_ping=True,  # Test connections before using
-                echo=settings.DB_ECHO,
-            )
+            self._engine = self._create_engine(username, password)
 
             # Create session factory
             self._session_factory = sessionmaker(
@@ -73,25 +96,36 @@ class DatabaseManager:
                 expire_on_commit=False,
             )
 
-            # Test connection
+            # Test connection and prepare hot statements on the pool
             async with self._engine.begin() as conn:
                 await conn.execute(text("SELECT 1"))
+            await self._warm_engine(self._engine)
+            self.healthy = True
 
-            logger.info(f"✅ Database connected - Pool size: {settings.DB_POOL_SIZE}, Max overflow: {settings.DB_MAX_OVERFLOW}")
+            logger.info(f"✅ [{self.name}] Database connected ({self.host}) - Pool size: {settings.DB_POOL_SIZE}, Max overflow: {settings.DB_MAX_OVERFLOW}")
 
             # Start credential rotation task
             self._rotation_task = asyncio.create_task(self._credential_rotation_loop())
-            logger.info(f"✅ Credential rotation task started - Interval: {settings.DB_CREDENTIAL_ROTATION_INTERVAL}s")
+            logger.info(f"✅ [{self.name}] Credential rotation task started - Lease TTL: {self._lease_duration}s, renewable: {self._lease_renewable}")
 
         except Exception as e:
-            logger.error(f"❌ Failed to connect to database: {e}")
+            logger.error(f"❌ [{self.name}] Failed to connect to database: {e}")
+            # The pool never went live - close it and don't leave the role behind
+            # (the replica retries connect() until it succeeds)
+            if self._current_lease_id:
+                self._release_lease(self._current_lease_id, self._lease_expires_at)
+                self._current_lease_id = None
+            engine, self._engine, self._session_factory = self._engine, None, None
+            self.healthy = False
+            if engine:
+                await engine.dispose()
             raise
 
     async def close(self) -> None:
         """
         Close database connection and revoke credentials.
         """
-        logger.info("Closing database connection...")
+        logger.info(f"[{self.name}] Closing database connection...")
 
         # Cancel rotation task
         if self._rotation_task:
@@ -107,48 +141,208 @@ class DatabaseManager:
             await self._engine.dispose()
             logger.info("Database engine disposed")
 
-        # Revoke current lease
+        # Queue current lease for revocation (drained by lease_revoker.stop())
         if self._current_lease_id:
-            try:
-                await vault_client.revoke_lease(self._current_lease_id)
-                logger.info(f"Lease revoked: {self._current_lease_id[:8]}...")
-            except Exception as e:
-                logger.warning(f"Failed to revoke lease: {e}")
+            self._release_lease(self._current_lease_id, self._lease_expires_at)
+            self._current_lease_id = None
 
         logger.info("Database connection closed")
 
+    def _create_engine(self, username: str, password: str) -> AsyncEngine:
+        """
+        Create an async engine for a set of dynamic credentials.
+
+        Args:
+            username: Vault-issued database username
+            password: Vault-issued database password
+
+        Returns:
+            AsyncEngine with connection pool
+        """
+        db_url = (
+            f"postgresql+asyncpg://{username}:{password}"
+            f"@{self.host}:{self.port}/{settings.DB_NAME}"
+        )
+        return create_async_engine(
+            db_url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_pre_ping=True,  # Test connections before using
+            echo=settings.DB_ECHO,
+        )
+
+    async def _warm_engine(self, engine: AsyncEngine) -> None:
+        """
+        Pre-execute hot queries on DB_WARMUP_CONNECTIONS pooled connections.
+        A new engine starts with an empty compiled cache and every asyncpg
+        connection with an empty prepared statement cache; warming before the
+        swap keeps the first requests after a rotation off the slow path.
+
+        Args:
+            engine: Engine that is about to start serving traffic
+        """
+        count = min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE)
+        if count <= 0:
+            return
+
+        # Imported lazily - app.models imports Base from this module
+        from app.models.queries import WARMUP_QUERIES, PRIMARY_WARMUP_QUERIES
+
+        queries = WARMUP_QUERIES if self.readonly else WARMUP_QUERIES + PRIMARY_WARMUP_QUERIES
+        # Hold all connections at once so each warmup hits a distinct one
+        results = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+        conns = [r for r in results if not isinstance(r, BaseException)]
+        try:
+            for r in results:
+                if isinstance(r, BaseException):
+                    raise r
+            for conn in conns:
+                for statement, params in queries:
+                    await conn.execute(statement, params)
+        finally:
+            await asyncio.gather(*(conn.close() for conn in conns))
+
+        logger.info(f"[{self.name}] Warmed {len(queries)} statements on {count} pooled connections")
+
+    def _track_lease(self, creds: Dict[str, Any]) -> None:
+        """
+        Record a freshly issued lease and wake the scheduler.
+
+        Args:
+            creds: Credentials dict from vault_client.get_database_credentials()
+        """
+        self._current_lease_id = creds['lease_id']
+        self._lease_duration = creds.get('lease_duration') or 0
+        self._lease_renewable = bool(creds.get('renewable')) and self._lease_duration > 0
+        self._lease_capped = False
+        ttl = self._lease_duration or settings.DB_CREDENTIAL_ROTATION_INTERVAL
+        self._lease_expires_at = time.monotonic() + ttl
+        self._lease_changed.set()
+
+    @staticmethod
+    def _release_lease(lease_id: str, expires_at: float) -> None:
+        """
+        Hand a lease no longer in use to the background revocation queue.
+
+        Args:
+            lease_id: Lease to revoke
+            expires_at: time.monotonic() deadline of the lease
+        """
+        lease_revoker.release(lease_id, expires_at=time.time() + max(0.0, expires_at - time.monotonic()))
+
+    def _lease_remaining(self) -> float:
+        """Seconds until the current lease expires (0 if already expired)."""
+        return max(0.0, self._lease_expires_at - time.monotonic())
+
+    @staticmethod
+    def _jitter(delay: float) -> float:
+        """Spread a delay by +/- DB_LEASE_JITTER so replicas don't act in lockstep."""
+        spread = settings.DB_LEASE_JITTER
+        return max(1.0, delay * random.uniform(1 - spread, 1 + spread))
+
+    def _next_lease_action_delay(self, failures: int) -> float:
+        """
+        Seconds to wait before the next renew/rotate attempt.
+
+        Normally acts after DB_LEASE_RENEW_FRACTION of the remaining lease TTL.
+        After failures, retries with exponential backoff capped at
+        DB_ROTATION_RETRY_MAX. While the lease is still valid the retry is
+        pulled in to halfway to expiry so it lands while the pool works; once
+        the lease has expired there is nothing left to beat and the plain
+        backoff applies, so a Vault outage is not retried every second.
+
+        Args:
+            failures: Consecutive failed attempts so far
+        """
+        remaining = self._lease_remaining()
+        if failures:
+            backoff = min(
+                settings.DB_ROTATION_RETRY_BASE * (2 ** (failures - 1)),
+                settings.DB_ROTATION_RETRY_MAX,
+            )
+            if remaining > 0:
+                backoff = min(backoff, max(remaining / 2, 1.0))
+            return self._jitter(backoff)
+        return self._jitter(remaining * settings.DB_LEASE_RENEW_FRACTION)
+
+    def _should_rotate(self) -> bool:
+        """Rotate only when the lease cannot be extended any further."""
+        return not self._lease_renewable or self._lease_capped
+
+    async def _renew_lease(self) -> None:
+        """
+        Extend the current lease by its original TTL.
+        If Vault grants less than requested, max_ttl is near and the next
+        scheduled action will be a full rotation.
+        """
+        lease_id = self._current_lease_id
+        renewal = await vault_client.renew_lease(lease_id, increment=self._lease_duration)
+
+        if lease_id != self._current_lease_id:
+            # Rotated while the renewal was in flight - nothing to update
+            return
+
+        granted = renewal['lease_duration']
+        self._lease_expires_at = time.monotonic() + granted
+        self._lease_renewable = bool(renewal['renewable']) and granted > 0
+        self._lease_capped = granted < self._lease_duration
+
+        if self._lease_capped:
+            logger.info(f"Lease {lease_id[:8]}... capped at max TTL ({granted}s left) - rotation scheduled")
+
     async def _credential_rotation_loop(self) -> None:
         """
-        Background task to rotate database credentials periodically.
-        Rotates every DB_CREDENTIAL_ROTATION_INTERVAL seconds (default: 3000s / 50 minutes).
+        Background task that keeps the database lease alive.
+
+        Renews the lease after DB_LEASE_RENEW_FRACTION of its TTL (cheap) and
+        only rotates to new credentials once renewal is capped by max_ttl or
+        the lease is not renewable (expensive: new Postgres role + new pool).
+        Failed attempts are retried with jittered exponential backoff.
         """
+        failures = 0
         while True:
             try:
-                # Wait for rotation interval
-                await asyncio.sleep(settings.DB_CREDENTIAL_ROTATION_INTERVAL)
-
-                logger.info("⏰ Starting credential rotation...")
-                await self._rotate_credentials()
-                logger.info("✅ Credential rotation completed")
+                self._lease_changed.clear()
+                delay = self._next_lease_action_delay(failures)
+                try:
+                    await asyncio.wait_for(self._lease_changed.wait(), timeout=delay)
+                    # Lease replaced out of band (manual rotation) - reschedule
+                    failures = 0
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+                # A failed renewal is retried as a rotation - the safe path
+                if failures or self._should_rotate():
+                    logger.info(f"⏰ [{self.name}] Starting credential rotation...")
+                    await self.rotate_credentials()
+                    logger.info(f"✅ [{self.name}] Credential rotation completed")
+                else:
+                    await self._renew_lease()
+                failures = 0
 
             except asyncio.CancelledError:
                 logger.info("Credential rotation task cancelled")
                 raise
             except Exception as e:
-                logger.error(f"❌ Credential rotation failed: {e}")
-                logger.warning("Will retry at next interval")
-
-    async def _rotate_credentials(self) -> None:
+                failures += 1
+                logger.error(f"❌ [{self.name}] Credential renewal/rotation failed: {e}")
+                if self._lease_remaining() == 0:
+                    # Credentials expired - stop routing reads here until rotation succeeds
+                    self.healthy = False
+                logger.warning(f"Will retry in ~{self._next_lease_action_delay(failures):.0f}s (attempt {failures})")
+
+    async def rotate_credentials(self) -> None:
         """
         Rotate database credentials with graceful pool migration.
 
         Steps:
         1. Fetch new credentials from Vault
         2. Create new engine with new credentials
-        3. Test new connection
+        3. Test new connection and pre-warm hot statements
         4. Swap to new engine
         5. Dispose old engine
-        6. Revoke old lease
+        6. Queue old lease for background revocation
         """
         if self._is_rotating:
             logger.warning("Credential rotation already in progress, skipping")
@@ -157,11 +351,13 @@ class DatabaseManager:
         self._is_rotating = True
         old_engine = self._engine
         old_lease_id = self._current_lease_id
+        old_lease_expires_at = self._lease_expires_at
+        creds = None
 
         try:
             # Step 1: Fetch new credentials
             logger.info("Fetching new database credentials from Vault...")
-            creds = await vault_client.get_database_credentials()
+            creds = await vault_client.get_database_credentials(role=self.vault_role)
 
             username = creds['username']
             password = creds['password']
@@ -170,28 +366,23 @@ class DatabaseManager:
             logger.info(f"New credentials obtained - User: {username}, Lease: {new_lease_id[:8]}...")
 
             # Step 2: Create new engine
-            db_url = (
-                f"postgresql+asyncpg://{username}:{password}"
-                f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-            )
-
-            new_engine = create_async_engine(
-                db_url,
-                pool_size=settings.DB_POOL_SIZE,
-                max_overflow=settings.DB_MAX_OVERFLOW,
-                pool_pre_ping=True,
-                echo=settings.DB_ECHO,
-            )
+            new_engine = self._create_engine(username, password)
 
-            # Step 3: Test new connection
-            async with new_engine.begin() as conn:
-                await conn.execute(text("SELECT 1"))
+            # Step 3: Test new connection and warm its statement caches
+            try:
+                async with new_engine.begin() as conn:
+                    await conn.execute(text("SELECT 1"))
+                await self._warm_engine(new_engine)
+            except Exception:
+                # Never swapped in - close its pooled connections before the lease goes
+                await new_engine.dispose()
+                raise
 
             logger.info("✅ New database connection tested successfully")
 
             # Step 4: Swap to new engine (atomic swap)
             self._engine = new_engine
-            self._current_lease_id = new_lease_id
+            self._track_lease(creds)
 
             # Update session factory
             self._session_factory = sessionmaker(
@@ -200,30 +391,31 @@ class DatabaseManager:
                 expire_on_commit=False,
             )
 
-            logger.info("✅ Swapped to new database engine")
-
-            # Step 5: Dispose old engine (graceful shutdown)
-            if old_engine:
-                await old_engine.dispose()
-                logger.info("Old database engine disposed")
+            self.healthy = True
+            logger.info(f"✅ [{self.name}] Swapped to new database engine")
 
-            # Step 6: Revoke old lease
-            if old_lease_id:
-                try:
-                    await vault_client.revoke_lease(old_lease_id)
-                    logger.info(f"Old lease revoked: {old_lease_id[:8]}...")
-                except Exception as e:
-                    logger.warning(f"Failed to revoke old lease: {e}")
+            # Step 5: Dispose old engine (graceful shutdown). The new engine is
+            # already serving, so a failure here doesn't fail the rotation
+            try:
+                if old_engine:
+                    try:
+                        await old_engine.dispose()
+                        logger.info("Old database engine disposed")
+                    except Exception as e:
+                        logger.warning(f"⚠️  [{self.name}] Failed to dispose old database engine: {e}")
+            finally:
+                # Step 6: Queue old lease for revocation - no Vault round trip here
+                if old_lease_id:
+                    self._release_lease(old_lease_id, old_lease_expires_at)
 
             logger.info("✅ Credential rotation completed successfully")
 
         except Exception as e:
             logger.error(f"❌ Credential rotation failed: {e}")
-            # Restore old engine if swap failed
-            if old_engine and not self._engine:
-                self._engine = old_engine
-                self._current_lease_id = old_lease_id
-                logger.warning("Restored old database engine")
+            # Credentials issued for a pool that never went live - don't leave the role behind
+            if creds and self._current_lease_id != creds['lease_id']:
+                ttl = creds.get('lease_duration')
+                lease_revoker.release(creds['lease_id'], expires_at=time.time() + ttl if ttl else None)
             raise
 
         finally:
@@ -243,6 +435,20 @@ class DatabaseManager:
             raise RuntimeError("Database not connected - call connect() first")
         return self._session_factory()
 
+    def get_lease_info(self) -> Dict[str, Any]:
+        """
+        Get the current database lease schedule.
+
+        Returns:
+            Dict with lease TTL, seconds remaining, renewability and next action
+        """
+        return {
+            'lease_duration': self._lease_duration,
+            'seconds_remaining': int(self._lease_remaining()),
+            'renewable': self._lease_renewable,
+            'next_action': 'rotate' if self._should_rotate() else 'renew',
+        }
+
     async def is_healthy(self) -> bool:
         """
         Check database health.
@@ -256,10 +462,116 @@ class DatabaseManager:
         try:
             async with self._engine.begin() as conn:
                 await conn.execute(text("SELECT 1"))
-            return True
+            self.healthy = True
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
-            return False
+            logger.error(f"[{self.name}] Database health check failed: {e}")
+            self.healthy = False
+        return self.healthy
+
+
+class DatabaseManager:
+    """
+    Database connection manager with dynamic credentials from Vault.
+    Routes writes to the primary and, when DB_REPLICA_HOST is set, read-only
+    sessions to a replica. Each engine rotates its own credentials.
+    """
+
+    def __init__(self):
+        """Initialize database manager."""
+        self.primary = ManagedEngine("primary", settings.DB_HOST, settings.DB_PORT, settings.VAULT_DB_ROLE)
+        self.replica: Optional[ManagedEngine] = None
+        if settings.DB_REPLICA_HOST:
+            self.replica = ManagedEngine(
+                "replica", settings.DB_REPLICA_HOST, settings.DB_REPLICA_PORT, settings.VAULT_DB_REPLICA_ROLE,
+                readonly=True,
+            )
+        self._replica_connect_task: Optional[asyncio.Task] = None
+        logger.info(f"Database manager initialized (replica: {settings.DB_REPLICA_HOST or 'disabled'})")
+
+    async def connect(self) -> None:
+        """
+        Connect the primary (required) and the replica (best effort).
+        If the replica is unavailable, reads fall back to the primary while
+        the replica connection is retried in the background.
+        """
+        await self.primary.connect()
+
+        if self.replica:
+            try:
+                await self.replica.connect()
+            except Exception as e:
+                logger.warning(f"⚠️  Read replica unavailable, serving reads from primary: {e}")
+                self._replica_connect_task = asyncio.create_task(self._replica_connect_loop())
+
+    async def _replica_connect_loop(self) -> None:
+        """Retry the replica connection with capped exponential backoff."""
+        attempt = 0
+        while True:
+            attempt += 1
+            delay = min(settings.DB_ROTATION_RETRY_BASE * (2 ** (attempt - 1)), settings.DB_ROTATION_RETRY_MAX)
+            await asyncio.sleep(ManagedEngine._jitter(delay))
+            try:
+                await self.replica.connect()
+                logger.info(f"✅ Read replica connected after {attempt} retries")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Read replica still unavailable (attempt {attempt}): {e}")
+
+    async def close(self) -> None:
+        """
+        Close database connections and revoke credentials.
+        """
+        if self._replica_connect_task:
+            self._replica_connect_task.cancel()
+            try:
+                await self._replica_connect_task
+            except asyncio.CancelledError:
+                pass
+
+        if self.replica:
+            await self.replica.close()
+        await self.primary.close()
+
+    def get_session(self, readonly: bool = False) -> AsyncSession:
+        """
+        Get database session.
+
+        Args:
+            readonly: Route to the read replica when one is connected and
+                healthy. Replicas lag the primary slightly - don't use for
+                read-your-own-write checks.
+
+        Returns:
+            AsyncSession instance
+
+        Raises:
+            RuntimeError: If database not connected
+        """
+        if readonly and self.replica and self.replica.healthy and self.replica.engine:
+            return self.replica.get_session()
+        return self.primary.get_session()
+
+    async def is_healthy(self) -> bool:
+        """
+        Check primary database health (the replica is optional).
+
+        Returns:
+            True if the primary is healthy, False otherwise
+        """
+        return await self.primary.is_healthy()
+
+    async def replica_status(self) -> str:
+        """
+        Check read replica health.
+
+        Returns:
+            "not_configured", "healthy" or "unhealthy"
+        """
+        if not self.replica:
+            return "not_configured"
+        return "healthy" if await self.replica.is_healthy() else "unhealthy"
 
 
 # Global database manager instance
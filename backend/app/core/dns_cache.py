@@ -0,0 +1,172 @@
+"""
+Shared DNS cache for outbound connections.
+
+Answers are kept for DNS_CACHE_TTL seconds and failures for
+DNS_CACHE_NEGATIVE_TTL, in an LRU of at most DNS_CACHE_MAX_ENTRIES names.
+Concurrent misses for the same name share one lookup. getaddrinfo does not
+report record TTLs, so the TTL is fixed; keep it at or below the records'.
+
+Lookups go through the loop's getaddrinfo (a worker thread), so a miss
+still costs a thread hop - the cache is what takes resolution off the hot
+path. In-cluster names under .svc.<DNS_CLUSTER_DOMAIN> are resolved as
+absolute names (trailing dot): with the default ndots:5 a relative
+"openbao.openbao.svc.cluster.local" is first tried against every search
+domain, each a failed query, before the name itself.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# getaddrinfo result: (family, type, proto, canonname, sockaddr)
+AddrInfo = Tuple[int, int, int, str, Tuple]
+
+
+class DNSCache:
+    """
+    TTL + negative caching for getaddrinfo, bounded by an LRU.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.DNS_CACHE_TTL,
+        negative_ttl: float = settings.DNS_CACHE_NEGATIVE_TTL,
+        max_entries: int = settings.DNS_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initialize DNS cache.
+
+        Args:
+            ttl: Seconds a successful answer is reused
+            negative_ttl: Seconds a failed lookup is remembered
+            max_entries: Names kept; the least recently used is evicted
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        # (host, port, family) -> (expires_at, addrinfos or the lookup error)
+        self._entries: OrderedDict = OrderedDict()
+        self._flight = SingleFlight("dns")
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "failures": 0, "evictions": 0}
+
+    @staticmethod
+    def _query_name(host: str) -> str:
+        suffix = f".svc.{settings.DNS_CLUSTER_DOMAIN}"
+        return host + "." if settings.DNS_CLUSTER_DOMAIN and host.endswith(suffix) else host
+
+    async def resolve(self, host: str, port: int, family: int = socket.AF_UNSPEC) -> List[AddrInfo]:
+        """
+        Resolve a host for a TCP connection.
+
+        Args:
+            host: Hostname or IP literal (literals are returned without a lookup)
+            port: Port placed in the returned socket addresses
+            family: AF_UNSPEC, AF_INET or AF_INET6
+
+        Returns:
+            getaddrinfo-style list, in resolver order
+
+        Raises:
+            socket.gaierror: If the name does not resolve (also while negatively cached)
+        """
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return await asyncio.get_running_loop().getaddrinfo(
+                host, port, family=family, type=socket.SOCK_STREAM, flags=socket.AI_NUMERICHOST
+            )
+
+        key = (host, port, family)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            if isinstance(entry[1], socket.gaierror):
+                self._stats["negative_hits"] += 1
+                raise socket.gaierror(*entry[1].args)
+            self._stats["hits"] += 1
+            return entry[1]
+
+        return await self._flight.do(("resolve", host, port, family), lambda: self._lookup(key))
+
+    async def _lookup(self, key: Tuple[str, int, int]) -> List[AddrInfo]:
+        host, port, family = key
+        self._stats["misses"] += 1
+        try:
+            result = await asyncio.get_running_loop().getaddrinfo(
+                self._query_name(host), port, family=family, type=socket.SOCK_STREAM
+            )
+        except socket.gaierror as e:
+            self._stats["failures"] += 1
+            self._store(key, self.negative_ttl, e)
+            raise
+        self._store(key, self.ttl, result)
+        return result
+
+    def _store(self, key: Tuple[str, int, int], ttl: float, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def open_connection(self, host: str, port: int, **kwargs) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """
+        asyncio.open_connection with the host resolved through the cache.
+
+        Addresses are tried in resolver order; the last connect error is
+        raised if none accepts.
+
+        Args:
+            host: Hostname or IP literal
+            port: Port
+            **kwargs: Passed to asyncio.open_connection (e.g. ssl, server_hostname)
+
+        Raises:
+            OSError: If resolution or every connect attempt fails
+        """
+        last_error: Optional[OSError] = None
+        for family, _, _, _, sockaddr in await self.resolve(host, port):
+            try:
+                return await asyncio.open_connection(sockaddr[0], port, family=family, **kwargs)
+            except OSError as e:
+                last_error = e
+        raise last_error or OSError(f"No addresses for {host}")
+
+    def invalidate(self, host: str) -> None:
+        """Drop every cached answer for a host (e.g. after its connections start failing)."""
+        for key in [k for k in self._entries if k[0] == host]:
+            del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with entries, hit/negative-hit/miss/failure/eviction counts,
+            hit rate, and lookups coalesced while in flight
+        """
+        lookups = self._stats["hits"] + self._stats["negative_hits"] + self._stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "negative_ttl": self.negative_ttl,
+            **self._stats,
+            "hit_rate": round((self._stats["hits"] + self._stats["negative_hits"]) / lookups, 4) if lookups else None,
+            "coalesced": self._flight.get_stats()["coalesced"].get("resolve", 0),
+        }
+
+
+# Global DNS cache instance
+dns_cache = DNSCache()
@@ -0,0 +1,124 @@
+"""
+httpx transport whose TCP connects resolve hostnames through dns_cache.
+
+Imported on first use by HTTP clients (it pulls in httpx/httpcore). TLS
+still verifies and sends SNI for the original hostname - httpcore takes
+server_hostname from the request URL, not from the address connected to.
+
+Passing a transport to httpx.AsyncClient switches off its HTTP(S)_PROXY
+environment handling, so when a proxy applies to the target no transport is
+built and the client keeps httpx's default one (the proxy resolves the name).
+httpx has no public hook for the network backend. CachedDNSTransport
+subclasses httpx.AsyncHTTPTransport and replaces the connection pool it
+keeps in the private _pool attribute with one built through httpcore's
+public constructor (network_backend=...). That attribute is an httpx
+internal, which is why httpx and httpcore are pinned in requirements.txt.
+"""
+
+import logging
+import urllib.request
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from app.core.dns_cache import dns_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """AnyIO network backend that connects to dns_cache answers."""
+
+    def __init__(self):
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await dns_cache.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        last_error: Optional[Exception] = None
+        for _, _, _, _, sockaddr in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    sockaddr[0], port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                                  socket_options: Optional[Iterable] = None) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def _proxied(url: str) -> bool:
+    """Whether the environment's proxy settings (incl. NO_PROXY) route url through a proxy."""
+    parts = urlsplit(url)
+    proxies = urllib.request.getproxies()
+    if not (proxies.get(parts.scheme) or proxies.get("all")):
+        return False
+    return not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+class CachedDNSTransport(httpx.AsyncHTTPTransport):
+    """httpx.AsyncHTTPTransport whose connection pool resolves through dns_cache."""
+
+    def __init__(
+        self,
+        verify: bool = True,
+        http2: bool = False,
+        limits: httpx.Limits = httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        retries: int = 0,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            verify: Verify TLS certificates
+            http2: Enable HTTP/2
+            limits: Connection pool limits
+            retries: Connect retries
+        """
+        super().__init__(verify=verify, http2=http2, limits=limits, retries=retries)
+        # Same pool httpx builds (httpx/_transports/default.py), plus the network backend
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(verify=verify),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            retries=retries,
+            network_backend=CachedDNSBackend(),
+        )
+
+
+def cached_dns_transport(url: str, **kwargs) -> Optional[CachedDNSTransport]:
+    """
+    Transport that resolves through dns_cache, unless a proxy applies to url.
+
+    Args:
+        url: Base URL the client talks to (checked against proxy settings)
+        **kwargs: Passed to CachedDNSTransport
+
+    Returns:
+        Transport for httpx.AsyncClient(transport=...), or None when an
+        environment proxy applies to url (httpx's default transport honours it)
+    """
+    if _proxied(url):
+        return None
+    return CachedDNSTransport(**kwargs)
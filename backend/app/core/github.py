@@ -3,10 +3,18 @@ GitHub API client for repository and user profile operations.
 """
 
 import logging
-from typing import List, Dict, Any
-import httpx
+from dataclasses import dataclass, fields
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
+import orjson
 
 from app.config import settings
+from app.models.schemas import GitHubUser
+from app.core.github_ratelimit import github_rate_limiter, QuotaExhausted, PRIORITY_INTERACTIVE
+from app.core.resilience import DependencyGuard, CircuitOpenError
+
+if TYPE_CHECKING:
+    # httpx is imported on the first GitHub call, not at startup
+    import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -16,56 +24,175 @@ class GitHubAPIError(Exception):
     pass
 
 
+class GitHubServerError(GitHubAPIError):
+    """Exception raised for GitHub 5xx responses (counted as dependency failures)."""
+    pass
+
+
+class GitHubRateLimitError(GitHubAPIError):
+    """Exception raised when a token's GitHub quota is exhausted."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class GitHubUnavailableError(GitHubAPIError):
+    """Exception raised while the GitHub circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True, frozen=True)
+class RepoRecord:
+    """
+    A repository projected onto the fields GitHubRepository serves.
+    GitHub returns ~100 fields per repo; only these are kept in memory.
+    Serialized directly by orjson (dataclass support), no pydantic pass.
+    """
+    id: int
+    name: str
+    full_name: str
+    description: Optional[str]
+    private: bool
+    html_url: str
+    created_at: str
+    updated_at: str
+    language: Optional[str]
+    stargazers_count: int
+    forks_count: int
+
+
+REPO_FIELDS = tuple(f.name for f in fields(RepoRecord))
+PROFILE_FIELDS = tuple(GitHubUser.model_fields)
+
+
+@dataclass(slots=True)
+class RepoPage:
+    """One page of /user/repos from a conditional request."""
+    records: List[RepoRecord]
+    etag: Optional[str]
+    has_next: bool
+    not_modified: bool = False
+
+
+def parse_repositories(body: bytes) -> List[RepoRecord]:
+    """
+    Parse a /user/repos page straight into RepoRecords.
+
+    Args:
+        body: Raw JSON response body
+
+    Returns:
+        List of RepoRecord (the full GitHub dicts are dropped immediately)
+    """
+    return [RepoRecord(*map(raw.get, REPO_FIELDS)) for raw in orjson.loads(body)]
+
+
+def _is_github_failure(error: BaseException) -> bool:
+    """Errors that mean GitHub is unreachable or unhealthy (vs. a normal 4xx answer)."""
+    import httpx
+
+    return isinstance(error, (httpx.TimeoutException, httpx.RequestError, GitHubServerError))
+
+
 class GitHubClient:
     """
     GitHub API client.
-    Handles repository listing and user profile fetching.
+    Handles repository listing and user profile fetching. Requests are
+    scheduled per token by github_rate_limiter.
     """
 
     def __init__(self):
         """Initialize GitHub client."""
         self.base_url = settings.GITHUB_API_URL
-        self.timeout = 10.0  # seconds
+        self.timeout = settings.GITHUB_TIMEOUT  # seconds
+        self.guard = DependencyGuard(
+            "github",
+            is_failure=_is_github_failure,
+            failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.BREAKER_RECOVERY_TIMEOUT,
+            max_retries=settings.RETRY_MAX_ATTEMPTS,
+            retry_base=settings.RETRY_BASE_DELAY,
+            hedge=settings.GITHUB_HEDGE_ENABLED,
+        )
+        self._client: Optional["httpx.AsyncClient"] = None
 
-    async def fetch_repositories(self, token: str) -> List[Dict[str, Any]]:
+    def _http(self) -> "httpx.AsyncClient":
         """
-        Fetch user's repositories from GitHub.
+        Shared HTTP client, created on first use.
+        Keeps TCP/TLS connections to GitHub alive across calls; api.github.com
+        is resolved through the shared DNS cache (unless HTTPS_PROXY applies -
+        then the proxy resolves it).
+        """
+        if self._client is None:
+            import httpx
+            from app.core.dns_transport import cached_dns_transport
+
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=cached_dns_transport(self.base_url))
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, path: str, token: str, user_id: Optional[int], priority: int,
+                   params: Optional[Dict[str, Any]] = None, etag: Optional[str] = None) -> "httpx.Response":
+        """
+        GET a GitHub API path within the token's rate-limit schedule.
 
         Args:
+            path: API path (e.g., "/user")
             token: GitHub Personal Access Token
+            user_id: Token owner (rate-limit metrics label)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            params: Query parameters
+            etag: ETag of a previous response; a 304 answer is then returned
+                instead of raised (and doesn't count against the quota)
 
         Returns:
-            List of repository dictionaries
+            200 (or 304) response - callers parse and project the body
 
         Raises:
+            GitHubRateLimitError: If the token's quota is exhausted
+            GitHubUnavailableError: If the GitHub circuit is open
             GitHubAPIError: If API request fails
         """
-        url = f"{self.base_url}/user/repos"
+        import httpx
+
+        url = f"{self.base_url}{path}"
         headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        if etag:
+            headers["If-None-Match"] = etag
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers)
-
-                if response.status_code == 401:
-                    logger.warning("GitHub API: Unauthorized - invalid token")
-                    raise GitHubAPIError("Invalid GitHub token")
-
-                if response.status_code == 403:
-                    logger.warning("GitHub API: Forbidden - rate limit or token permissions")
-                    raise GitHubAPIError("GitHub API rate limit exceeded or insufficient permissions")
-
-                if response.status_code != 200:
-                    logger.error(f"GitHub API error: {response.status_code} - {response.text}")
-                    raise GitHubAPIError(f"GitHub API request failed: {response.status_code}")
+        async def attempt():
+            async with github_rate_limiter.slot(token, user_id, priority) as quota:
+                response = await self._http().get(url, headers=headers, params=params)
+                retry_after = github_rate_limiter.record(quota, response)
+            if response.status_code >= 500:
+                raise GitHubServerError(f"GitHub API request failed: {response.status_code}")
+            return response, retry_after
 
-                repos = response.json()
-                logger.info(f"Fetched {len(repos)} repositories from GitHub")
-                return repos
+        try:
+            # GETs are idempotent - retried (and hedged if enabled) by the guard
+            response, retry_after = await self.guard.call(attempt, idempotent=True)
 
+        except CircuitOpenError as e:
+            logger.warning(f"GitHub API: {e}")
+            raise GitHubUnavailableError("GitHub API is unavailable, try again later", e.retry_after)
+        except GitHubServerError as e:
+            logger.error(f"GitHub API error: {e}")
+            raise
+        except QuotaExhausted as e:
+            logger.warning(f"GitHub API: request held back for user {user_id} - {e}")
+            raise GitHubRateLimitError("GitHub API rate limit reached, try again later", e.retry_after)
         except httpx.TimeoutException:
             logger.error("GitHub API timeout")
             raise GitHubAPIError("GitHub API request timed out")
@@ -73,51 +200,104 @@ class GitHubClient:
             logger.error(f"GitHub API request error: {e}")
             raise GitHubAPIError(f"GitHub API request failed: {str(e)}")
 
-    async def fetch_user_profile(self, token: str) -> Dict[str, Any]:
+        if retry_after is not None:
+            raise GitHubRateLimitError("GitHub API rate limit exceeded, try again later", retry_after)
+
+        if response.status_code == 401:
+            logger.warning("GitHub API: Unauthorized - invalid token")
+            raise GitHubAPIError("Invalid GitHub token")
+
+        if response.status_code == 403:
+            logger.warning("GitHub API: Forbidden - insufficient token permissions")
+            raise GitHubAPIError("GitHub token has insufficient permissions")
+
+        if response.status_code == 304 and etag:
+            return response
+
+        if response.status_code != 200:
+            logger.error(f"GitHub API error: {response.status_code} - {response.text}")
+            raise GitHubAPIError(f"GitHub API request failed: {response.status_code}")
+
+        return response
+
+    async def fetch_repositories(self, token: str, user_id: Optional[int] = None,
+                                 priority: int = PRIORITY_INTERACTIVE) -> List[RepoRecord]:
         """
-        Fetch user's GitHub profile.
+        Fetch user's repositories from GitHub.
 
         Args:
             token: GitHub Personal Access Token
+            user_id: Token owner (rate-limit metrics label)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
 
         Returns:
-            User profile dictionary
+            List of RepoRecord (the projected fields, not GitHub's full dicts)
 
         Raises:
+            GitHubRateLimitError: If the token's quota is exhausted
+            GitHubUnavailableError: If the GitHub circuit is open
             GitHubAPIError: If API request fails
         """
-        url = f"{self.base_url}/user"
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        repos = parse_repositories((await self._get("/user/repos", token, user_id, priority)).content)
+        logger.info(f"Fetched {len(repos)} repositories from GitHub")
+        return repos
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers)
+    async def fetch_repository_page(self, token: str, page: int, since: Optional[str] = None,
+                                    etag: Optional[str] = None, user_id: Optional[int] = None,
+                                    priority: int = PRIORITY_INTERACTIVE) -> RepoPage:
+        """
+        Fetch one page of the user's repositories, most recently updated first.
 
-                if response.status_code == 401:
-                    logger.warning("GitHub API: Unauthorized - invalid token")
-                    raise GitHubAPIError("Invalid GitHub token")
+        Args:
+            token: GitHub Personal Access Token
+            page: 1-based page number (settings.GITHUB_REPOS_PER_PAGE per page)
+            since: Only repositories updated at or after this ISO 8601 time
+            etag: ETag of the same request last time (conditional request)
+            user_id: Token owner (rate-limit metrics label)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
 
-                if response.status_code == 403:
-                    logger.warning("GitHub API: Forbidden - rate limit or token permissions")
-                    raise GitHubAPIError("GitHub API rate limit exceeded or insufficient permissions")
+        Returns:
+            RepoPage (not_modified with no records if the ETag still matches)
 
-                if response.status_code != 200:
-                    logger.error(f"GitHub API error: {response.status_code} - {response.text}")
-                    raise GitHubAPIError(f"GitHub API request failed: {response.status_code}")
+        Raises:
+            GitHubRateLimitError: If the token's quota is exhausted
+            GitHubUnavailableError: If the GitHub circuit is open
+            GitHubAPIError: If API request fails
+        """
+        params = {"sort": "updated", "direction": "desc", "per_page": settings.GITHUB_REPOS_PER_PAGE, "page": page}
+        if since:
+            params["since"] = since
+        response = await self._get("/user/repos", token, user_id, priority, params=params, etag=etag)
+        if response.status_code == 304:
+            return RepoPage([], etag, has_next=False, not_modified=True)
+        return RepoPage(
+            parse_repositories(response.content),
+            response.headers.get("etag"),
+            has_next="next" in response.links,
+        )
 
-                user_profile = response.json()
-                logger.info(f"Fetched GitHub profile for user: {user_profile.get('login')}")
-                return user_profile
+    async def fetch_user_profile(self, token: str, user_id: Optional[int] = None,
+                                 priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """
+        Fetch user's GitHub profile.
 
-        except httpx.TimeoutException:
-            logger.error("GitHub API timeout")
-            raise GitHubAPIError("GitHub API request timed out")
-        except httpx.RequestError as e:
-            logger.error(f"GitHub API request error: {e}")
-            raise GitHubAPIError(f"GitHub API request failed: {str(e)}")
+        Args:
+            token: GitHub Personal Access Token
+            user_id: Token owner (rate-limit metrics label)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+        Returns:
+            User profile dictionary (GitHubUser fields only)
+
+        Raises:
+            GitHubRateLimitError: If the token's quota is exhausted
+            GitHubUnavailableError: If the GitHub circuit is open
+            GitHubAPIError: If API request fails
+        """
+        raw = orjson.loads((await self._get("/user", token, user_id, priority)).content)
+        user_profile = {name: raw.get(name) for name in PROFILE_FIELDS}
+        logger.info(f"Fetched GitHub profile for user: {user_profile.get('login')}")
+        return user_profile
 
 
 # Global GitHub client instance
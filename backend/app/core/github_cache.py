@@ -0,0 +1,354 @@
+"""
+Per-user cache of GitHub repo lists and profiles, kept warm in the background.
+
+GitHubCache serves the GitHub endpoints: a fresh entry is returned without
+touching Vault or GitHub, a miss fetches once (concurrent misses for the same
+user are coalesced). GitHubRefresher periodically re-fetches entries for users
+whose last_accessed_at is recent, before they expire, at background priority
+and within a per-cycle cap, skipping tokens the rate limiter reports as low.
+Repo lists are cached as a RepoIndex, so the index is built once per fetch.
+A repo fetch syncs github_repositories incrementally and indexes the stored
+rows; interactive fetches fall back to the stored snapshot when GitHub is
+rate-limited, down or slow. The fallback is served uncached - a slow sync
+re-caches the fresh index itself when it finishes.
+
+invalidate() (on a token change) starts a new token generation for the user.
+Callers read the generation before the token; a fetch made with an older
+generation is neither cached nor coalesced with newer ones.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.core.database import db_manager
+from app.core.github import (
+    github_client,
+    GitHubRateLimitError,
+    GitHubServerError,
+    GitHubUnavailableError,
+)
+from app.core.github_ratelimit import github_rate_limiter, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from app.core.github_sync import github_repo_sync
+from app.core.repo_index import RepoIndex
+from app.core.shutdown import shutdown_coordinator
+from app.core.singleflight import SingleFlight
+from app.core.vault import vault_client
+from app.models.queries import get_recently_active_github_users
+
+logger = logging.getLogger(__name__)
+
+# Cached kinds per user
+REPOS = "repos"
+PROFILE = "profile"
+
+
+async def fetch_repo_index(token: str, user_id: int, priority: int = PRIORITY_INTERACTIVE,
+                           generation: Optional[int] = None) -> RepoIndex:
+    """
+    Sync a user's repositories and index the stored set (the value cached under REPOS).
+
+    Interactive fetches serve the stored snapshot (RepoIndex.stale) instead of
+    failing when GitHub is rate-limited or unavailable, or instead of waiting
+    when the sync takes longer than GITHUB_SNAPSHOT_FALLBACK_AFTER - the sync
+    then finishes in the background and re-caches the fresh index.
+
+    Args:
+        token: GitHub Personal Access Token
+        user_id: Token owner
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+        generation: Token generation read before the token (default: current)
+
+    Returns:
+        RepoIndex over the user's stored repositories
+
+    Raises:
+        GitHubAPIError: If the sync fails and there is no snapshot to fall back to
+            (background fetches never fall back)
+    """
+    if generation is None:
+        generation = github_repo_sync.generation(user_id)
+    sync = asyncio.ensure_future(github_repo_sync.sync(user_id, token, priority, generation))
+    if priority != PRIORITY_INTERACTIVE:
+        await sync
+        return RepoIndex(await github_repo_sync.load_snapshot(user_id))
+
+    try:
+        await asyncio.wait_for(asyncio.shield(sync), timeout=settings.GITHUB_SNAPSHOT_FALLBACK_AFTER)
+    except asyncio.TimeoutError:
+        records = await github_repo_sync.load_snapshot(user_id)
+        if not records:
+            await sync  # Never synced - nothing to fall back to
+            return RepoIndex(await github_repo_sync.load_snapshot(user_id))
+        # Shutdown waits for it - the sync is writing the user's snapshot
+        shutdown_coordinator.track(asyncio.create_task(_recache_after_sync(sync, user_id, generation)))
+        logger.warning(f"⚠️  GitHub repo sync slow for user {user_id} - serving stored snapshot")
+        return RepoIndex(records, stale=True)
+    except (GitHubRateLimitError, GitHubUnavailableError, GitHubServerError) as e:
+        records = await github_repo_sync.load_snapshot(user_id)
+        if not records:
+            raise
+        logger.warning(f"⚠️  GitHub repo sync failed for user {user_id} ({e}) - serving stored snapshot")
+        return RepoIndex(records, stale=True)
+
+    return RepoIndex(await github_repo_sync.load_snapshot(user_id))
+
+
+async def _recache_after_sync(sync: asyncio.Future, user_id: int, generation: int) -> None:
+    """Wait for a sync that outlived its request and cache the fresh index."""
+    try:
+        await sync
+        github_cache.put(user_id, REPOS, RepoIndex(await github_repo_sync.load_snapshot(user_id)), generation)
+    except Exception as e:
+        logger.warning(f"⚠️  Background GitHub repo sync failed for user {user_id}: {e}")
+
+
+class GitHubCache:
+    """
+    LRU cache of GitHub data keyed by (user_id, kind).
+    """
+
+    def __init__(self, ttl: int = settings.GITHUB_CACHE_TTL, max_users: int = settings.GITHUB_CACHE_MAX_USERS):
+        """
+        Initialize GitHub cache.
+
+        Args:
+            ttl: Seconds an entry is served after it was fetched
+            max_users: Users kept (least recently used evicted first)
+        """
+        self.ttl = ttl
+        self.max_entries = max_users * 2  # repos + profile per user
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[Any, float]]" = OrderedDict()
+        self._flight = SingleFlight("github")
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, user_id: int, kind: str) -> Optional[Any]:
+        """
+        Get a fresh cached value.
+
+        Args:
+            user_id: Owning user ID
+            kind: REPOS or PROFILE
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get((user_id, kind))
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end((user_id, kind))
+        self._stats["hits"] += 1
+        return entry[0]
+
+    def age(self, user_id: int, kind: str) -> Optional[float]:
+        """Seconds since the entry was fetched, None if not cached."""
+        entry = self._entries.get((user_id, kind))
+        return None if entry is None else time.monotonic() - entry[1]
+
+    def put(self, user_id: int, kind: str, value: Any, generation: Optional[int] = None) -> None:
+        """Store a freshly fetched value, unless it was fetched with a replaced token."""
+        if generation is not None and generation != self.generation(user_id):
+            return
+        self._entries[(user_id, kind)] = (value, time.monotonic())
+        self._entries.move_to_end((user_id, kind))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def generation(self, user_id: int) -> int:
+        """Current token generation of a user - read it before reading the token."""
+        return github_repo_sync.generation(user_id)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop all cached data for a user after the token changes.
+
+        Starts a new token generation: fetches and syncs still in flight with
+        the previous token don't cache or store their results.
+        """
+        github_repo_sync.token_changed(user_id)
+        for kind in (REPOS, PROFILE):
+            self._entries.pop((user_id, kind), None)
+
+    async def fetch(self, user_id: int, kind: str, fetch: Callable[[], Awaitable[Any]],
+                    generation: Optional[int] = None) -> Any:
+        """
+        Fetch and cache a value; concurrent fetches for the same entry share one call.
+        A stale RepoIndex (the stored snapshot served as a fallback) is returned
+        but not cached, so the next request tries GitHub again.
+
+        Args:
+            user_id: Owning user ID
+            kind: REPOS or PROFILE
+            fetch: Zero-argument coroutine function calling GitHub
+            generation: Token generation read before the token (default: current)
+
+        Returns:
+            Fetched value
+        """
+        if generation is None:
+            generation = self.generation(user_id)
+
+        async def load():
+            value = await fetch()
+            if not getattr(value, "stale", False):
+                self.put(user_id, kind, value, generation)
+            return value
+
+        return await self._flight.do((kind, user_id, generation), load)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with entry count, hit/miss counters and hit ratio
+        """
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "entries": len(self._entries),
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / lookups, 3) if lookups else None,
+        }
+
+
+class GitHubRefresher:
+    """
+    Background task keeping recently active users' GitHub caches warm.
+    """
+
+    def __init__(self, cache: GitHubCache):
+        """
+        Initialize refresher.
+
+        Args:
+            cache: Cache to keep warm
+        """
+        self.cache = cache
+        self._task: Optional[asyncio.Task] = None
+        self._backoff_until: Dict[int, float] = {}  # user_id -> monotonic time
+        self._stats = {"cycles": 0, "refreshed": 0, "skipped_low_quota": 0, "rate_limited": 0, "errors": 0}
+
+    async def start(self) -> None:
+        """Start the refresh loop."""
+        self._task = asyncio.create_task(self._refresh_loop())
+        logger.info(f"✅ GitHub refresher started - interval: {settings.GITHUB_REFRESH_INTERVAL}s, "
+                    f"active window: {settings.GITHUB_REFRESH_ACTIVE_WINDOW}s")
+
+    async def stop(self) -> None:
+        """Stop the refresh loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("GitHub refresher stopped")
+
+    async def _refresh_loop(self) -> None:
+        """Run a refresh cycle every GITHUB_REFRESH_INTERVAL seconds."""
+        while True:
+            try:
+                await asyncio.sleep(settings.GITHUB_REFRESH_INTERVAL)
+                await self.refresh_cycle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ GitHub refresh cycle failed: {e}")
+
+    async def refresh_cycle(self) -> int:
+        """
+        Refresh entries of recently active users that would expire before the next cycle.
+
+        Returns:
+            Number of users refreshed
+        """
+        self._stats["cycles"] += 1
+        since = datetime.utcnow() - timedelta(seconds=settings.GITHUB_REFRESH_ACTIVE_WINDOW)
+        async with db_manager.get_session(readonly=True) as session:
+            user_ids = await get_recently_active_github_users(session, since, settings.GITHUB_REFRESH_MAX_PER_CYCLE)
+
+        # Entries younger than this are still fresh at the next cycle
+        refresh_age = max(0.0, self.cache.ttl - 2 * settings.GITHUB_REFRESH_INTERVAL)
+        now = time.monotonic()
+        due = [
+            user_id for user_id in user_ids
+            if self._backoff_until.get(user_id, 0.0) <= now and self._needs_refresh(user_id, refresh_age)
+        ]
+        if not due:
+            return 0
+
+        semaphore = asyncio.Semaphore(settings.GITHUB_REFRESH_CONCURRENCY)
+        stop = asyncio.Event()  # Set when GitHub itself is unavailable
+
+        async def refresh(user_id: int) -> bool:
+            async with semaphore:
+                if stop.is_set():
+                    return False
+                return await self._refresh_user(user_id, stop)
+
+        results = await asyncio.gather(*(refresh(user_id) for user_id in due))
+        refreshed = sum(results)
+        self._stats["refreshed"] += refreshed
+        self._backoff_until = {u: t for u, t in self._backoff_until.items() if t > now}
+        logger.info(f"🔄 GitHub refresh cycle: {refreshed}/{len(due)} users refreshed")
+        return refreshed
+
+    def _needs_refresh(self, user_id: int, refresh_age: float) -> bool:
+        """Whether any of the user's entries is missing or at least refresh_age old."""
+        for kind in (REPOS, PROFILE):
+            age = self.cache.age(user_id, kind)
+            if age is None or age >= refresh_age:
+                return True
+        return False
+
+    async def _refresh_user(self, user_id: int, stop: asyncio.Event) -> bool:
+        """Re-fetch one user's repos and profile at background priority."""
+        try:
+            generation = self.cache.generation(user_id)
+            token_data = await vault_client.read_secret(f"github/user-{user_id}/token")
+            token = token_data.get("token")
+            if not token:
+                return False
+
+            headroom = github_rate_limiter.headroom(token)
+            if headroom is not None and headroom < settings.GITHUB_REFRESH_MIN_QUOTA:
+                self._stats["skipped_low_quota"] += 1
+                return False
+
+            await self.cache.fetch(user_id, REPOS, lambda: fetch_repo_index(
+                token, user_id, priority=PRIORITY_BACKGROUND, generation=generation), generation)
+            await self.cache.fetch(user_id, PROFILE, lambda: github_client.fetch_user_profile(
+                token, user_id=user_id, priority=PRIORITY_BACKGROUND), generation)
+            return True
+
+        except GitHubUnavailableError:
+            stop.set()  # Circuit open - don't queue the rest of the cycle behind it
+            return False
+        except GitHubRateLimitError as e:
+            self._stats["rate_limited"] += 1
+            self._backoff_until[user_id] = time.monotonic() + e.retry_after
+            return False
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"⚠️  GitHub refresh failed for user {user_id}: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get refresher statistics.
+
+        Returns:
+            Dict with cycle/refresh counters and users currently backed off
+        """
+        return {**self._stats, "backed_off_users": len(self._backoff_until)}
+
+
+# Global GitHub cache and refresher instances
+github_cache = GitHubCache()
+github_refresher = GitHubRefresher(github_cache)
@@ -0,0 +1,334 @@
+"""
+Per-token GitHub rate-limit scheduler.
+
+Tracks each token's quota from the X-RateLimit-* headers and holds requests
+back before GitHub starts rejecting them: background calls stop early to
+leave headroom for interactive ones, an exhausted token waits for its reset,
+and Retry-After / secondary-limit responses block the token until GitHub
+says it may continue. Per-token concurrency is capped, with interactive
+requests served first. A request that would have to wait longer than its
+priority allows fails fast with a retry hint instead.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, AsyncIterator, TYPE_CHECKING
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Request priorities (lower is served first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Cap on tokens tracked; idle entries are evicted beyond this
+MAX_TRACKED_TOKENS = 10000
+
+
+class QuotaExhausted(Exception):
+    """Raised when a request would have to wait longer than its priority allows."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"GitHub rate limit reached, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class _PrioritySemaphore:
+    """Semaphore that hands freed slots to the lowest priority value first."""
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: List[tuple] = []  # (priority, seq, future)
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def try_acquire(self) -> bool:
+        if self._value > 0 and not self.waiting:
+            self._value -= 1
+            return True
+        return False
+
+    async def acquire(self, priority: int) -> None:
+        if self.try_acquire():
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot was handed over just as we were cancelled - pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._value += 1
+
+
+class TokenQuota:
+    """Rate-limit state for one GitHub token."""
+
+    def __init__(self, user_id: Optional[int]):
+        self.user_id = user_id
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0  # Epoch seconds (X-RateLimit-Reset)
+        self.blocked_until = 0.0  # Epoch seconds (Retry-After / secondary limit)
+        self.inflight = 0
+        self.secondary_hits = 0  # Consecutive secondary-limit responses
+        self.last_used = time.time()
+        self.slots = _PrioritySemaphore(settings.GITHUB_MAX_CONCURRENCY_PER_TOKEN)
+        self.counters = {"requests": 0, "delayed": 0, "rejected": 0, "rate_limited": 0}
+
+
+class GitHubRateLimiter:
+    """
+    Schedules GitHub requests per token based on observed quota.
+    """
+
+    def __init__(self):
+        """Initialize rate limiter."""
+        self._quotas: Dict[str, TokenQuota] = {}
+
+    @staticmethod
+    def _key(token: str) -> str:
+        """Quota key for a token (the token itself is never stored)."""
+        return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+    def _quota(self, token: str, user_id: Optional[int]) -> TokenQuota:
+        key = self._key(token)
+        quota = self._quotas.get(key)
+        if quota is None:
+            if len(self._quotas) >= MAX_TRACKED_TOKENS:
+                self._evict_idle()
+            quota = self._quotas[key] = TokenQuota(user_id)
+        if user_id is not None:
+            quota.user_id = user_id
+        quota.last_used = time.time()
+        return quota
+
+    def _evict_idle(self) -> None:
+        """Drop the least recently used half of the idle entries."""
+        idle = sorted(
+            (q.last_used, key) for key, q in self._quotas.items()
+            if not q.inflight and not q.slots.waiting
+        )
+        for _, key in idle[:max(1, len(idle) // 2)]:
+            del self._quotas[key]
+
+    def _delay(self, quota: TokenQuota, priority: int, now: float) -> float:
+        """
+        Seconds before a request with this priority may start (0 = now).
+
+        Args:
+            quota: Token state
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            now: Current epoch time
+        """
+        if quota.blocked_until > now:
+            return quota.blocked_until - now
+        if quota.remaining is None or quota.reset_at <= now:
+            return 0.0  # Unknown yet, or the window has reset
+
+        available = quota.remaining - quota.inflight
+        reserve = 0
+        if priority != PRIORITY_INTERACTIVE and quota.limit:
+            reserve = int(quota.limit * settings.GITHUB_RATELIMIT_BACKGROUND_RESERVE)
+        if available <= reserve:
+            return quota.reset_at - now + 1  # +1s for clock skew against GitHub
+        return 0.0
+
+    @asynccontextmanager
+    async def slot(self, token: str, user_id: Optional[int] = None,
+                   priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[TokenQuota]:
+        """
+        Wait until a request for this token may be sent.
+
+        Args:
+            token: GitHub token the request uses
+            user_id: Owner of the token (metrics label)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+        Yields:
+            TokenQuota to pass to record() with the response
+
+        Raises:
+            QuotaExhausted: If the wait would exceed the priority's budget
+        """
+        quota = self._quota(token, user_id)
+        max_wait = (settings.GITHUB_RATELIMIT_MAX_WAIT if priority == PRIORITY_INTERACTIVE
+                    else settings.GITHUB_RATELIMIT_BACKGROUND_MAX_WAIT)
+        deadline = time.time() + max_wait
+
+        # The quota delay is waited out before taking a concurrency slot, so a
+        # held-back request never blocks the token's other requests; the quota
+        # is checked again once the slot is held and the slot handed back if
+        # it has moved meanwhile
+        delayed = False
+        while True:
+            delayed = await self._wait_for_quota(quota, priority, deadline) or delayed
+            if not quota.slots.try_acquire():
+                try:
+                    await asyncio.wait_for(quota.slots.acquire(priority), timeout=max(0.0, deadline - time.time()))
+                except asyncio.TimeoutError:
+                    quota.counters["rejected"] += 1
+                    raise QuotaExhausted(1.0)
+            if self._delay(quota, priority, time.time()) <= 0:
+                break
+            quota.slots.release()
+
+        try:
+            if delayed:
+                quota.counters["delayed"] += 1
+
+            quota.inflight += 1
+            quota.counters["requests"] += 1
+            try:
+                yield quota
+            finally:
+                quota.inflight -= 1
+        finally:
+            quota.slots.release()
+
+    async def _wait_for_quota(self, quota: TokenQuota, priority: int, deadline: float) -> bool:
+        """
+        Sleep until the quota lets a request with this priority start.
+
+        Args:
+            quota: Token state
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            deadline: Epoch time the request must have started by
+
+        Returns:
+            True if the request had to wait
+
+        Raises:
+            QuotaExhausted: If the wait would run past the deadline
+        """
+        delayed = False
+        while True:
+            now = time.time()
+            delay = self._delay(quota, priority, now)
+            if delay <= 0:
+                return delayed
+            if now + delay > deadline:
+                quota.counters["rejected"] += 1
+                raise QuotaExhausted(delay)
+            delayed = True
+            await asyncio.sleep(delay)
+
+    def record(self, quota: TokenQuota, response: "httpx.Response") -> Optional[float]:
+        """
+        Update quota state from a GitHub response.
+
+        Args:
+            quota: TokenQuota yielded by slot()
+            response: GitHub API response
+
+        Returns:
+            Seconds to back off if the response is a rate-limit rejection, else None
+        """
+        now = time.time()
+        headers = response.headers
+
+        if "x-ratelimit-remaining" in headers:
+            try:
+                remaining = int(headers["x-ratelimit-remaining"])
+                reset_at = float(headers.get("x-ratelimit-reset", 0))
+                quota.limit = int(headers.get("x-ratelimit-limit", quota.limit or 0)) or quota.limit
+            except ValueError:
+                remaining, reset_at = None, 0.0
+            if remaining is not None:
+                if reset_at != quota.reset_at or quota.remaining is None:
+                    quota.remaining, quota.reset_at = remaining, reset_at  # New window
+                else:
+                    # Responses can arrive out of order - keep the lowest count seen
+                    quota.remaining = min(quota.remaining, remaining)
+
+        if response.status_code not in (403, 429):
+            quota.secondary_hits = 0
+            return None
+
+        retry_after = headers.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            blocked_until = now + int(retry_after)
+        elif quota.remaining == 0 and quota.reset_at > now:
+            blocked_until = quota.reset_at
+        elif response.status_code == 429 or "rate limit" in response.text.lower():
+            # Secondary limit without Retry-After: back off exponentially from a minute
+            backoff = settings.GITHUB_SECONDARY_LIMIT_BACKOFF * (2 ** min(quota.secondary_hits, 4))
+            quota.secondary_hits += 1
+            blocked_until = now + backoff
+        else:
+            return None  # Plain 403 - insufficient permissions
+
+        quota.blocked_until = max(quota.blocked_until, blocked_until)
+        quota.counters["rate_limited"] += 1
+        wait = quota.blocked_until - now
+        logger.warning(f"⚠️  GitHub rate limit hit (user {quota.user_id}) - blocking token for {wait:.0f}s")
+        return wait
+
+    def headroom(self, token: str) -> Optional[float]:
+        """
+        Fraction of the token's quota left in the current window.
+
+        Args:
+            token: GitHub token
+
+        Returns:
+            0.0-1.0 (0.0 while blocked), or None if the quota hasn't been observed yet
+        """
+        quota = self._quotas.get(self._key(token))
+        if quota is None:
+            return None
+        now = time.time()
+        if quota.blocked_until > now:
+            return 0.0
+        if quota.remaining is None or not quota.limit or quota.reset_at <= now:
+            return None
+        return quota.remaining / quota.limit
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-token quota state.
+
+        Returns:
+            Dict with tracked token count and per-user quota entries
+        """
+        now = time.time()
+        tokens = []
+        for key, q in self._quotas.items():
+            tokens.append({
+                "token": key[:8],
+                "user_id": q.user_id,
+                "limit": q.limit,
+                "remaining": q.remaining,
+                "reset_in_s": round(max(0.0, q.reset_at - now), 1),
+                "blocked_for_s": round(max(0.0, q.blocked_until - now), 1),
+                "inflight": q.inflight,
+                "waiting": q.slots.waiting,
+                **q.counters,
+            })
+        tokens.sort(key=lambda t: (t["remaining"] is None, t["remaining"] or 0))
+        return {"tracked_tokens": len(tokens), "tokens": tokens}
+
+
+# Global GitHub rate limiter instance
+github_rate_limiter = GitHubRateLimiter()
@@ -0,0 +1,227 @@
+"""
+Incremental sync of users' GitHub repositories into github_repositories.
+
+Pages /user/repos most recently updated first. An incremental sync asks only
+for repos updated since the newest one already stored, with the ETag of the
+previous identical request - nothing changed costs one 304 (which GitHub
+doesn't count against the quota). Changed rows are written with a bulk
+INSERT ... ON CONFLICT DO UPDATE that skips rows whose values are unchanged.
+A periodic full sync catches deletions and changes that don't bump
+updated_at (e.g. star counts).
+
+A token change bumps the user's generation: a sync still running with the
+previous token writes nothing, so it can't refill the snapshot that the
+token change dropped.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.core.database import db_manager
+from app.core.github import github_client, RepoRecord
+from app.core.github_ratelimit import PRIORITY_INTERACTIVE
+from app.core.singleflight import SingleFlight
+from app.models.queries import (
+    delete_github_repositories_except,
+    get_github_repositories,
+    get_github_sync_state,
+    update_github_sync_state,
+    upsert_github_repositories,
+)
+
+logger = logging.getLogger(__name__)
+
+# GitHub's timestamp format (RepoRecord keeps timestamps as these strings)
+GITHUB_TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _parse_ts(value: str) -> datetime:
+    """GitHub timestamp -> naive UTC datetime (the schema's TIMESTAMP convention)."""
+    return datetime.fromisoformat(value).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class GitHubRepoSync:
+    """
+    Keeps each user's github_repositories rows in step with GitHub.
+    """
+
+    def __init__(self):
+        """Initialize repository sync."""
+        self._flight = SingleFlight("github_sync")
+        self._generations: Dict[int, int] = {}
+        self._stats = {"full": 0, "incremental": 0, "not_modified": 0, "pages": 0, "upserted": 0, "deleted": 0,
+                       "discarded": 0}
+
+    def generation(self, user_id: int) -> int:
+        """Current token generation of a user (bumped by token_changed)."""
+        return self._generations.get(user_id, 0)
+
+    def token_changed(self, user_id: int) -> None:
+        """
+        Start a new token generation for a user.
+
+        Call before dropping the previous token's snapshot: syncs started
+        with the previous token discard their results instead of writing them.
+
+        Args:
+            user_id: User whose GitHub token changed
+        """
+        self._generations[user_id] = self.generation(user_id) + 1
+
+    async def sync(self, user_id: int, token: str, priority: int = PRIORITY_INTERACTIVE,
+                   generation: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Bring the user's stored repositories up to date.
+        Concurrent syncs for the same user and token generation share one run.
+
+        Args:
+            user_id: Owning user ID
+            token: GitHub Personal Access Token
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            generation: Token generation read before the token (default: current)
+
+        Returns:
+            Dict with mode (full/incremental), pages fetched, repos upserted/deleted,
+            whether GitHub answered 304 and whether the token changed mid-sync
+            (discarded - nothing was written)
+
+        Raises:
+            GitHubRateLimitError: If the token's quota is exhausted
+            GitHubUnavailableError: If the GitHub circuit is open
+            GitHubAPIError: If a GitHub request fails
+        """
+        if generation is None:
+            generation = self.generation(user_id)
+        return await self._flight.do(
+            ("sync", user_id, generation), lambda: self._sync(user_id, token, priority, generation)
+        )
+
+    def _discard(self, user_id: int, mode: str, pages: int) -> Dict[str, Any]:
+        """Result of a sync whose token was replaced before it could write."""
+        self._stats["discarded"] += 1
+        logger.info(f"🔄 GitHub repo sync for user {user_id} discarded - token changed mid-sync")
+        return {"mode": mode, "not_modified": False, "pages": pages, "upserted": 0, "deleted": 0, "discarded": True}
+
+    async def _sync(self, user_id: int, token: str, priority: int, generation: int) -> Dict[str, Any]:
+        async with db_manager.get_session() as session:
+            state = await get_github_sync_state(session, user_id)
+
+        now = datetime.utcnow()
+        full = (
+            state is None or state.repos_full_synced_at is None or state.repos_since is None
+            or now - state.repos_full_synced_at >= timedelta(seconds=settings.GITHUB_REPO_FULL_SYNC_INTERVAL)
+        )
+        since = None if full else state.repos_since.strftime(GITHUB_TS_FORMAT)
+        etag = None if full else state.repos_etag
+
+        # Fetch every page before touching the database - no connection held across GitHub calls
+        records: List[RepoRecord] = []
+        first_etag = None
+        page = 1
+        while True:
+            result = await github_client.fetch_repository_page(
+                token, page, since=since, etag=etag if page == 1 else None, user_id=user_id, priority=priority
+            )
+            self._stats["pages"] += 1
+            if result.not_modified:
+                break
+            if page == 1:
+                first_etag = result.etag
+            records.extend(result.records)
+            if not result.has_next:
+                break
+            page += 1
+
+        # Each write below updates the sync state first: that locks the user's
+        # github_integrations row, which a token change updates before it drops
+        # the snapshot. Either the token change waits for this commit and drops
+        # what it wrote, or it has already bumped the generation and this
+        # transaction is rolled back.
+        if result.not_modified:
+            # Nothing updated since the last sync
+            async with db_manager.get_session() as session:
+                await update_github_sync_state(session, user_id, etag, state.repos_since, now, state.repos_full_synced_at)
+                if self.generation(user_id) != generation:
+                    return self._discard(user_id, "incremental", 1)
+                await session.commit()
+            self._stats["not_modified"] += 1
+            return {"mode": "incremental", "not_modified": True, "pages": 1, "upserted": 0, "deleted": 0,
+                    "discarded": False}
+
+        rows = [
+            {
+                "user_id": user_id,
+                "repo_id": r.id,
+                "name": r.name,
+                "full_name": r.full_name,
+                "description": r.description,
+                "private": r.private,
+                "html_url": r.html_url,
+                "language": r.language,
+                "stargazers_count": r.stargazers_count or 0,
+                "forks_count": r.forks_count or 0,
+                "created_at": _parse_ts(r.created_at),
+                "updated_at": _parse_ts(r.updated_at),
+                "synced_at": now,
+            }
+            for r in records
+        ]
+        newest = max((row["updated_at"] for row in rows), default=None)
+        if not full:
+            newest = max(newest or state.repos_since, state.repos_since)
+        # The next incremental request is for since=newest; this response's ETag
+        # only matches it if since didn't move
+        next_etag = first_etag if not full and newest == state.repos_since else None
+
+        mode = "full" if full else "incremental"
+        deleted = 0
+        async with db_manager.get_session() as session:
+            await update_github_sync_state(
+                session, user_id, next_etag, newest, now, now if full else state.repos_full_synced_at
+            )
+            if self.generation(user_id) != generation:
+                return self._discard(user_id, mode, page)
+            await upsert_github_repositories(session, rows)
+            if full:
+                deleted = await delete_github_repositories_except(session, user_id, [row["repo_id"] for row in rows])
+            await session.commit()
+
+        self._stats[mode] += 1
+        self._stats["upserted"] += len(rows)
+        self._stats["deleted"] += deleted
+        logger.info(f"🔄 GitHub repo sync ({mode}) for user {user_id}: {page} page(s), "
+                    f"{len(rows)} upserted, {deleted} deleted")
+        return {"mode": mode, "not_modified": False, "pages": page, "upserted": len(rows), "deleted": deleted,
+                "discarded": False}
+
+    async def load_snapshot(self, user_id: int) -> List[RepoRecord]:
+        """
+        Read the user's stored repositories.
+
+        Args:
+            user_id: Owning user ID
+
+        Returns:
+            List of RepoRecord (empty if never synced)
+        """
+        async with db_manager.get_session() as session:
+            rows = await get_github_repositories(session, user_id)
+        return [
+            RepoRecord(*row[:6], row[6].strftime(GITHUB_TS_FORMAT), row[7].strftime(GITHUB_TS_FORMAT), *row[8:])
+            for row in rows
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get sync statistics.
+
+        Returns:
+            Dict with sync counts by mode, 304s, discarded syncs, pages fetched and rows written
+        """
+        return dict(self._stats)
+
+
+# Global GitHub repository sync instance
+github_repo_sync = GitHubRepoSync()
@@ -0,0 +1,217 @@
+"""
+Background Vault lease revocation queue.
+
+Released leases are queued instead of revoked inline, so credential rotation
+and shutdown don't wait on the revoke round trip. A worker task drains due
+entries in batches and retries failures with exponential backoff. Pending
+entries are mirrored to a small JSON journal so a restart picks them up
+instead of leaving live Postgres roles behind until their TTL; the journal
+is rewritten by the worker on a thread, never on the request path.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from app.config import settings
+from app.core.vault import vault_client
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseRevoker:
+    """
+    Queue of leases to revoke, drained by a background worker.
+    """
+
+    def __init__(self, journal_path: Optional[str] = settings.LEASE_REVOKE_JOURNAL_PATH):
+        """
+        Initialize lease revoker.
+
+        Args:
+            journal_path: JSON file mirroring pending revocations (None disables)
+        """
+        self.journal_path = journal_path
+        # lease_id -> {"attempts", "next_attempt", "expires_at"} (wall-clock seconds)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Bumped when leases are added or removed; the journal is rewritten until it catches up
+        self._journal_version = 0
+        self._journal_saved = 0
+        self._journal_lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"revoked": 0, "failures": 0, "dropped_expired": 0}
+
+    async def start(self) -> None:
+        """Load the journal and start the worker task."""
+        restored = await asyncio.to_thread(self._load_journal)
+        if restored:
+            logger.info(f"🔄 Restored {restored} pending lease revocation(s) from journal")
+        self._task = asyncio.create_task(self._worker())
+        logger.info("✅ Lease revocation worker started")
+
+    async def stop(self, drain_timeout: float = settings.LEASE_REVOKE_DRAIN_TIMEOUT) -> None:
+        """
+        Stop the worker after a final best-effort drain.
+        Anything still pending stays in the journal for the next start.
+
+        Args:
+            drain_timeout: Seconds allowed for the final drain
+        """
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._pending:
+            for entry in self._pending.values():
+                entry["next_attempt"] = 0.0
+            try:
+                await asyncio.wait_for(self._drain(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️  Lease revocation drain timed out - {len(self._pending)} left in journal")
+        await self._flush_journal()
+        logger.info("Lease revocation worker stopped")
+
+    def release(self, lease_id: str, expires_at: Optional[float] = None) -> None:
+        """
+        Queue a lease for revocation. Returns immediately.
+
+        Args:
+            lease_id: Lease no longer in use
+            expires_at: Wall-clock expiry; once past it there is nothing to revoke
+        """
+        self._pending[lease_id] = {"attempts": 0, "next_attempt": 0.0, "expires_at": expires_at}
+        self._journal_version += 1
+        self._wakeup.set()
+        logger.info(f"Lease queued for revocation: {lease_id}")
+
+    async def _worker(self) -> None:
+        """Drain due entries, then sleep until the next one is due or a lease is released."""
+        while True:
+            try:
+                self._wakeup.clear()
+                await self._flush_journal()  # Journal new leases before revoking them
+                await self._drain()
+                due = [e["next_attempt"] for e in self._pending.values()]
+                timeout = max(0.0, min(due) - time.time()) if due else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Lease revocation worker error: {e}")
+                await asyncio.sleep(settings.LEASE_REVOKE_RETRY_BASE)
+
+    async def _drain(self) -> None:
+        """Revoke every entry that is due, LEASE_REVOKE_BATCH_SIZE at a time."""
+        while True:
+            now = time.time()
+            expired = [lid for lid, e in self._pending.items() if e["expires_at"] and e["expires_at"] <= now]
+            for lease_id in expired:
+                del self._pending[lease_id]
+                self._stats["dropped_expired"] += 1
+            if expired:
+                self._journal_version += 1
+                logger.info(f"Dropped {len(expired)} expired lease(s) from revocation queue")
+
+            due = [lid for lid, e in self._pending.items() if e["next_attempt"] <= now]
+            if not due:
+                await self._flush_journal()
+                return
+
+            # Always per lease: revoke-prefix would also cut off other replicas'
+            # live credentials issued under the same role
+            batch = due[:settings.LEASE_REVOKE_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(vault_client.revoke_lease(lid) for lid in batch),
+                return_exceptions=True,
+            )
+
+            for lease_id, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    self._schedule_retry(lease_id, result)
+                else:
+                    self._pending.pop(lease_id, None)
+                    self._journal_version += 1
+                    self._stats["revoked"] += 1
+
+            await self._flush_journal()
+
+    def _schedule_retry(self, lease_id: str, error: Exception) -> None:
+        """Back off exponentially before the next attempt for this lease."""
+        entry = self._pending[lease_id]
+        entry["attempts"] += 1
+        delay = min(settings.LEASE_REVOKE_RETRY_BASE * (2 ** (entry["attempts"] - 1)), settings.LEASE_REVOKE_RETRY_MAX)
+        entry["next_attempt"] = time.time() + delay
+        self._stats["failures"] += 1
+        logger.warning(f"⚠️  Lease revocation failed ({lease_id}, attempt {entry['attempts']}), retry in {delay}s: {error}")
+
+    def _load_journal(self) -> int:
+        """Read pending entries left by a previous run. Returns the number restored."""
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return 0
+        try:
+            with open(self.journal_path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable lease journal {self.journal_path}: {e}")
+            return 0
+        for lease_id, expires_at in entries.items():
+            self._pending.setdefault(lease_id, {"attempts": 0, "next_attempt": 0.0, "expires_at": expires_at})
+        return len(entries)
+
+    async def _flush_journal(self) -> None:
+        """Rewrite the journal on a worker thread if the pending set changed since the last write."""
+        if not self.journal_path or self._journal_saved == self._journal_version:
+            return
+        entries = {lid: e["expires_at"] for lid, e in self._pending.items()}
+        await asyncio.to_thread(self._save_journal, entries, self._journal_version)
+
+    def _save_journal(self, entries: Dict[str, Optional[float]], version: int) -> None:
+        """
+        Atomically rewrite the journal (runs on a worker thread).
+
+        Args:
+            entries: lease_id -> expires_at snapshot taken on the event loop
+            version: _journal_version of the snapshot; an older snapshot whose
+                write was overtaken (e.g. by the final drain) is skipped
+        """
+        with self._journal_lock:
+            if version <= self._journal_saved:
+                return
+            tmp_path = f"{self.journal_path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.journal_path)
+                self._journal_saved = version
+            except OSError as e:
+                logger.warning(f"⚠️  Failed to write lease journal {self.journal_path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get revocation queue statistics.
+
+        Returns:
+            Dict with pending count, highest attempt count and totals
+        """
+        return {
+            "pending": len(self._pending),
+            "max_attempts": max((e["attempts"] for e in self._pending.values()), default=0),
+            **self._stats,
+        }
+
+
+# Global lease revoker instance
+lease_revoker = LeaseRevoker()
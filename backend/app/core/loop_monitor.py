@@ -0,0 +1,195 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A heartbeat task on the event loop measures how late each periodic sleep
+wakes up and records it in a fixed-bucket histogram. A watchdog thread
+checks the heartbeat; when the loop has not come back for longer than
+LOOP_STALL_THRESHOLD it captures the loop thread's current stack, which is
+the code blocking the loop (sync hvac/bcrypt/gRPC calls and the like).
+Cost is one short timer callback per interval plus one thread wake-up, so
+unlike asyncio debug mode it can stay on in production.
+"""
+
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional, Dict, Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (Prometheus-style, cumulative on export)
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Cap on distinct offender locations kept for aggregation
+MAX_OFFENDERS = 200
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag continuously and records stalls with their stacks.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.LOOP_MONITOR_INTERVAL,
+        threshold: float = settings.LOOP_STALL_THRESHOLD,
+        history: int = settings.LOOP_STALL_HISTORY,
+    ):
+        """
+        Initialize loop monitor.
+
+        Args:
+            interval: Heartbeat interval in seconds
+            threshold: Lag in seconds after which a stall's stack is captured
+            history: Number of recent stalls kept
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self._bucket_counts = [0] * (len(LAG_BUCKETS_MS) + 1)  # last bucket = +Inf
+        self._lag_count = 0
+        self._lag_sum_ms = 0.0
+        self._lag_max_ms = 0.0
+        self._stalls_total = 0
+        self._recent_stalls: deque = deque(maxlen=history)
+        self._offenders: Dict[str, Dict[str, Any]] = {}
+        self._pending_stall: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._beat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def start(self) -> None:
+        """Start the heartbeat task on the running loop and the watchdog thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"✅ Event-loop monitor started - interval: {self.interval}s, stall threshold: {self.threshold}s")
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and watchdog thread."""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog:
+            self._watchdog.join(timeout=self.interval * 2)
+        logger.info("Event-loop monitor stopped")
+
+    async def _heartbeat(self) -> None:
+        """Sleep for `interval` and record how late the wake-up was."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._observe(lag * 1000)
+
+    def _observe(self, lag_ms: float) -> None:
+        """Record one lag sample and close out a stall the watchdog opened."""
+        self._bucket_counts[bisect.bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+        self._lag_count += 1
+        self._lag_sum_ms += lag_ms
+        self._lag_max_ms = max(self._lag_max_ms, lag_ms)
+
+        with self._lock:
+            stall, self._pending_stall = self._pending_stall, None
+        if stall is None:
+            return
+
+        stall["duration_ms"] = round(lag_ms, 1)
+        self._stalls_total += 1
+        self._recent_stalls.append(stall)
+
+        offender = self._offenders.get(stall["location"])
+        if offender is None and len(self._offenders) < MAX_OFFENDERS:
+            offender = self._offenders[stall["location"]] = {
+                "location": stall["location"], "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+            }
+        if offender is not None:
+            offender["count"] += 1
+            offender["total_ms"] += lag_ms
+            offender["max_ms"] = max(offender["max_ms"], lag_ms)
+            offender["last_seen"] = stall["timestamp"]
+            offender["stack"] = stall["stack"]
+
+        logger.warning(f"⚠️  Event loop blocked for {lag_ms:.0f}ms at {stall['location']}")
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack while it is stalled."""
+        while not self._stop.wait(self.interval):
+            blocked_for = time.monotonic() - self._beat - self.interval
+            if blocked_for < self.threshold:
+                continue
+            with self._lock:
+                if self._pending_stall is not None:
+                    continue  # already captured this stall
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                stack = traceback.extract_stack(frame)[-settings.LOOP_STALL_STACK_DEPTH:]
+                self._pending_stall = {
+                    "timestamp": time.time(),
+                    "location": self._locate(stack),
+                    "stack": [f"{f.filename}:{f.lineno} in {f.name}" for f in stack],
+                }
+
+    @staticmethod
+    def _locate(stack: traceback.StackSummary) -> str:
+        """Innermost frame in application code, falling back to the innermost frame."""
+        for f in reversed(stack):
+            if "/app/" in f.filename and "loop_monitor" not in f.filename:
+                return f"{f.filename}:{f.lineno} in {f.name}"
+        f = stack[-1]
+        return f"{f.filename}:{f.lineno} in {f.name}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get lag histogram and stall offenders.
+
+        Returns:
+            Dict with cumulative histogram buckets, totals, recent stalls and
+            offenders ordered by total blocked time
+        """
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(list(LAG_BUCKETS_MS) + ["+Inf"], self._bucket_counts):
+            cumulative += count
+            buckets.append({"le_ms": bound, "count": cumulative})
+
+        offenders = sorted(self._offenders.values(), key=lambda o: o["total_ms"], reverse=True)
+        return {
+            "interval_s": self.interval,
+            "stall_threshold_s": self.threshold,
+            "lag_histogram": {
+                "buckets": buckets,
+                "count": self._lag_count,
+                "sum_ms": round(self._lag_sum_ms, 1),
+                "max_ms": round(self._lag_max_ms, 1),
+            },
+            "stalls_total": self._stalls_total,
+            "recent_stalls": list(reversed(self._recent_stalls)),
+            "top_offenders": [
+                {**o, "total_ms": round(o["total_ms"], 1), "max_ms": round(o["max_ms"], 1)}
+                for o in offenders[:20]
+            ],
+        }
+
+
+# Global loop monitor instance
+loop_monitor = LoopMonitor()
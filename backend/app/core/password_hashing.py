@@ -0,0 +1,261 @@
+"""
+Password hashing schemes, cost calibration and rehash detection.
+
+Two schemes are supported:
+- bcrypt (default) - cost is log2 of the key-expansion rounds
+- scrypt (memory-hard, from hashlib) - cost is log2(N); each hash needs
+  128 * r * N bytes, so the cost also sets memory per concurrent login
+
+Stored hashes carry their own parameters, so verification works for any
+scheme/cost. needs_rehash() flags hashes from another scheme or a weaker cost;
+login then re-hashes with the current parameters. Stronger hashes are never
+downgraded, so pods calibrated on different hardware don't flip-flop a hash.
+
+Calibration times one hash at the scheme's minimum cost and extrapolates
+(both schemes double in time per cost step) to the highest cost within the
+target latency. At startup the configured cost is the floor - calibration
+only ever raises it, and logs a warning if even that floor misses the
+target. Run it as a CLI to pick a setting deliberately:
+
+    python -m app.core.password_hashing [--scheme scrypt] [--target-ms 250]
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import math
+import os
+import time
+from typing import Optional, Tuple
+
+import bcrypt
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BCRYPT = "bcrypt"
+SCRYPT = "scrypt"
+SCHEMES = (BCRYPT, SCRYPT)
+
+# Cost bounds per scheme; scrypt's upper bound keeps one hash at 64 MiB (r=8)
+MIN_COST = {BCRYPT: 10, SCRYPT: 14}
+MAX_COST = {BCRYPT: 16, SCRYPT: 16}
+
+SCRYPT_SALT_BYTES = 16
+SCRYPT_KEY_BYTES = 32
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    n = 1 << log_n
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=128 * r * (n + p + 2) + (1 << 20), dklen=SCRYPT_KEY_BYTES,
+    )
+
+
+def _parse_scrypt(hashed: str) -> Tuple[int, int, int, bytes, bytes]:
+    """$scrypt$ln=15,r=8,p=1$<salt>$<key> -> (log_n, r, p, salt, key)."""
+    _, _, params, salt, key = hashed.split("$")
+    values = dict(item.split("=") for item in params.split(","))
+    return int(values["ln"]), int(values["r"]), int(values["p"]), _unb64(salt), _unb64(key)
+
+
+def identify(hashed: str) -> Optional[Tuple[str, int]]:
+    """
+    Scheme and cost of a stored hash.
+
+    Returns:
+        (scheme, cost), or None if the format is not recognised
+    """
+    try:
+        if hashed.startswith(("$2a$", "$2b$", "$2y$")):
+            return BCRYPT, int(hashed.split("$")[2])
+        if hashed.startswith("$scrypt$"):
+            return SCRYPT, _parse_scrypt(hashed)[0]
+    except (ValueError, KeyError, IndexError):
+        pass
+    return None
+
+
+def hash_with(password: str, scheme: str, cost: int) -> str:
+    """
+    Hash a password with an explicit scheme and cost.
+
+    Args:
+        password: Plain text password
+        scheme: BCRYPT or SCRYPT
+        cost: bcrypt rounds or scrypt log2(N)
+
+    Returns:
+        Encoded hash including its parameters
+    """
+    if scheme == BCRYPT:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=cost)).decode("utf-8")
+    if scheme == SCRYPT:
+        salt = os.urandom(SCRYPT_SALT_BYTES)
+        key = _scrypt(password, salt, cost, settings.SCRYPT_R, settings.SCRYPT_P)
+        return f"$scrypt$ln={cost},r={settings.SCRYPT_R},p={settings.SCRYPT_P}${_b64(salt)}${_b64(key)}"
+    raise ValueError(f"Unsupported password hash scheme: {scheme}")
+
+
+def calibrate(scheme: str, target_ms: float, samples: int = 3,
+              floor: Optional[int] = None) -> Tuple[int, float]:
+    """
+    Pick the highest cost whose hash time stays within target_ms on this machine.
+
+    Args:
+        scheme: BCRYPT or SCRYPT
+        target_ms: Target hash/verify latency in milliseconds
+        samples: Timings at the minimum cost (the fastest is used)
+        floor: Lowest cost to return even if it misses the target
+            (defaults to the scheme's minimum)
+
+    Returns:
+        (cost, estimated milliseconds per hash at that cost)
+    """
+    base = MIN_COST[scheme]
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hash_with("calibration-password", scheme, base)
+        timings.append((time.perf_counter() - start) * 1000)
+    base_ms = min(timings)
+
+    # Each cost step doubles the work
+    steps = math.floor(math.log2(target_ms / base_ms)) if target_ms > base_ms else 0
+    cost = max(floor or base, base, min(MAX_COST[scheme], base + steps))
+    return cost, round(base_ms * 2 ** (cost - base), 1)
+
+
+class PasswordHasher:
+    """
+    Hashes with the configured scheme/cost and verifies any supported hash.
+    """
+
+    def __init__(self, scheme: str = settings.PASSWORD_HASH_SCHEME):
+        """
+        Initialize password hasher.
+
+        Args:
+            scheme: BCRYPT or SCRYPT
+        """
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unsupported password hash scheme: {scheme}")
+        self.scheme = scheme
+        self.configured_cost = settings.BCRYPT_ROUNDS if scheme == BCRYPT else settings.SCRYPT_LOG_N
+        self.cost = self.configured_cost
+        self.estimated_ms: Optional[float] = None
+
+    def calibrate(self, target_ms: float = settings.PASSWORD_HASH_TARGET_MS) -> int:
+        """
+        Raise the configured cost to the highest one within target_ms on this
+        machine. Never goes below the configured cost: a slow or noisy host
+        keeps it (with a warning) instead of silently weakening new hashes.
+        CPU-bound (a few hashes) - run it in a thread.
+
+        Args:
+            target_ms: Target hash/verify latency in milliseconds
+
+        Returns:
+            Selected cost
+        """
+        self.cost, self.estimated_ms = calibrate(self.scheme, target_ms, floor=self.configured_cost)
+        if self.estimated_ms > target_ms:
+            logger.warning(f"⚠️  Password hashing target {target_ms}ms not reachable on this machine - "
+                           f"keeping configured {self.scheme} cost {self.cost} (~{self.estimated_ms}ms)")
+            return self.cost
+        logger.info(f"✅ Password hashing calibrated: {self.scheme} cost {self.cost} "
+                    f"(~{self.estimated_ms}ms, target {target_ms}ms)")
+        return self.cost
+
+    def hash(self, password: str) -> str:
+        """
+        Hash a password with the current scheme and cost.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            Encoded hash
+        """
+        return hash_with(password, self.scheme, self.cost)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """
+        Verify a password against a hash of any supported scheme.
+
+        Args:
+            password: Plain text password
+            hashed: Stored hash
+
+        Returns:
+            True if the password matches
+        """
+        if hashed.startswith("$scrypt$"):
+            log_n, r, p, salt, key = _parse_scrypt(hashed)
+            return hmac.compare_digest(_scrypt(password, salt, log_n, r, p), key)
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """
+        Whether a stored hash should be replaced after a successful login.
+
+        Args:
+            hashed: Stored hash
+
+        Returns:
+            True for another scheme, a weaker cost or other scrypt r/p
+        """
+        identified = identify(hashed)
+        if identified is None:
+            return False
+        scheme, cost = identified
+        if scheme != self.scheme:
+            return True
+        if scheme == SCRYPT:
+            _, r, p, _, _ = _parse_scrypt(hashed)
+            if (r, p) != (settings.SCRYPT_R, settings.SCRYPT_P):
+                return True
+        return cost < self.cost
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher()
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pick a password hashing cost for this machine")
+    parser.add_argument("--scheme", choices=SCHEMES, default=settings.PASSWORD_HASH_SCHEME)
+    parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS)
+    args = parser.parse_args()
+
+    cost, estimated_ms = calibrate(args.scheme, args.target_ms)
+    start = time.perf_counter()
+    hash_with("calibration-password", args.scheme, cost)
+    measured_ms = (time.perf_counter() - start) * 1000
+
+    setting = "BCRYPT_ROUNDS" if args.scheme == BCRYPT else "SCRYPT_LOG_N"
+    print(f"{args.scheme}: cost {cost} - estimated {estimated_ms}ms, measured {measured_ms:.1f}ms "
+          f"(target {args.target_ms}ms)")
+    if args.scheme == SCRYPT:
+        print(f"memory per hash: {128 * settings.SCRYPT_R * (1 << cost) / (1 << 20):.0f} MiB")
+    if estimated_ms > args.target_ms:
+        print(f"warning: even the minimum cost misses the {args.target_ms}ms target on this machine")
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    print(f"{setting}={cost}")
+
+
+if __name__ == "__main__":
+    main()
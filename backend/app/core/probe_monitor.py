@@ -0,0 +1,263 @@
+"""
+Continuous network-policy probe monitor.
+
+Every PROBE_MONITOR_INTERVAL seconds a background task TCP-connects to each
+network demo scenario's target (all at once, with native asyncio sockets)
+and records timestamp, outcome and connect latency in a fixed-size ring
+buffer per scenario. The demo page reads history and aggregates from
+memory instead of waiting on live probes, and an outcome that stops
+matching the scenario's expectation (policy drift) is logged when it flips.
+"""
+
+import asyncio
+import logging
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.connect_latency import percentiles
+from app.core.dns_cache import dns_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProbeTarget:
+    """TCP endpoint probed for a demo scenario."""
+    scenario: str
+    host: str
+    port: int
+    expected: str  # "allowed" | "blocked"
+
+
+OPENBAO_HOST = "openbao.openbao.svc.cluster.local"
+SPIRE_SERVER_HOST = "spire-server.spire-system.svc.cluster.local"
+
+# Scenarios whose result is a TCP probe from this pod. blocked-postgres-wrong-ns
+# is simulated (this pod is allowed), so monitoring it would record nothing useful.
+PROBE_TARGETS: Tuple[ProbeTarget, ...] = (
+    ProbeTarget("backend-to-postgres", settings.DB_HOST, settings.DB_PORT, "allowed"),
+    ProbeTarget("backend-to-openbao", OPENBAO_HOST, 8200, "allowed"),
+    ProbeTarget("blocked-spire-direct", SPIRE_SERVER_HOST, 8081, "blocked"),
+)
+
+
+async def tcp_probe(host: str, port: int, timeout: float = 3.0) -> Tuple[bool, float]:
+    """
+    Open (and immediately close) a TCP connection.
+
+    Args:
+        host: Target host
+        port: Target port
+        timeout: Seconds before the attempt counts as blocked (Cilium drops, so no RST)
+
+    Returns:
+        (connected, elapsed milliseconds)
+    """
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(dns_cache.open_connection(host, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False, (time.perf_counter() - start) * 1000
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True, elapsed_ms
+
+
+class ProbeHistory:
+    """
+    Fixed-size ring buffer of (timestamp, connected, latency_ms) samples.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize history.
+
+        Args:
+            size: Samples kept; the oldest is overwritten when full
+        """
+        self.size = size
+        self._timestamps = array("d", bytes(8 * size))
+        self._connected = array("b", bytes(size))
+        self._latency_ms = array("f", bytes(4 * size))
+        self._next = 0
+        self.count = 0
+
+    def append(self, timestamp: float, connected: bool, latency_ms: float) -> None:
+        i = self._next
+        self._timestamps[i] = timestamp
+        self._connected[i] = connected
+        self._latency_ms[i] = latency_ms
+        self._next = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def _indexes(self, limit: Optional[int] = None) -> List[int]:
+        """Buffer positions, newest first."""
+        n = self.count if limit is None else min(limit, self.count)
+        return [(self._next - 1 - k) % self.size for k in range(n)]
+
+    def samples(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Recorded samples, newest first.
+
+        Args:
+            limit: Maximum samples returned (all if None)
+        """
+        return [
+            {"timestamp": self._timestamps[i], "connected": bool(self._connected[i]),
+             "latency_ms": round(self._latency_ms[i], 2)}
+            for i in self._indexes(limit)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Connect rate and connect-latency percentiles over the buffer."""
+        indexes = self._indexes()
+        connected = [self._latency_ms[i] for i in indexes if self._connected[i]]
+        return {
+            "samples": len(indexes),
+            "connected": len(connected),
+            "connect_rate": round(len(connected) / len(indexes), 4) if indexes else None,
+            **percentiles(connected),
+            "oldest": self._timestamps[indexes[-1]] if indexes else None,
+        }
+
+
+class ProbeMonitor:
+    """
+    Probes PROBE_TARGETS on a schedule and keeps per-scenario history.
+    """
+
+    def __init__(
+        self,
+        targets: Tuple[ProbeTarget, ...] = PROBE_TARGETS,
+        interval: float = settings.PROBE_MONITOR_INTERVAL,
+        timeout: float = settings.PROBE_MONITOR_TIMEOUT,
+        history: int = settings.PROBE_MONITOR_HISTORY,
+    ):
+        """
+        Initialize probe monitor.
+
+        Args:
+            targets: Endpoints to probe
+            interval: Seconds between probe rounds
+            timeout: Connect timeout per probe
+            history: Samples kept per scenario
+        """
+        self.targets = {t.scenario: t for t in targets}
+        self.interval = interval
+        self.timeout = timeout
+        self._history = {t.scenario: ProbeHistory(history) for t in targets}
+        self._state: Dict[str, Dict[str, Any]] = {
+            t.scenario: {"status": None, "transitions": 0, "last_transition": None} for t in targets
+        }
+        self._rounds = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the probe loop."""
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"✅ Probe monitor started - {len(self.targets)} target(s) every {self.interval}s")
+
+    async def stop(self) -> None:
+        """Stop the probe loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("Probe monitor stopped")
+
+    async def _run(self) -> None:
+        """Probe every target once per interval, keeping the cadence fixed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"❌ Probe round failed: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    async def probe_all(self) -> None:
+        """Run one probe round over all targets concurrently."""
+        targets = list(self.targets.values())
+        results = await asyncio.gather(*(tcp_probe(t.host, t.port, self.timeout) for t in targets))
+        now = time.time()
+        for target, (connected, latency_ms) in zip(targets, results):
+            self._record(target, now, connected, latency_ms)
+        self._rounds += 1
+
+    def _record(self, target: ProbeTarget, now: float, connected: bool, latency_ms: float) -> None:
+        self._history[target.scenario].append(now, connected, latency_ms)
+        status = "allowed" if connected else "blocked"
+        state = self._state[target.scenario]
+        if status == state["status"]:
+            return
+        if state["status"] is not None:
+            state["transitions"] += 1
+            state["last_transition"] = now
+            if status != target.expected:
+                logger.warning(f"⚠️  Policy drift: {target.scenario} ({target.host}:{target.port}) now {status}, "
+                               f"expected {target.expected}")
+            else:
+                logger.info(f"✅ {target.scenario} back to expected ({status})")
+        state["status"] = status
+
+    def get_history(self, scenario: str, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Samples and aggregates for one scenario.
+
+        Args:
+            scenario: Scenario ID
+            limit: Maximum samples returned, newest first
+
+        Returns:
+            Dict with the summary plus samples, or None for an unmonitored scenario
+        """
+        if scenario not in self.targets:
+            return None
+        return {**self._summary(scenario), "history": self._history[scenario].samples(limit)}
+
+    def _summary(self, scenario: str) -> Dict[str, Any]:
+        target = self.targets[scenario]
+        history = self._history[scenario]
+        summary = history.summary()
+        connected = summary["connected"]
+        matching = connected if target.expected == "allowed" else summary["samples"] - connected
+        return {
+            "scenario": scenario,
+            "host": target.host,
+            "port": target.port,
+            "expected": target.expected,
+            **self._state[scenario],
+            "as_expected_rate": round(matching / summary["samples"], 4) if summary["samples"] else None,
+            "last": (history.samples(1) or [None])[0],
+            **summary,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get monitor state and per-scenario aggregates.
+
+        Returns:
+            Dict with interval, completed rounds and a summary per scenario
+        """
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "timeout": self.timeout,
+            "rounds": self._rounds,
+            "scenarios": {scenario: self._summary(scenario) for scenario in self.targets},
+        }
+
+
+# Global probe monitor instance
+probe_monitor = ProbeMonitor()
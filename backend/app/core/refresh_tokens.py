@@ -0,0 +1,150 @@
+"""
+Rotating refresh tokens.
+
+A refresh token is 32 random bytes handed to the browser in an httpOnly
+cookie; Postgres only stores its SHA-256 (a fast hash is enough for a
+high-entropy secret, so a refresh costs a row lock instead of a bcrypt
+verify). Each use exchanges the token for a new one in the same family.
+Presenting a token that was already exchanged means it was copied - the
+whole family (every session descended from that login) is revoked.
+"""
+
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from sqlalchemy.engine import Row
+
+from app.config import settings
+from app.core.database import db_manager
+from app.models.queries import (
+    delete_expired_refresh_tokens,
+    get_refresh_token_for_update,
+    insert_refresh_token,
+    mark_refresh_token_rotated,
+    revoke_refresh_token_family,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenError(Exception):
+    """Raised when a refresh token can't be exchanged (unknown, expired, revoked or reused)."""
+    pass
+
+
+def hash_refresh_token(token: str) -> str:
+    """SHA-256 hex digest stored in place of the token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RefreshTokenStore:
+    """
+    Issues, rotates and revokes refresh tokens in the refresh_tokens table.
+    """
+
+    def __init__(self):
+        """Initialize refresh token store."""
+        self._stats = {"issued": 0, "rotated": 0, "rejected": 0, "reuse_detected": 0}
+
+    def _expiry(self, now: datetime) -> datetime:
+        return now + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+
+    async def issue(self, user_id: int) -> str:
+        """
+        Start a new token family (one per login).
+
+        Args:
+            user_id: Authenticated user
+
+        Returns:
+            Opaque refresh token
+        """
+        token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        async with db_manager.get_session() as session:
+            await delete_expired_refresh_tokens(session, user_id, now)
+            await insert_refresh_token(
+                session, user_id, hash_refresh_token(token), uuid.uuid4(), None, now, self._expiry(now)
+            )
+            await session.commit()
+        self._stats["issued"] += 1
+        return token
+
+    async def rotate(self, token: str) -> Tuple[str, Row]:
+        """
+        Exchange a refresh token for its successor.
+
+        Args:
+            token: Refresh token from the cookie
+
+        Returns:
+            (new refresh token, user Row with UserResponse columns)
+
+        Raises:
+            RefreshTokenError: If the token is unknown, expired, revoked or was
+                already exchanged (the family is then revoked)
+        """
+        now = datetime.utcnow()
+        async with db_manager.get_session() as session:
+            row = await get_refresh_token_for_update(session, hash_refresh_token(token))
+            if row is None or row.revoked_at is not None or row.expires_at <= now:
+                self._stats["rejected"] += 1
+                raise RefreshTokenError("Invalid or expired refresh token")
+
+            if row.rotated_at is not None:
+                self._stats["rejected"] += 1
+                # Two tabs refreshing at once - the other one already holds the successor
+                if now - row.rotated_at <= timedelta(seconds=settings.JWT_REFRESH_REUSE_GRACE_SECONDS):
+                    raise RefreshTokenError("Refresh token already used")
+                revoked = await revoke_refresh_token_family(session, row.family_id, now)
+                await session.commit()
+                self._stats["reuse_detected"] += 1
+                logger.warning(f"⚠️  Refresh token reuse for user {row.id} - revoked {revoked} token(s) "
+                               f"in family {row.family_id}")
+                raise RefreshTokenError("Refresh token reuse detected - please log in again")
+
+            new_token = secrets.token_urlsafe(32)
+            await mark_refresh_token_rotated(session, row.token_id, now)
+            await insert_refresh_token(
+                session, row.id, hash_refresh_token(new_token), row.family_id, row.token_id, now, self._expiry(now)
+            )
+            await session.commit()
+
+        self._stats["rotated"] += 1
+        return new_token, row
+
+    async def revoke(self, token: str) -> int:
+        """
+        Revoke the family of a refresh token (logout).
+
+        Args:
+            token: Refresh token from the cookie
+
+        Returns:
+            Number of tokens revoked (0 if the token is unknown)
+        """
+        now = datetime.utcnow()
+        async with db_manager.get_session() as session:
+            row = await get_refresh_token_for_update(session, hash_refresh_token(token))
+            if row is None:
+                return 0
+            revoked = await revoke_refresh_token_family(session, row.family_id, now)
+            await session.commit()
+        return revoked
+
+    def get_stats(self) -> dict:
+        """
+        Get refresh token statistics.
+
+        Returns:
+            Dict with issued/rotated/rejected counts and detected reuses
+        """
+        return dict(self._stats)
+
+
+# Global refresh token store instance
+refresh_token_store = RefreshTokenStore()
@@ -0,0 +1,180 @@
+"""
+In-memory search index over one user's cached repositories.
+
+Built once per fetched repo list (so on the refresher's cycle, not per
+request): the records are pre-sorted by stars, updated_at and name, and
+name/description tokens map to record positions. A query intersects the
+filter sets, orders the matches by their rank in the chosen sort and pages
+through them with a keyset cursor (sort value + repo id), so a page never
+shifts when repos are inserted before it.
+"""
+
+import base64
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import orjson
+
+from app.core.github import RepoRecord
+
+# Sort fields and the record value each one orders by
+SORT_KEYS = {
+    "stars": lambda r: r.stargazers_count,
+    "updated": lambda r: r.updated_at,
+    "name": lambda r: r.name.lower(),
+}
+ORDERS = ("asc", "desc")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens ("spire-vault_99" -> spire, vault, 99)."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def encode_cursor(sort: str, order: str, value: Any, repo_id: int) -> str:
+    """Opaque cursor for the item after (value, repo_id) in this sort."""
+    return base64.urlsafe_b64encode(orjson.dumps([sort, order, value, repo_id])).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor issued for the same sort and order.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort/order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        c_sort, c_order, value, repo_id = orjson.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if (c_sort, c_order) != (sort, order) or not isinstance(repo_id, int):
+        raise ValueError("Cursor does not match sort/order")
+    return (value, repo_id)
+
+
+class RepoIndex:
+    """
+    Immutable index over a list of RepoRecords.
+    """
+
+    def __init__(self, records: List[RepoRecord], stale: bool = False):
+        """
+        Build the sort orders and token/language indexes.
+
+        Args:
+            records: Repositories (from GitHub or the stored snapshot)
+            stale: Built from the stored snapshot because GitHub couldn't be synced
+        """
+        self.records = records
+        self.stale = stale
+        # sort -> (positions in sort order, (value, id) keys in that order, position -> rank)
+        self._orders: Dict[str, Tuple[List[int], List[Tuple[Any, int]], List[int]]] = {}
+        for sort, key in SORT_KEYS.items():
+            positions = sorted(range(len(records)), key=lambda i: (key(records[i]), records[i].id))
+            keys = [(key(records[i]), records[i].id) for i in positions]
+            rank = [0] * len(records)
+            for r, i in enumerate(positions):
+                rank[i] = r
+            self._orders[sort] = (positions, keys, rank)
+
+        self._postings: Dict[str, Set[int]] = {}
+        self._languages: Dict[str, Set[int]] = {}
+        for i, repo in enumerate(records):
+            for token in _tokens(repo.name) + _tokens(repo.description):
+                self._postings.setdefault(token, set()).add(i)
+            if repo.language:
+                self._languages.setdefault(repo.language.lower(), set()).add(i)
+        self._vocabulary = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _match_token(self, prefix: str) -> Set[int]:
+        """Positions whose name/description has a token starting with prefix."""
+        start = bisect_left(self._vocabulary, prefix)
+        matched: Set[int] = set()
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matched |= self._postings[token]
+        return matched
+
+    def _candidates(self, q: Optional[str], language: Optional[str]) -> Optional[Set[int]]:
+        """Positions matching every filter, or None when unfiltered."""
+        candidates: Optional[Set[int]] = None
+        if language:
+            candidates = set(self._languages.get(language.lower(), ()))
+        for prefix in _tokens(q):
+            matched = self._match_token(prefix)
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                break
+        return candidates
+
+    def query(
+        self,
+        q: Optional[str] = None,
+        language: Optional[str] = None,
+        sort: str = "updated",
+        order: str = "desc",
+        limit: int = 30,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Filter, sort and page the repositories.
+
+        Args:
+            q: Search terms; every term must prefix-match a name/description token
+            language: Exact primary language (case-insensitive)
+            sort: One of SORT_KEYS
+            order: "asc" or "desc"
+            limit: Page size
+            cursor: next_cursor from the previous page
+
+        Returns:
+            Dict with items (RepoRecords), next_cursor (None on the last page) and total matches
+
+        Raises:
+            ValueError: If sort/order is unknown or the cursor is invalid
+        """
+        if sort not in SORT_KEYS or order not in ORDERS:
+            raise ValueError(f"Unsupported sort/order: {sort}/{order}")
+        positions, keys, rank = self._orders[sort]
+
+        candidates = self._candidates(q, language)
+        # Ranks (indexes into positions/keys) of the matches, ascending
+        ranks: Sequence[int] = range(len(keys)) if candidates is None else sorted(rank[i] for i in candidates)
+
+        # Index into ranks where this page starts
+        if cursor:
+            after = decode_cursor(cursor, sort, order)
+            try:
+                if order == "asc":
+                    start = bisect_right(ranks, bisect_right(keys, after) - 1)
+                else:
+                    start = len(ranks) - bisect_left(ranks, bisect_left(keys, after))
+            except TypeError:
+                raise ValueError("Invalid cursor")  # Value of the wrong type for this sort
+        else:
+            start = 0
+
+        end = min(start + limit, len(ranks))
+        if order == "asc":
+            page = [ranks[j] for j in range(start, end)]
+        else:
+            page = [ranks[len(ranks) - 1 - j] for j in range(start, end)]
+
+        next_cursor = None
+        if end < len(ranks) and page:
+            value, repo_id = keys[page[-1]]
+            next_cursor = encode_cursor(sort, order, value, repo_id)
+
+        return {
+            "items": [self.records[positions[r]] for r in page],
+            "next_cursor": next_cursor,
+            "total": len(ranks),
+        }
@@ -0,0 +1,255 @@
+"""
+Resilience layer for outbound dependencies (GitHub, OpenBao).
+
+Each dependency gets a DependencyGuard combining:
+- a circuit breaker (closed -> open after consecutive failures -> half-open
+  probe after a cool-down), so a brown-out fails fast instead of every
+  request waiting out the client timeout;
+- bounded retries with jittered exponential backoff, for idempotent calls;
+- optional hedging: if an idempotent call hasn't answered after the
+  dependency's recent p95 latency, a second identical call is started and
+  whichever finishes first wins.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Successful-call latencies kept for the hedge delay, and the minimum before hedging starts
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the dependency's breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit open, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Dependency name (logs, errors, health output)
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_inflight = False
+        self.counters = {"opened": 0, "rejected": 0}
+
+    def before_call(self) -> None:
+        """
+        Admit or reject a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or half-open with a probe in flight)
+        """
+        if self.state == OPEN:
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+            self.state = HALF_OPEN
+            logger.info(f"🔄 [{self.name}] Circuit half-open - probing")
+
+        if self.state == HALF_OPEN:
+            if self._probe_inflight:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.name, 1.0)
+            self._probe_inflight = True
+
+    def on_success(self) -> None:
+        """Record a call the dependency answered."""
+        if self.state != CLOSED:
+            logger.info(f"✅ [{self.name}] Circuit closed")
+        self.state = CLOSED
+        self._failures = 0
+        self._probe_inflight = False
+
+    def on_failure(self) -> None:
+        """Record a dependency failure (timeout, connection error, 5xx)."""
+        self._failures += 1
+        self._probe_inflight = False
+        if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self.counters["opened"] += 1
+            logger.warning(f"⚠️  [{self.name}] Circuit opened after {self._failures} failure(s) "
+                           f"- failing fast for {self.recovery_timeout:.0f}s")
+
+    def on_abandoned(self) -> None:
+        """Record a call cancelled before an outcome (frees the half-open probe)."""
+        self._probe_inflight = False
+
+    def get_state(self) -> str:
+        """Current state, reporting an expired open circuit as half-open."""
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return HALF_OPEN
+        return self.state
+
+
+class DependencyGuard:
+    """
+    Circuit breaker + retries + hedging for one dependency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        is_failure: Callable[[BaseException], bool],
+        failure_threshold: int,
+        recovery_timeout: float,
+        max_retries: int,
+        retry_base: float,
+        hedge: bool = False,
+    ):
+        """
+        Initialize dependency guard.
+
+        Args:
+            name: Dependency name
+            is_failure: Whether an exception means the dependency is unhealthy
+                (timeouts, 5xx) as opposed to a normal error answer (404, 403)
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a probe
+            max_retries: Extra attempts for idempotent calls
+            retry_base: First retry delay in seconds (doubled per attempt, jittered)
+            hedge: Hedge idempotent calls after the recent p95 latency
+        """
+        self.name = name
+        self.breaker = CircuitBreaker(name, failure_threshold, recovery_timeout)
+        self.is_failure = is_failure
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.hedge = hedge
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._hedge_delay: Optional[float] = None
+        self._samples = 0
+        self.counters = {"calls": 0, "failures": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+
+    async def call(self, fn: Callable[[], Awaitable[T]], idempotent: bool = False) -> T:
+        """
+        Run fn() through the breaker, retrying/hedging if idempotent.
+
+        Args:
+            fn: Zero-argument coroutine function performing one attempt
+            idempotent: Safe to send more than once (enables retries and hedging)
+
+        Returns:
+            fn()'s result
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Whatever fn() raises on the last attempt
+        """
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        for attempt in range(attempts):
+            self.breaker.before_call()
+            self.counters["calls"] += 1
+            start = time.monotonic()
+            try:
+                if idempotent and self.hedge:
+                    result = await self._hedged(fn)
+                else:
+                    result = await fn()
+            except asyncio.CancelledError:
+                self.breaker.on_abandoned()
+                raise
+            except Exception as e:
+                if not self.is_failure(e):
+                    self.breaker.on_success()  # The dependency answered
+                    raise
+                self.counters["failures"] += 1
+                self.breaker.on_failure()
+                if attempt == attempts - 1 or self.breaker.state == OPEN:
+                    raise
+                delay = self.retry_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+                self.counters["retries"] += 1
+                logger.warning(f"⚠️  [{self.name}] Call failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.on_success()
+            self._record_latency(time.monotonic() - start)
+            return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Start fn(); if it's slower than p95, start a second and take the first result."""
+        primary = asyncio.ensure_future(fn())
+        delay = self._hedge_delay
+        if delay is None:
+            return await primary
+
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            # Inside the try: a caller cancelled while waiting mustn't orphan the primary
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.counters["hedges"] += 1
+            hedge = asyncio.ensure_future(fn())
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.counters["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record_latency(self, seconds: float) -> None:
+        """Track successful-call latency and refresh the hedge delay every few samples."""
+        self._latencies.append(seconds)
+        self._samples += 1
+        if len(self._latencies) >= MIN_HEDGE_SAMPLES and self._samples % 10 == 0:
+            ordered = sorted(self._latencies)
+            self._hedge_delay = ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker state and call counters.
+
+        Returns:
+            Dict with state, hedge delay and counters
+        """
+        return {
+            "state": self.breaker.get_state(),
+            "hedge_delay_ms": round(self._hedge_delay * 1000, 1) if self.hedge and self._hedge_delay else None,
+            **self.counters,
+            **self.breaker.counters,
+        }
@@ -0,0 +1,132 @@
+"""
+Graceful shutdown coordinator.
+
+The preStop hook calls /health/drain, which flips readiness to not-ready so
+Kubernetes stops routing new requests here while they are still served.
+
+In-flight requests are uvicorn's job: on SIGTERM it stops accepting
+connections and waits for open requests (up to --timeout-graceful-shutdown)
+before it runs the lifespan shutdown - by then none are left to count. What
+the coordinator drains is the work that outlives a request: tracked
+background tasks (e.g. repo syncs re-caching after their request returned)
+get up to SHUTDOWN_DRAIN_TIMEOUT to finish before the lifespan closes the
+database pool, Vault and SPIRE. Whatever is still running at the deadline
+is cancelled and reported.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ShutdownCoordinator:
+    """
+    Tracks background tasks and drains them on shutdown.
+    """
+
+    def __init__(self):
+        """Initialize shutdown coordinator."""
+        self.draining = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._idle: Optional[asyncio.Event] = None
+        self._drain_started: Optional[float] = None
+        self._report: Optional[Dict[str, Any]] = None
+
+    def _idle_event(self) -> asyncio.Event:
+        # Created lazily - the global instance is built before the event loop exists
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if self._is_idle():
+                self._idle.set()
+        return self._idle
+
+    def _is_idle(self) -> bool:
+        return not self._tasks
+
+    def _update_idle(self) -> None:
+        if self._idle is not None:
+            if self._is_idle():
+                self._idle.set()
+            else:
+                self._idle.clear()
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """
+        Have shutdown wait for a background task before closing resources.
+
+        Args:
+            task: Task doing work the process owes someone (writes, re-caching)
+
+        Returns:
+            The same task
+        """
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        self._update_idle()
+        return task
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._update_idle()
+
+    def begin_drain(self) -> None:
+        """Flip readiness to not-ready. Requests are still served."""
+        if not self.draining:
+            self.draining = True
+            self._drain_started = time.monotonic()
+            logger.info(f"🔄 Draining - readiness now not-ready ({len(self._tasks)} background task(s))")
+
+    async def drain(self, timeout: float = settings.SHUTDOWN_DRAIN_TIMEOUT) -> Dict[str, Any]:
+        """
+        Wait for tracked tasks, cancelling what's left at the deadline.
+        Runs after uvicorn has finished the in-flight requests.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Dict with drain_seconds (since draining began) and tasks_cancelled
+        """
+        self.begin_drain()
+        try:
+            await asyncio.wait_for(self._idle_event().wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        leftover = list(self._tasks)
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            await asyncio.gather(*leftover, return_exceptions=True)
+
+        self._report = {
+            "drain_seconds": round(time.monotonic() - self._drain_started, 3),
+            "tasks_cancelled": len(leftover),
+        }
+        if leftover:
+            logger.warning(f"⚠️  Drain deadline ({timeout}s) reached - {len(leftover)} background task(s) cancelled")
+        logger.info(f"✅ Drained in {self._report['drain_seconds']}s")
+        return self._report
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get shutdown state.
+
+        Returns:
+            Dict with draining flag, tracked tasks and the last drain report
+            (None until drain() has run)
+        """
+        return {
+            "draining": self.draining,
+            "background_tasks": len(self._tasks),
+            "last_drain": self._report,
+        }
+
+
+# Global shutdown coordinator instance
+shutdown_coordinator = ShutdownCoordinator()
@@ -0,0 +1,81 @@
+"""
+Single-flight request coalescing.
+Concurrent calls with the same key share one in-flight execution.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical async calls.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight await the same task. The key is released when the
+    task finishes, so later calls execute fresh - nothing is cached.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize single-flight group.
+
+        Args:
+            name: Label used in logs and stats
+        """
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._executed: Dict[str, int] = {}
+        self._coalesced: Dict[str, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Tuple whose first element is the operation name (used for stats)
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            fn()'s result (shared by all coalesced callers)
+
+        Raises:
+            Whatever fn() raises, to every coalesced caller
+        """
+        op = key[0] if isinstance(key, tuple) else str(key)
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced[op] = self._coalesced.get(op, 0) + 1
+            logger.debug(f"[{self.name}] Coalesced {key}")
+        else:
+            self._executed[op] = self._executed.get(op, 0) + 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+
+        # Shield: one caller being cancelled must not cancel the shared work
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        """Free the key and mark the exception retrieved (all waiters may be gone)."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-operation execution and coalescing counters.
+
+        Returns:
+            Dict with 'executed', 'coalesced' (per operation) and 'inflight'
+        """
+        return {
+            "executed": dict(self._executed),
+            "coalesced": dict(self._coalesced),
+            "inflight": len(self._inflight),
+        }
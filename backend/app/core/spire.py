@@ -1,17 +1,100 @@
 """
 SPIRE client for workload identity.
 Fetches X.509-SVID from SPIRE agent via Workload API.
+
+Every fetch builds an immutable SVIDSnapshot - SPIFFE ID, validity, PEM
+chain, key PEM/DER and trust bundle fingerprint, parsed and serialized
+once. Consumers read spire_client.snapshot (a single attribute load, no
+lock); a rotation swaps in a new snapshot instead of mutating the old one.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Optional
-from spiffe import WorkloadApiClient, X509Svid, SpiffeId
-from cryptography.hazmat.primitives import serialization
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, TYPE_CHECKING
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    # spiffe pulls in gRPC, protobuf and cryptography - imported on connect() instead
+    from spiffe import WorkloadApiClient, X509Svid, SpiffeId
+
 logger = logging.getLogger(__name__)
 
+# Re-fetch once this share of the SVID's lifetime has passed (SPIRE agents rotate at 1/2)
+ROTATION_FRACTION = 0.5
+
+# Retry delay after a failed background re-fetch
+ROTATION_RETRY_SECONDS = 30.0
+
+
+@dataclass(slots=True, frozen=True)
+class SVIDSnapshot:
+    """
+    Parsed, pre-serialized view of one X.509-SVID and its trust bundle.
+    """
+    spiffe_id: str
+    trust_domain: str
+    not_before: datetime
+    not_after: datetime
+    expires_at: float  # not_after as Unix time
+    cert_chain_pem: bytes  # Leaf + intermediates - Vault needs the full chain
+    private_key_pem: bytes
+    private_key_der: bytes
+    bundle_fingerprint: Optional[str]  # SHA-256 over the trust domain's sorted CA certificates (DER)
+    fetched_at: datetime
+
+    def seconds_to_expiry(self) -> float:
+        """Seconds until not_after (negative once expired)."""
+        return self.expires_at - time.time()
+
+
+def _build_snapshot(svid: "X509Svid", bundle_set) -> SVIDSnapshot:
+    """Parse and serialize an SVID once (cryptography is loaded with spiffe on connect)."""
+    from cryptography.hazmat.primitives import serialization
+
+    leaf = svid.leaf
+    # cryptography >= 42 has the *_utc accessors; older versions return naive UTC datetimes
+    if hasattr(leaf, "not_valid_after_utc"):
+        not_before, not_after = leaf.not_valid_before_utc, leaf.not_valid_after_utc
+    else:
+        not_before = leaf.not_valid_before.replace(tzinfo=timezone.utc)
+        not_after = leaf.not_valid_after.replace(tzinfo=timezone.utc)
+
+    trust_domain = svid.spiffe_id.trust_domain
+    bundle = bundle_set.get_bundle_for_trust_domain(trust_domain) if bundle_set is not None else None
+    fingerprint = None
+    if bundle is not None:
+        digest = hashlib.sha256()
+        for der in sorted(ca.public_bytes(serialization.Encoding.DER) for ca in bundle.x509_authorities):
+            digest.update(der)
+        fingerprint = digest.hexdigest()
+
+    key = svid.private_key
+    return SVIDSnapshot(
+        spiffe_id=str(svid.spiffe_id),
+        trust_domain=str(trust_domain),
+        not_before=not_before,
+        not_after=not_after,
+        expires_at=not_after.timestamp(),
+        cert_chain_pem=b"".join(cert.public_bytes(serialization.Encoding.PEM) for cert in svid.cert_chain),
+        private_key_pem=key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption(),
+        ),
+        private_key_der=key.private_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ),
+        bundle_fingerprint=fingerprint,
+        fetched_at=datetime.now(timezone.utc),
+    )
+
 
 class SPIREClient:
     """
@@ -27,9 +110,11 @@ class SPIREClient:
             socket_path: Path to SPIRE agent socket
         """
         self.socket_path = socket_path
-        self._client: Optional[WorkloadApiClient] = None
-        self._svid: Optional[X509Svid] = None
-        self._spiffe_id: Optional[SpiffeId] = None
+        self._client: Optional["WorkloadApiClient"] = None
+        self._svid: Optional["X509Svid"] = None
+        self._spiffe_id: Optional["SpiffeId"] = None
+        self.snapshot: Optional[SVIDSnapshot] = None
+        self._rotation_task: Optional[asyncio.Task] = None
         logger.info(f"SPIRE client initialized with socket: {socket_path}")
 
     async def connect(self) -> None:
@@ -38,29 +123,62 @@ class SPIREClient:
         """
         try:
             logger.info("Connecting to SPIRE agent...")
+            from spiffe import WorkloadApiClient
 
             # Create Workload API client
             # SPIFFE library requires unix:// scheme
             socket_url = f"unix://{self.socket_path}"
             self._client = WorkloadApiClient(socket_url)
 
-            # Fetch X.509-SVID
-            self._svid = self._client.fetch_x509_svid()
-            self._spiffe_id = self._svid.spiffe_id
+            # Fetch X.509-SVID (with its trust bundle)
+            self._fetch()
+            self._rotation_task = asyncio.create_task(self._follow_rotation())
 
-            logger.info(f"✅ SPIRE connected - SPIFFE ID: {self._spiffe_id}")
+            logger.info(f"✅ SPIRE connected - SPIFFE ID: {self._spiffe_id}, "
+                        f"SVID expires in {self.snapshot.seconds_to_expiry():.0f}s")
 
         except Exception as e:
             logger.error(f"❌ Failed to connect to SPIRE: {e}")
             raise
 
+    def _fetch(self) -> SVIDSnapshot:
+        """Fetch the X.509 context and swap in a new snapshot."""
+        context = self._client.fetch_x509_context()
+        svid = context.default_svid
+        snapshot = _build_snapshot(svid, context.x509_bundle_set)
+        self._svid = svid
+        self._spiffe_id = svid.spiffe_id
+        self.snapshot = snapshot
+        return snapshot
+
+    async def _follow_rotation(self) -> None:
+        """Re-fetch when the agent will have rotated, so the snapshot never goes stale."""
+        while True:
+            snapshot = self.snapshot
+            lifetime = (snapshot.not_after - snapshot.not_before).total_seconds()
+            refresh_at = snapshot.not_before.timestamp() + lifetime * ROTATION_FRACTION
+            await asyncio.sleep(max(ROTATION_RETRY_SECONDS, refresh_at - time.time()))
+            if self.snapshot is not snapshot:
+                continue  # Refreshed meanwhile (Vault re-auth)
+            try:
+                await asyncio.to_thread(self.refresh_svid)
+            except Exception as e:
+                logger.error(f"❌ SVID re-fetch failed: {e}")
+
     async def close(self) -> None:
         """Close SPIRE client connection."""
+        if self._rotation_task:
+            self._rotation_task.cancel()
+            try:
+                await self._rotation_task
+            except asyncio.CancelledError:
+                pass
+            self._rotation_task = None
         if self._client:
             self._client.close()
             logger.info("SPIRE client closed")
 
-    def refresh_svid(self) -> X509Svid:
+    def refresh_svid(self) -> "X509Svid":
         """
         Fetch a fresh X.509-SVID from the SPIRE agent.
         Call before mTLS re-authentication - SVIDs have a 1-hour TTL and the
@@ -72,12 +190,12 @@ class SPIREClient:
         if not self._client:
             raise RuntimeError("SPIRE client not connected - call connect() first")
 
-        self._svid = self._client.fetch_x509_svid()
-        self._spiffe_id = self._svid.spiffe_id
-        logger.info(f"🔄 X.509-SVID refreshed - SPIFFE ID: {self._spiffe_id}")
+        snapshot = self._fetch()
+        logger.info(f"🔄 X.509-SVID refreshed - SPIFFE ID: {snapshot.spiffe_id}, "
+                    f"expires in {snapshot.seconds_to_expiry():.0f}s")
         return self._svid
 
-    def get_svid(self) -> X509Svid:
+    def get_svid(self) -> "X509Svid":
         """
         Get current X.509-SVID.
 
@@ -91,6 +209,21 @@ class SPIREClient:
             raise RuntimeError("SVID not available - call connect() first")
         return self._svid
 
+    def get_snapshot(self) -> SVIDSnapshot:
+        """
+        Get the current SVID snapshot.
+
+        Returns:
+            Snapshot of the most recently fetched SVID
+
+        Raises:
+            RuntimeError: If SVID not available
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            raise RuntimeError("SVID not available - call connect() first")
+        return snapshot
+
     def get_spiffe_id(self) -> str:
         """
         Get SPIFFE ID as string.
@@ -98,9 +231,9 @@ class SPIREClient:
         Returns:
             SPIFFE ID (e.g., spiffe://demo.local/ns/99-apps/sa/backend)
         """
-        if not self._spiffe_id:
+        if self.snapshot is None:
             raise RuntimeError("SPIFFE ID not available - call connect() first")
-        return str(self._spiffe_id)
+        return self.snapshot.spiffe_id
 
     def get_certificate_pem(self) -> bytes:
         """
@@ -110,13 +243,7 @@ class SPIREClient:
         Returns:
             Full certificate chain in PEM format (concatenated)
         """
-        svid = self.get_svid()
-        # The spiffe library uses cert_chain (list of cryptography Certificate objects)
-        # Convert FULL chain to PEM bytes - Vault needs the complete chain for validation
-        cert_chain_pem = b''
-        for cert in svid.cert_chain:
-            cert_chain_pem += cert.public_bytes(encoding=serialization.Encoding.PEM)
-        return cert_chain_pem
+        return self.get_snapshot().cert_chain_pem
 
     def get_private_key_pem(self) -> bytes:
         """
@@ -125,18 +252,11 @@ class SPIREClient:
         Returns:
             Private key in PEM format
         """
-        svid = self.get_svid()
-        # The spiffe library uses private_key (cryptography PrivateKey object)
-        # Convert to PEM bytes using cryptography API
-        return svid.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.TraditionalOpenSSL,
-            encryption_algorithm=serialization.NoEncryption()
-        )
+        return self.get_snapshot().private_key_pem
 
     def is_connected(self) -> bool:
         """Check if connected to SPIRE and SVID is available."""
-        return self._svid is not None
+        return self.snapshot is not None
 
     def fetch_jwt_svid(self, audiences: list[str]) -> str:
         """
@@ -0,0 +1,361 @@
+"""
+Bulk user provisioning from CSV or NDJSON.
+
+Hashes passwords across every core with a process pool - with the same
+scheme and cost as hash_password, so provisioned accounts are identical to
+registered ones (with PASSWORD_HASH_CALIBRATE the cost is calibrated here
+first, like at API startup, on the machine running the CLI) - and streams each batch into Postgres with COPY into a
+temporary table, then INSERT ... ON CONFLICT DO NOTHING into users.
+Hashing of the next batch overlaps the COPY of the current one.
+
+Progress is checkpointed after every committed batch; a re-run with the same
+input resumes after the last one. Usernames already in the table are skipped
+before hashing, so re-running over imported rows is cheap as well.
+
+Input rows need username, email and password (CSV header or NDJSON keys) and
+are validated like /auth/register. Credentials come from Vault (the backend's
+database role, via SPIRE) unless --dsn is given:
+
+    python -m app.core.user_provisioning users.csv [--dsn postgresql://...]
+        [--batch-size 5000] [--workers N] [--restart] [--report report.json]
+"""
+
+import asyncio
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+
+from app.config import settings
+from app.core.password_hashing import hash_with, password_hasher
+from app.models.schemas import UserCreate
+
+logger = logging.getLogger(__name__)
+
+# Invalid rows logged individually before only being counted
+MAX_LOGGED_REJECTS = 20
+
+_CREATE_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS users_provision (
+    username VARCHAR(50) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL
+) ON COMMIT DELETE ROWS
+"""
+
+_INSERT_FROM_STAGING = """
+INSERT INTO users (username, email, password_hash)
+SELECT username, email, password_hash FROM users_provision
+ON CONFLICT DO NOTHING
+"""
+
+_EXISTING_USERNAMES = "SELECT username FROM users WHERE username = ANY($1::varchar[])"
+
+
+def read_records(path: str) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Stream input rows; .csv is read with its header, anything else as NDJSON.
+
+    Yields:
+        One dict per row (None for an NDJSON line that does not parse)
+    """
+    with open(path, newline="" if path.endswith(".csv") else None) as f:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                yield None
+
+
+def _hash_chunk(passwords: List[str], scheme: str, cost: int) -> List[str]:
+    """Process pool task: hash a chunk of passwords."""
+    return [hash_with(password, scheme, cost) for password in passwords]
+
+
+class Checkpoint:
+    """
+    Number of input rows committed so far, kept in a small JSON file.
+    """
+
+    def __init__(self, path: str, input_path: str):
+        """
+        Initialize checkpoint.
+
+        Args:
+            path: Checkpoint file
+            input_path: Input it belongs to (a checkpoint for another file is ignored)
+        """
+        self.path = path
+        self.input_path = os.path.abspath(input_path)
+
+    def load(self) -> int:
+        """Rows already committed (0 without a checkpoint for this input)."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        return int(data.get("rows", 0)) if data.get("input") == self.input_path else 0
+
+    def save(self, rows: int) -> None:
+        """Record rows committed, atomically."""
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"input": self.input_path, "rows": rows, "updated_at": time.time()}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the whole input is in."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class UserProvisioner:
+    """
+    Validates, hashes (process pool) and COPYs batches of users.
+    """
+
+    def __init__(self, conn: Any, pool: ProcessPoolExecutor, workers: int, batch_size: int):
+        """
+        Initialize provisioner.
+
+        Args:
+            conn: asyncpg connection
+            pool: Process pool for hashing
+            workers: Processes in the pool (sets the chunking of each batch)
+            batch_size: Input rows per COPY/transaction
+        """
+        self.conn = conn
+        self.pool = pool
+        self.batch_size = batch_size
+        self.chunk_size = max(1, batch_size // (workers * 4))
+        self.scheme = password_hasher.scheme
+        self.cost = password_hasher.cost
+        self.stats = {"rows": 0, "inserted": 0, "existing": 0, "conflicts": 0, "invalid": 0, "hashed": 0}
+
+    def _validate(self, row_number: int, record: Optional[Dict[str, Any]]) -> Optional[UserCreate]:
+        """UserCreate for a valid row; invalid rows are counted (and the first few logged)."""
+        try:
+            if not isinstance(record, dict):
+                raise ValueError("not an object")
+            return UserCreate(username=record.get("username"), email=record.get("email"),
+                              password=record.get("password"))
+        except (ValidationError, ValueError) as e:
+            self.stats["invalid"] += 1
+            if self.stats["invalid"] <= MAX_LOGGED_REJECTS:
+                reason = "; ".join(f"{err['loc'][0]}: {err['msg']}" for err in e.errors()) \
+                    if isinstance(e, ValidationError) else str(e)
+                logger.warning(f"⚠️  Row {row_number} rejected - {reason}")
+            return None
+
+    async def _prepare(self, first_row: int, records: List[Any]) -> asyncio.Future:
+        """
+        Validate a batch, drop usernames already provisioned and start hashing the rest.
+
+        Returns:
+            Future resolving to the (username, email, password_hash) rows
+        """
+        users = [u for u in (self._validate(first_row + i, r) for i, r in enumerate(records)) if u is not None]
+        if users:
+            existing = {r["username"] for r in await self.conn.fetch(_EXISTING_USERNAMES, [u.username for u in users])}
+            self.stats["existing"] += len(existing)
+            users = [u for u in users if u.username not in existing]
+
+        loop = asyncio.get_running_loop()
+        chunks = [users[i:i + self.chunk_size] for i in range(0, len(users), self.chunk_size)]
+        hashing = asyncio.gather(*(
+            loop.run_in_executor(self.pool, _hash_chunk, [u.password for u in chunk], self.scheme, self.cost)
+            for chunk in chunks
+        ))
+
+        async def rows() -> List[Tuple[str, str, str]]:
+            hashes = [h for chunk in await hashing for h in chunk]
+            self.stats["hashed"] += len(hashes)
+            return [(u.username, u.email, h) for u, h in zip(users, hashes)]
+
+        return asyncio.ensure_future(rows())
+
+    async def _copy(self, rows: List[Tuple[str, str, str]]) -> None:
+        """COPY one batch into the staging table and merge it into users, in one transaction."""
+        if not rows:
+            return
+        async with self.conn.transaction():
+            await self.conn.copy_records_to_table(
+                "users_provision", records=rows, columns=("username", "email", "password_hash")
+            )
+            status = await self.conn.execute(_INSERT_FROM_STAGING)
+        inserted = int(status.split()[-1])
+        self.stats["inserted"] += inserted
+        self.stats["conflicts"] += len(rows) - inserted  # Taken email, or a username added meanwhile
+
+    async def run(self, records: Iterator[Any], start: int, checkpoint: Checkpoint) -> Dict[str, Any]:
+        """
+        Provision every record after the first `start` rows.
+
+        Args:
+            records: Input rows (from read_records)
+            start: Rows to skip (already committed by an earlier run)
+            checkpoint: Updated after every committed batch
+
+        Returns:
+            Stats with row counts, elapsed seconds and users/s
+        """
+        await self.conn.execute(_CREATE_STAGING)
+        rows_iter = itertools.islice(records, start, None)
+        self.stats["rows"] = start
+        started = time.perf_counter()
+
+        batch = list(itertools.islice(rows_iter, self.batch_size))
+        pending = await self._prepare(start + 1, batch) if batch else None
+        pending_size = len(batch)
+        while pending is not None:
+            rows = await pending
+            # Start hashing the next batch before this one is copied
+            batch = list(itertools.islice(rows_iter, self.batch_size))
+            pending = await self._prepare(self.stats["rows"] + pending_size + 1, batch) if batch else None
+
+            await self._copy(rows)
+            self.stats["rows"] += pending_size
+            pending_size = len(batch)
+            checkpoint.save(self.stats["rows"])
+
+            elapsed = time.perf_counter() - started
+            logger.info(f"🔄 {self.stats['rows']} rows - {self.stats['inserted']} inserted, "
+                        f"{self.stats['existing']} existing, {self.stats['invalid']} invalid "
+                        f"({self.stats['hashed'] / elapsed:.0f} hashes/s)")
+
+        elapsed = time.perf_counter() - started
+        return {
+            **self.stats,
+            "resumed_from": start,
+            "scheme": self.scheme,
+            "cost": self.cost,
+            "elapsed_s": round(elapsed, 2),
+            "users_per_s": round(self.stats["inserted"] / elapsed, 1) if elapsed else None,
+        }
+
+
+async def _connect(dsn: Optional[str]) -> Tuple[Any, Optional[str]]:
+    """
+    Open an asyncpg connection.
+
+    Returns:
+        (connection, Vault lease ID to revoke afterwards - None with --dsn)
+    """
+    # Only the CLI needs a raw asyncpg connection (COPY); the app goes through SQLAlchemy
+    import asyncpg
+
+    if dsn:
+        return await asyncpg.connect(dsn), None
+
+    from app.core.spire import spire_client
+    from app.core.vault import vault_client
+
+    await spire_client.connect()
+    await vault_client.connect()
+    creds = await vault_client.get_database_credentials()
+    conn = await asyncpg.connect(
+        host=settings.DB_HOST, port=settings.DB_PORT, database=settings.DB_NAME,
+        user=creds["username"], password=creds["password"],
+    )
+    return conn, creds["lease_id"]
+
+
+async def _release(lease_id: Optional[str]) -> None:
+    """Revoke the Vault lease (if any) and close the Vault/SPIRE clients."""
+    if lease_id is None:
+        return
+    from app.core.spire import spire_client
+    from app.core.vault import vault_client
+
+    try:
+        await vault_client.revoke_lease(lease_id)
+    except Exception as e:
+        logger.warning(f"⚠️  Could not revoke lease {lease_id} (expires with its TTL): {e}")
+    await vault_client.close()
+    await spire_client.close()
+
+
+async def provision(input_path: str, dsn: Optional[str], workers: int, batch_size: int,
+                    checkpoint: Checkpoint, restart: bool) -> Dict[str, Any]:
+    """
+    Provision every user in an input file.
+
+    Args:
+        input_path: CSV or NDJSON file
+        dsn: PostgreSQL DSN (None = Vault dynamic credentials)
+        workers: Hashing processes
+        batch_size: Rows per COPY/transaction
+        checkpoint: Progress file
+        restart: Ignore an existing checkpoint
+
+    Returns:
+        Stats from UserProvisioner.run
+    """
+    if settings.PASSWORD_HASH_CALIBRATE:
+        # Same cost selection as the API lifespan - never below the configured cost
+        await asyncio.to_thread(password_hasher.calibrate, settings.PASSWORD_HASH_TARGET_MS)
+
+    start = 0 if restart else checkpoint.load()
+    if start:
+        logger.info(f"🔄 Resuming after row {start} (checkpoint {checkpoint.path})")
+
+    # spawn: workers must not inherit the event loop or the Vault client threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        conn, lease_id = await _connect(dsn)
+        try:
+            provisioner = UserProvisioner(conn, pool, workers, batch_size)
+            logger.info(f"Provisioning from {input_path} - {password_hasher.scheme} cost {password_hasher.cost}, "
+                        f"{workers} worker(s), {batch_size} rows per batch")
+            stats = await provisioner.run(read_records(input_path), start, checkpoint)
+        finally:
+            await conn.close()
+            await _release(lease_id)
+
+    checkpoint.clear()
+    return stats
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk-create users from CSV or NDJSON (username, email, password)")
+    parser.add_argument("input", help="users.csv (with header) or users.ndjson")
+    parser.add_argument("--dsn", help="PostgreSQL DSN (default: Vault dynamic credentials for VAULT_DB_ROLE)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing processes")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per COPY/transaction")
+    parser.add_argument("--checkpoint", help="Progress file (default: <input>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the first row")
+    parser.add_argument("--report", help="Write JSON stats to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL), format="%(asctime)s - %(levelname)s - %(message)s")
+    checkpoint = Checkpoint(args.checkpoint or f"{args.input}.checkpoint", args.input)
+    stats = asyncio.run(provision(args.input, args.dsn, args.workers, args.batch_size, checkpoint, args.restart))
+
+    print(f"{stats['rows']} rows: {stats['inserted']} inserted, {stats['existing']} existing, "
+          f"{stats['conflicts']} conflicts, {stats['invalid']} invalid "
+          f"in {stats['elapsed_s']}s ({stats['users_per_s']} users/s, {stats['scheme']} cost {stats['cost']})")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(stats, f, indent=2)
+        print(f"Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,13 +10,27 @@ import os
 import tempfile
 from typing import Dict, Any, Optional
 import hvac
+import requests
 
 from app.config import settings
 from app.core.spire import spire_client
+from app.core.singleflight import SingleFlight
+from app.core.resilience import DependencyGuard
 
 logger = logging.getLogger(__name__)
 
 
+def _is_vault_failure(error: BaseException) -> bool:
+    """Errors that mean OpenBao is unreachable or unhealthy (vs. a normal 4xx answer)."""
+    return isinstance(error, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        hvac.exceptions.InternalServerError,
+        hvac.exceptions.BadGateway,
+        hvac.exceptions.VaultDown,
+    ))
+
+
 class VaultClient:
     """
     OpenBao client with JWT authentication using SPIRE JWT-SVID.
@@ -37,6 +51,19 @@ class VaultClient:
         self._verify_param = None
         self._cert_dir: Optional[str] = None  # tmpfs dir holding SVID cert/key for mTLS
         self._refresh_task: Optional[asyncio.Task] = None
+        # Coalesces concurrent identical reads and re-auth; hvac calls run in
+        # worker threads so concurrent requests actually overlap
+        self._flight = SingleFlight("vault")
+        # Circuit breaker + retries/hedging around OpenBao calls (not logins)
+        self.guard = DependencyGuard(
+            "vault",
+            is_failure=_is_vault_failure,
+            failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.BREAKER_RECOVERY_TIMEOUT,
+            max_retries=settings.RETRY_MAX_ATTEMPTS,
+            retry_base=settings.RETRY_BASE_DELAY,
+            hedge=settings.VAULT_HEDGE_ENABLED,
+        )
         logger.info(f"Vault client initialized - Address: {self.vault_addr}")
 
     async def connect(self) -> None:
@@ -50,7 +77,6 @@ class VaultClient:
             if is_https:
                 # Production mode: SPIRE-issued identity over TLS
                 # Store JWT audiences in case JWT auth is selected or used as fallback
-                from app.config import settings
                 self._jwt_audiences = settings.JWT_SVID_AUDIENCE
 
                 # Resolve CA certificate for server TLS verification
@@ -81,7 +107,8 @@ class VaultClient:
                     logger.info("Connecting to Vault with SPIRE JWT-SVID (JWT auth)...")
                     self._client = hvac.Client(
                         url=self.vault_addr,
-                        verify=self._verify_param
+                        verify=self._verify_param,
+                        timeout=settings.VAULT_TIMEOUT
                     )
                     await self._authenticate_with_jwt()
 
@@ -96,7 +123,8 @@ class VaultClient:
                 # Use root token for dev mode
                 self._client = hvac.Client(
                     url=self.vault_addr,
-                    token='root'  # Dev mode only - never use root token in production
+                    token='root',  # Dev mode only - never use root token in production
+                    timeout=settings.VAULT_TIMEOUT
                 )
 
                 # Verify authentication
@@ -146,17 +174,20 @@ class VaultClient:
         Recreates the hvac client so the TLS session presents the fresh
         client certificate. Can be called for initial auth or re-authentication.
         """
-        cert_path, key_path = self._write_svid_material()
+        cert_path, key_path = await asyncio.to_thread(self._write_svid_material)
 
         # New client per login - requests pins the client cert at session
-        # level, so a rotated SVID requires a fresh session
-        self._client = hvac.Client(
+        # level, so a rotated SVID requires a fresh session. Swapped in only
+        # after login so in-flight calls keep using the old, valid session.
+        client = hvac.Client(
             url=self.vault_addr,
             cert=(cert_path, key_path),
-            verify=self._verify_param
+            verify=self._verify_param,
+            timeout=settings.VAULT_TIMEOUT
         )
 
-        auth_response = self._client.auth.cert.login(name='backend-role')
+        auth_response = await asyncio.to_thread(client.auth.cert.login, name='backend-role')
+        self._client = client
 
         self._authenticated = True
         ttl = auth_response['auth']['lease_duration']
@@ -164,7 +195,7 @@ class VaultClient:
         logger.info(f"   Vault policies: {auth_response['auth']['policies']}")
         logger.info(f"   SPIFFE ID: {spire_client.get_spiffe_id()}")
 
-        if not self._client.is_authenticated():
+        if not await asyncio.to_thread(self._client.is_authenticated):
             raise RuntimeError("Cert authentication succeeded but Vault client is not authenticated")
 
     async def _authenticate_with_jwt(self) -> None:
@@ -173,10 +204,11 @@ class VaultClient:
         Can be called for initial auth or re-authentication.
         """
         # Fetch fresh JWT-SVID from SPIRE
-        jwt_token = spire_client.fetch_jwt_svid(audiences=self._jwt_audiences)
+        jwt_token = await asyncio.to_thread(spire_client.fetch_jwt_svid, audiences=self._jwt_audiences)
 
         # Authenticate using JWT auth
-        auth_response = self._client.auth.jwt.jwt_login(
+        auth_response = await asyncio.to_thread(
+            self._client.auth.jwt.jwt_login,
             role='backend-role',
             jwt=jwt_token
         )
@@ -188,7 +220,7 @@ class VaultClient:
         logger.info(f"   Entity ID: {auth_response['auth'].get('entity_id', 'N/A')}")
 
         # Verify authentication was successful
-        if not self._client.is_authenticated():
+        if not await asyncio.to_thread(self._client.is_authenticated):
             raise RuntimeError("JWT authentication succeeded but Vault client is not authenticated")
 
     async def _auth_refresh_loop(self) -> None:
@@ -205,10 +237,7 @@ class VaultClient:
 
                 logger.info(f"⏰ Starting SVID refresh and Vault re-authentication ({self.auth_method})...")
 
-                if self.auth_method == 'cert':
-                    await self._authenticate_with_cert()
-                else:
-                    await self._authenticate_with_jwt()
+                await self._flight.do(("login",), self._login)
 
                 logger.info("✅ SVID refresh completed successfully")
 
@@ -269,7 +298,8 @@ class VaultClient:
         full_path = f"{self.kv_path}/data/{path}"
 
         try:
-            self._client.secrets.kv.v2.create_or_update_secret(
+            await self._call(
+                self._client.secrets.kv.v2.create_or_update_secret,
                 path=path,
                 secret=data,
                 mount_point=self.kv_path
@@ -288,16 +318,27 @@ class VaultClient:
 
         Returns:
             Secret data (dict)
+
+        Note:
+            Concurrent reads of the same path share one round trip; each
+            caller gets its own copy of the data.
         """
+        data = await self._flight.do(("kv_read", path), lambda: self._read_secret(path))
+        return dict(data)
+
+    async def _read_secret(self, path: str) -> Dict[str, Any]:
+        """Uncoalesced KV v2 read (see read_secret)."""
         # Ensure authenticated before operation
         await self._ensure_authenticated()
 
         full_path = f"{self.kv_path}/data/{path}"
 
         try:
-            response = self._client.secrets.kv.v2.read_secret_version(
+            response = await self._call(
+                self._client.secrets.kv.v2.read_secret_version,
                 path=path,
-                mount_point=self.kv_path
+                mount_point=self.kv_path,
+                idempotent=True
             )
             logger.debug(f"✅ Secret read from Vault: {full_path}")
             return response['data']['data']
@@ -305,23 +346,31 @@ class VaultClient:
             logger.error(f"❌ Failed to read secret from {full_path}: {e}")
             raise
 
-    async def get_database_credentials(self) -> Dict[str, str]:
+    async def get_database_credentials(self, role: Optional[str] = None) -> Dict[str, Any]:
         """
         Get dynamic database credentials from Vault.
 
+        Args:
+            role: Database role name (defaults to VAULT_DB_ROLE)
+
         Returns:
-            Dict with 'username', 'password', and 'lease_id'
+            Dict with 'username', 'password', 'lease_id', 'lease_duration' and 'renewable'
+
+        Note:
+            Not coalesced - each caller owns (and later revokes) its lease.
         """
         # Ensure authenticated before operation
         await self._ensure_authenticated()
 
         try:
-            response = self._client.read(f"{self.db_path}/creds/{self.db_role}")
+            # Not idempotent - every call issues a new lease, so no retries/hedging
+            response = await self._call(self._client.read, f"{self.db_path}/creds/{role or self.db_role}")
 
             username = response['data']['username']
             password = response['data']['password']
             lease_id = response['lease_id']
             lease_duration = response['lease_duration']
+            renewable = response.get('renewable', False)
 
             logger.info(f"✅ Database credentials obtained - User: {username}, TTL: {lease_duration}s")
 
@@ -329,38 +378,99 @@ class VaultClient:
                 'username': username,
                 'password': password,
                 'lease_id': lease_id,
-                'lease_duration': lease_duration
+                'lease_duration': lease_duration,
+                'renewable': renewable
             }
         except Exception as e:
             logger.error(f"❌ Failed to get database credentials: {e}")
             raise
 
+    async def renew_lease(self, lease_id: str, increment: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Renew a Vault lease (e.g., database credentials).
+        Vault clips the granted TTL at the lease's max_ttl, so a granted
+        duration shorter than the requested increment means the lease is
+        close to the end of its life and must be replaced.
+
+        Args:
+            lease_id: Lease ID to renew
+            increment: Requested TTL in seconds (None keeps the role default)
+
+        Returns:
+            Dict with 'lease_id', 'lease_duration' and 'renewable'
+        """
+        # Ensure authenticated before operation
+        await self._ensure_authenticated()
+
+        try:
+            response = await self._call(
+                self._client.sys.renew_lease, lease_id=lease_id, increment=increment, idempotent=True
+            )
+            lease_duration = response['lease_duration']
+            logger.info(f"✅ Lease renewed: {lease_id[:8]}... - TTL: {lease_duration}s")
+            return {
+                'lease_id': response.get('lease_id', lease_id),
+                'lease_duration': lease_duration,
+                'renewable': response.get('renewable', False)
+            }
+        except Exception as e:
+            logger.error(f"❌ Failed to renew lease {lease_id}: {e}")
+            raise
+
     async def revoke_lease(self, lease_id: str) -> None:
         """
         Revoke a Vault lease (e.g., database credentials).
 
         Args:
             lease_id: Lease ID to revoke
+
+        Raises:
+            Exception: If revocation fails (lease_revoker retries it)
         """
         # Ensure authenticated before operation
         await self._ensure_authenticated()
 
         try:
-            self._client.sys.revoke_lease(lease_id)
+            await self._call(self._client.sys.revoke_lease, lease_id, idempotent=True)
             logger.info(f"✅ Lease revoked: {lease_id}")
         except Exception as e:
             logger.error(f"❌ Failed to revoke lease {lease_id}: {e}")
-            # Don't raise - lease will expire anyway
+            raise
+
+    async def _call(self, fn, *args, idempotent: bool = False, **kwargs) -> Any:
+        """
+        Run a blocking hvac call in a worker thread through the Vault guard.
+
+        Args:
+            fn: hvac method
+            idempotent: Safe to retry/hedge (reads, renew, revoke)
+
+        Raises:
+            CircuitOpenError: If the Vault circuit is open
+        """
+        return await self.guard.call(lambda: asyncio.to_thread(fn, *args, **kwargs), idempotent=idempotent)
 
     async def _ensure_authenticated(self) -> None:
         """
         Ensure the Vault client is authenticated with a valid token.
-        Re-authenticates if token is expired or missing.
+        Re-authenticates if token is expired or missing. Concurrent callers
+        share one token check and at most one re-login, so a token expiry
+        doesn't send every in-flight request to OpenBao's login endpoint.
         """
-        if self.is_authenticated():
+        await self._flight.do(("ensure_auth",), self._check_and_reauthenticate)
+
+    async def _check_and_reauthenticate(self) -> None:
+        """Token check + re-login, run once per coalesced group."""
+        if await asyncio.to_thread(self.is_authenticated):
             return
 
         logger.info("🔄 Vault token expired or missing, re-authenticating...")
+        # Same key as the scheduled SVID refresh - the two never log in concurrently
+        await self._flight.do(("login",), self._login)
+        logger.info("✅ Vault re-authentication successful")
+
+    async def _login(self) -> None:
+        """Log in with the configured method (SVID-based in HTTPS mode, root token in dev mode)."""
         is_https = self.vault_addr.startswith('https://')
         if is_https:
             if self.auth_method == 'cert':
@@ -371,7 +481,16 @@ class VaultClient:
             self._client.token = 'root'
             self._authenticated = True
             logger.info("✅ Vault re-authenticated (dev mode root token)")
-        logger.info("✅ Vault re-authentication successful")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get single-flight and circuit breaker counters.
+
+        Returns:
+            Dict with executed/coalesced counts per operation, in-flight calls
+            and the Vault guard's state under 'circuit'
+        """
+        return {**self._flight.get_stats(), "circuit": self.guard.get_stats()}
 
 
 # Global Vault client instance
@@ -2,6 +2,7 @@
 Main FastAPI application for SPIRE-Vault-99 Backend.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
@@ -9,10 +10,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import settings
-from app.api.v1 import health, auth, github, demo
+from app.api.v1 import health, auth, github, audit
+from app.core.audit import audit_logger
 from app.core.spire import spire_client
 from app.core.vault import vault_client
 from app.core.database import db_manager
+from app.core.lease_revoker import lease_revoker
+from app.core.loop_monitor import loop_monitor
+from app.core.password_hashing import password_hasher
+from app.core.github import github_client
+from app.core.github_cache import github_refresher
+from app.core.shutdown import shutdown_coordinator
+from app.core.token_denylist import token_denylist
+from app.middleware.admission import AdmissionMiddleware, AdmissionPolicy, admission_controller
 
 # Configure logging
 logging.basicConfig(
@@ -34,6 +44,14 @@ async def lifespan(app: FastAPI):
     logger.info(f"Vault address: {settings.VAULT_ADDR}")
     logger.info(f"Database host: {settings.DB_HOST}")
 
+    # Start loop monitor first so blocking calls during startup are caught too
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+
+    # Pick the password hashing cost for this hardware (a few hashes, in a thread)
+    if settings.PASSWORD_HASH_CALIBRATE:
+        await asyncio.to_thread(password_hasher.calibrate, settings.PASSWORD_HASH_TARGET_MS)
+
     # Initialize SPIRE client
     try:
         await spire_client.connect()
@@ -50,6 +68,9 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Vault initialization failed: {e}")
         raise
 
+    # Revoke leases left pending by a previous run, then keep draining
+    await lease_revoker.start()
+
     # Initialize database pool
     try:
         await db_manager.connect()
@@ -58,13 +79,45 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Database initialization failed: {e}")
         raise
 
+    # Load revoked access tokens and follow revocations from other replicas
+    if settings.TOKEN_DENYLIST_ENABLED:
+        await token_denylist.start()
+
+    # Buffered audit writes + monthly partition maintenance
+    if settings.AUDIT_LOG_ENABLED:
+        await audit_logger.start()
+
+    # Keep GitHub data warm for recently active users
+    if settings.GITHUB_REFRESH_ENABLED:
+        await github_refresher.start()
+
+    # Probe demo network scenarios in the background for /demo/monitor
+    if settings.DEMO_ENABLED and settings.PROBE_MONITOR_ENABLED:
+        from app.core.probe_monitor import probe_monitor  # Demo only - not imported when disabled
+        await probe_monitor.start()
+
     yield
 
-    # Shutdown
+    # Shutdown - stop producing background work, drain, then close resources in order
     logger.info("Shutting down application...")
+    if settings.GITHUB_REFRESH_ENABLED:
+        await github_refresher.stop()
+    if settings.TOKEN_DENYLIST_ENABLED:
+        await token_denylist.stop()
+    if settings.DEMO_ENABLED and settings.PROBE_MONITOR_ENABLED:
+        from app.core.probe_monitor import probe_monitor
+        await probe_monitor.stop()
+    report = await shutdown_coordinator.drain()
+    if settings.AUDIT_LOG_ENABLED:
+        report.update(await audit_logger.stop())  # After the drain - drained requests still record events
+    logger.info(f"Drain report: {report}")
+    await github_client.close()  # After the drain - background syncs call GitHub
     await db_manager.close()
+    await lease_revoker.stop()  # Needs the Vault client - stop before closing it
     await vault_client.close()
     await spire_client.close()
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.stop()
     logger.info("Shutdown complete")
 
 
@@ -89,7 +142,7 @@ app = FastAPI(
     ## Security
 
     - mTLS authentication to Vault using SPIRE certificates
-    - Database credentials rotated every 50 minutes
+    - Database credentials renewed from the Vault lease TTL and rotated near max TTL
     - GitHub tokens stored in Vault KV v2 (never in database)
     - JWT tokens with 1-hour expiration
     - Protected routes with dependency injection
@@ -119,9 +172,21 @@ app = FastAPI(
             "name": "github",
             "description": "GitHub integration with secure token storage in Vault"
         },
+        {
+            "name": "audit",
+            "description": "The current user's audit trail"
+        },
+        {
+            "name": "admin",
+            "description": "Operational diagnostics (restricted to ADMIN_USERNAMES)"
+        },
     ],
 )
 
+# Admission control (added before CORS so shed responses still get CORS headers)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -131,11 +196,43 @@ app.add_middleware(
     allow_headers=settings.CORS_HEADERS,
 )
 
-# Include routers
+# Include routers (with admission policies for the expensive ones)
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
+admission_controller.add("/api/v1/auth", AdmissionPolicy(
+    name="auth",
+    paths=("/login", "/register"),
+    max_concurrency=settings.ADMISSION_AUTH_MAX_CONCURRENCY,
+    target_latency=settings.ADMISSION_AUTH_TARGET_LATENCY,
+    ip_rate=settings.ADMISSION_AUTH_IP_RATE,
+    ip_burst=settings.ADMISSION_AUTH_IP_BURST,
+))
 app.include_router(github.router, prefix="/api/v1/github", tags=["github"])
-app.include_router(demo.router, prefix="/api/v1", tags=["demo"])
+admission_controller.add("/api/v1/github", AdmissionPolicy(
+    name="github",
+    max_concurrency=settings.ADMISSION_GITHUB_MAX_CONCURRENCY,
+    target_latency=settings.ADMISSION_GITHUB_TARGET_LATENCY,
+    user_rate=settings.ADMISSION_USER_RATE,
+    user_burst=settings.ADMISSION_USER_BURST,
+))
+
+app.include_router(audit.router, prefix="/api/v1", tags=["audit"])
+
+# Optional routers - only imported when enabled
+if settings.DEMO_ENABLED:
+    from app.api.v1 import demo
+    app.include_router(demo.router, prefix="/api/v1", tags=["demo"])
+    admission_controller.add("/api/v1", AdmissionPolicy(
+        name="demo",
+        paths=("/demo/run/",),
+        max_concurrency=settings.ADMISSION_DEMO_MAX_CONCURRENCY,
+        target_latency=settings.ADMISSION_DEMO_TARGET_LATENCY,
+        user_rate=settings.ADMISSION_USER_RATE,
+        user_burst=settings.ADMISSION_USER_BURST,
+    ))
+if settings.ADMIN_API_ENABLED:
+    from app.api.v1 import admin
+    app.include_router(admin.router, prefix="/api/v1", tags=["admin"])
 
 # Root endpoint
 @app.get("/")
@@ -0,0 +1,389 @@
+"""
+Admission control and load shedding for expensive routes.
+
+Each registered route group (bcrypt auth, GitHub, demo probes) gets an
+adaptive concurrency limit: AIMD - the limit grows by ~1 per limit's worth
+of requests finishing under the group's target latency and shrinks by 10%
+when one finishes slower or with an internal error, at most once per
+target-latency window. Requests over the limit wait in a bounded queue with a deadline;
+a full queue or an expired deadline answers 503 with Retry-After at once,
+so cheap routes never queue behind a backlog of expensive ones.
+
+Per-IP and per-user token buckets cap how fast a single client can hit a
+group (429 with Retry-After). Routes outside every group pass through.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.auth import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+# Multiplicative decrease applied when a request is too slow or fails
+BACKOFF = 0.9
+
+# Cap on keys tracked per token-bucket set; full (idle) buckets are evicted beyond this
+MAX_TRACKED_KEYS = 10000
+
+
+class Overloaded(Exception):
+    """Raised when a request can't be admitted (queue full or deadline passed)."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """
+    Admission settings for one route group.
+
+    Args:
+        name: Group name (stats, logs)
+        max_concurrency: Upper bound (and starting value) of the adaptive limit
+        target_latency: Seconds; slower completions shrink the limit
+        paths: Path prefixes under the router prefix ("" = whole router)
+        ip_rate: Requests/second per client IP (None = no IP bucket)
+        ip_burst: IP bucket capacity
+        user_rate: Requests/second per user (None = no user bucket)
+        user_burst: User bucket capacity
+    """
+    name: str
+    max_concurrency: int
+    target_latency: float
+    paths: Tuple[str, ...] = ("",)
+    ip_rate: Optional[float] = None
+    ip_burst: int = 10
+    user_rate: Optional[float] = None
+    user_burst: int = 10
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit with a bounded FIFO wait queue.
+    """
+
+    def __init__(self, name: str, max_limit: int, target_latency: float,
+                 max_queue: int = settings.ADMISSION_QUEUE_SIZE,
+                 queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT):
+        """
+        Initialize adaptive limiter.
+
+        Args:
+            name: Group name
+            max_limit: Highest concurrency limit (also the starting limit)
+            target_latency: Seconds; completions slower than this shrink the limit
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout: Longest wait for a slot in seconds
+        """
+        self.name = name
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.limit = float(max_limit)
+        self.inflight = 0
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+        self._latency_ewma: Optional[float] = None
+        self.counters = {"admitted": 0, "queued": 0, "shed_queue_full": 0, "shed_timeout": 0, "decreases": 0}
+
+    def _retry_after(self) -> float:
+        """Rough time until a newly queued request would get a slot."""
+        latency = self._latency_ewma or self.target_latency
+        return max(1.0, latency * (len(self._waiters) + 1) / max(1, int(self.limit)))
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in the queue if the group is at its limit.
+
+        Raises:
+            Overloaded: If the queue is full or no slot frees up before the deadline
+        """
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            self.counters["admitted"] += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.counters["shed_queue_full"] += 1
+            raise Overloaded(f"{self.name} overloaded", self._retry_after())
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait_for(fut, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(fut)
+            self.counters["shed_timeout"] += 1
+            raise Overloaded(f"{self.name} overloaded", self._retry_after())
+        except asyncio.CancelledError:
+            self._discard(fut)
+            if fut.done() and not fut.cancelled():
+                self.release(None, False)  # Slot was handed over just as we were cancelled
+            raise
+        self.counters["admitted"] += 1
+
+    def _discard(self, fut: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+    def release(self, latency: Optional[float], failed: bool) -> None:
+        """
+        Return a slot and adapt the limit to how the request went.
+
+        Args:
+            latency: Seconds the request took (None = don't adapt)
+            failed: The request ended in a 500 or an exception
+        """
+        self.inflight -= 1
+        if latency is not None:
+            self._latency_ewma = latency if self._latency_ewma is None else 0.9 * self._latency_ewma + 0.1 * latency
+            now = time.monotonic()
+            if failed or latency > self.target_latency:
+                # One decrease per window - a burst of slow requests is one overload signal
+                if now - self._last_decrease > self.target_latency:
+                    self.limit = max(1.0, self.limit * BACKOFF)
+                    self._last_decrease = now
+                    self.counters["decreases"] += 1
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+        # Hand freed (or newly allowed) slots to waiters in arrival order
+        while self._waiters and self.inflight < int(self.limit):
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self.inflight += 1
+                fut.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limit, occupancy and shed counters."""
+        return {
+            "limit": round(self.limit, 2),
+            "max_limit": self.max_limit,
+            "inflight": self.inflight,
+            "waiting": len(self._waiters),
+            "latency_ewma_ms": round(self._latency_ewma * 1000, 1) if self._latency_ewma is not None else None,
+            **self.counters,
+        }
+
+
+class TokenBuckets:
+    """
+    In-memory token buckets keyed by client (IP or user).
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize token buckets.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, List[float]] = {}  # key -> [tokens, last refill (monotonic)]
+        self.rejected = 0
+
+    def take(self, key: str) -> float:
+        """
+        Take one token for key.
+
+        Returns:
+            0.0 if allowed, else seconds until a token is available
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_KEYS:
+                self._evict_full(now)
+            bucket = self._buckets[key] = [float(self.burst), now]
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return 0.0
+        self.rejected += 1
+        return (1.0 - bucket[0]) / self.rate
+
+    def _evict_full(self, now: float) -> None:
+        """Drop buckets that have refilled completely (same as a new bucket)."""
+        refill_time = self.burst / self.rate
+        for key in [k for k, (_, last) in self._buckets.items() if now - last >= refill_time]:
+            del self._buckets[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "burst": self.burst, "tracked": len(self._buckets), "rejected": self.rejected}
+
+
+class _Group:
+    """A registered policy with its limiter and buckets."""
+
+    def __init__(self, policy: AdmissionPolicy):
+        self.policy = policy
+        self.limiter = AdaptiveLimiter(policy.name, policy.max_concurrency, policy.target_latency)
+        self.ip_buckets = TokenBuckets(policy.ip_rate, policy.ip_burst) if policy.ip_rate else None
+        self.user_buckets = TokenBuckets(policy.user_rate, policy.user_burst) if policy.user_rate else None
+
+
+class AdmissionController:
+    """
+    Registry of route groups, matched by longest path prefix.
+    """
+
+    def __init__(self):
+        """Initialize admission controller."""
+        self._groups: Dict[str, _Group] = {}
+        self._prefixes: List[Tuple[str, _Group]] = []
+
+    def add(self, prefix: str, policy: AdmissionPolicy) -> None:
+        """
+        Register a policy for a router.
+
+        Args:
+            prefix: Router prefix as passed to include_router
+            policy: Admission policy; its paths are relative to prefix
+        """
+        group = self._groups[policy.name] = _Group(policy)
+        self._prefixes.extend((prefix + path, group) for path in policy.paths)
+        self._prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+
+    def match(self, path: str) -> Optional[_Group]:
+        """Group owning a request path, or None."""
+        for prefix, group in self._prefixes:
+            if path.startswith(prefix):
+                return group
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-group admission statistics.
+
+        Returns:
+            Dict of group name -> limiter state and token-bucket counters
+        """
+        return {
+            name: {
+                **group.limiter.get_stats(),
+                "ip_buckets": group.ip_buckets.get_stats() if group.ip_buckets else None,
+                "user_buckets": group.user_buckets.get_stats() if group.user_buckets else None,
+            }
+            for name, group in self._groups.items()
+        }
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """
+    Client address.
+
+    With ADMISSION_FORWARDED_FOR_HOPS = N > 0, the Nth X-Forwarded-For hop
+    from the right - the one recorded by the outermost trusted proxy. Hops
+    to its left are client-supplied and never used. Returns None if the
+    header has fewer hops than expected (no trustworthy address; per-IP
+    limits are skipped for the request rather than lumping every client
+    into the proxy's own bucket).
+    """
+    hops = settings.ADMISSION_FORWARDED_FOR_HOPS
+    if hops > 0:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        return forwarded[-hops] if len(forwarded) >= hops else None
+    return request.client.host if request.client else None
+
+
+def _user_key(request: Request) -> Optional[str]:
+    """User ID from the access token (cookie or bearer), None if unauthenticated."""
+    token = request.cookies.get("access_token")
+    if not token:
+        auth = request.headers.get("authorization", "")
+        token = auth[7:] if auth.lower().startswith("bearer ") else None
+    payload = decode_access_token(token) if token else None
+    user_id = payload.get("user_id") if payload else None
+    return f"user:{user_id}" if user_id is not None else None
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying the controller's policies.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        group = self.controller.match(scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        ip = client_ip(request)
+        if group.ip_buckets and ip:
+            wait = group.ip_buckets.take(ip)
+            if wait:
+                await _reject(429, "Too many requests", wait)(scope, receive, send)
+                return
+        user_key = _user_key(request) or (f"ip:{ip}" if ip else None)
+        if group.user_buckets and user_key:
+            wait = group.user_buckets.take(user_key)
+            if wait:
+                await _reject(429, "Too many requests", wait)(scope, receive, send)
+                return
+
+        try:
+            await group.limiter.acquire()
+        except Overloaded as e:
+            logger.warning(f"⚠️  Shedding {scope['path']}: {e}")
+            await _reject(503, "Server busy, try again later", e.retry_after)(scope, receive, send)
+            return
+
+        status = 500
+        start = time.monotonic()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except asyncio.CancelledError:
+            group.limiter.release(None, False)  # Client went away - no latency signal
+            raise
+        except BaseException:
+            group.limiter.release(time.monotonic() - start, True)
+            raise
+        # Fast 503s (open circuits) say nothing about this process's capacity - only 500s count
+        group.limiter.release(time.monotonic() - start, status == 500)
+
+
+# Global admission controller instance
+admission_controller = AdmissionController()
@@ -7,7 +7,9 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.config import settings
 from app.core.auth import decode_access_token, get_token_from_cookie
+from app.core.token_denylist import token_denylist
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +20,11 @@ security = HTTPBearer(auto_error=False)
 class CurrentUser:
     """Current authenticated user information."""
 
-    def __init__(self, user_id: int, username: str):
+    def __init__(self, user_id: int, username: str, jti: Optional[str] = None, exp: Optional[int] = None):
         self.user_id = user_id
         self.username = username
+        self.jti = jti  # None for tokens minted before jti claims existed
+        self.exp = exp
 
     def __repr__(self):
         return f"<CurrentUser(user_id={self.user_id}, username='{self.username}')>"
@@ -83,4 +87,36 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    return CurrentUser(user_id=user_id, username=username)
+    # Filter miss (almost every request) is answered in memory; only hits touch the DB
+    jti: Optional[str] = payload.get("jti")
+    exp: Optional[int] = payload.get("exp")
+    if settings.TOKEN_DENYLIST_ENABLED and jti and exp and await token_denylist.is_revoked(jti, exp):
+        logger.warning(f"Revoked token presented for user: {username}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+
+    return CurrentUser(user_id=user_id, username=username, jti=jti, exp=exp)
+
+
+async def require_admin(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    """
+    Dependency restricting a route to ADMIN_USERNAMES.
+
+    Args:
+        current_user: Authenticated user
+
+    Returns:
+        CurrentUser instance
+
+    Raises:
+        HTTPException: 403 if the user is not an admin
+    """
+    if current_user.username not in settings.ADMIN_USERNAMES:
+        logger.warning(f"Admin endpoint denied for user: {current_user.username}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
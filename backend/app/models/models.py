@@ -3,8 +3,8 @@ SQLAlchemy models for SPIRE-Vault-99 Backend.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import INET, JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -43,6 +43,11 @@ class GitHubIntegration(Base):
     is_configured = Column(Boolean, default=False, nullable=False)
     configured_at = Column(DateTime, nullable=True)
     last_accessed_at = Column(DateTime, nullable=True)
+    # Repository sync state (see app.core.github_sync)
+    repos_etag = Column(String(255), nullable=True)  # ETag of the last incremental page-1 request
+    repos_since = Column(DateTime, nullable=True)  # Newest repo updated_at stored so far
+    repos_synced_at = Column(DateTime, nullable=True)
+    repos_full_synced_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -53,21 +58,90 @@ class GitHubIntegration(Base):
         return f"<GitHubIntegration(id={self.id}, user_id={self.user_id}, is_configured={self.is_configured})>"
 
 
+class GitHubRepo(Base):
+    """
+    Snapshot of a user's GitHub repositories (RepoRecord fields).
+    Kept current by the incremental sync; lets /github/repos answer when
+    GitHub is slow or rate-limited, and makes a cold cache a Postgres read
+    instead of a full GitHub crawl.
+    """
+    __tablename__ = "github_repositories"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    repo_id = Column(BigInteger, primary_key=True)
+    name = Column(String(255), nullable=False)
+    full_name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    private = Column(Boolean, nullable=False)
+    html_url = Column(String(512), nullable=False)
+    language = Column(String(100), nullable=True)
+    stargazers_count = Column(Integer, nullable=False, default=0)
+    forks_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)  # GitHub's timestamps, not the row's
+    updated_at = Column(DateTime, nullable=False)
+    synced_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<GitHubRepo(user_id={self.user_id}, repo_id={self.repo_id}, full_name='{self.full_name}')>"
+
+
+class RefreshToken(Base):
+    """
+    Opaque refresh token, stored as its SHA-256 (see app.core.refresh_tokens).
+    Every use rotates it: the row is marked rotated and a child row with the
+    same family_id is issued. Replaying a rotated token revokes the family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # Shared by every rotation of one login
+    parent_id = Column(BigInteger, ForeignKey("refresh_tokens.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    rotated_at = Column(DateTime, nullable=True)  # Set when exchanged for its successor
+    revoked_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id={self.family_id})>"
+
+
+class RevokedToken(Base):
+    """
+    Access token revoked before its exp (logout), keyed by its jti claim.
+    Mirrored into each replica's in-memory filter (see app.core.token_denylist).
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Token exp - row can be purged after it
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti='{self.jti}', expires_at={self.expires_at})>"
+
+
 class AuditLog(Base):
     """
     Audit log model for tracking user actions.
+    Range-partitioned by month on created_at (see audit_log_maintain() in
+    init-db.sql), so the primary key includes created_at.
     """
     __tablename__ = "audit_log"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
-    action = Column(String(100), nullable=False, index=True)  # e.g., "login", "configure_github", "fetch_repos"
-    resource = Column(String(255), nullable=True)  # e.g., "user:123", "github:repos"
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    action = Column(String(100), nullable=False)  # e.g., "login", "logout", "configure_github"
+    resource_type = Column(String(50), nullable=True)  # e.g., "github"
+    resource_id = Column(String(100), nullable=True)
     details = Column(JSONB, nullable=True)  # Additional context as JSON
+    ip_address = Column(INET, nullable=True)
+    user_agent = Column(Text, nullable=True)
 
     # Relationships
     user = relationship("User", back_populates="audit_logs")
 
     def __repr__(self):
-        return f"<AuditLog(id={self.id}, user_id={self.user_id}, action='{self.action}', timestamp={self.timestamp})>"
+        return f"<AuditLog(id={self.id}, user_id={self.user_id}, action='{self.action}', created_at={self.created_at})>"
@@ -0,0 +1,630 @@
+"""
+Precompiled Core queries for hot request paths.
+
+Statements are built once at import with bind parameters, so each request
+only supplies values: SQLAlchemy's compiled cache hits on a stable cache key
+and asyncpg reuses the per-connection prepared statement. Lookups load only
+the columns the endpoints need and return Row objects instead of ORM
+entities, skipping identity-map and hydration work.
+"""
+
+from datetime import datetime
+from typing import Optional, Any, Dict, List
+from sqlalchemy import select, update, delete, bindparam, or_, tuple_, all_, text, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import User, GitHubIntegration, GitHubRepo, RefreshToken, RevokedToken, AuditLog
+
+# Columns served by UserResponse
+USER_COLUMNS = (User.id, User.username, User.email, User.created_at, User.updated_at)
+
+_user_by_username = select(*USER_COLUMNS, User.password_hash).where(
+    User.username == bindparam("username")
+)
+
+_user_by_id = select(*USER_COLUMNS).where(User.id == bindparam("user_id"))
+
+_update_password_hash = (
+    update(User)
+    .where(User.id == bindparam("target_user_id"))
+    .values(password_hash=bindparam("password_hash"), updated_at=bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
+
+_user_conflicts = select(User.username, User.email).where(
+    or_(User.username == bindparam("username"), User.email == bindparam("email"))
+).limit(2)
+
+_github_integration_by_user = select(
+    GitHubIntegration.id,
+    GitHubIntegration.is_configured,
+    GitHubIntegration.configured_at,
+    GitHubIntegration.last_accessed_at,
+).where(GitHubIntegration.user_id == bindparam("user_id"))
+
+_touch_github_integration = (
+    update(GitHubIntegration)
+    .where(GitHubIntegration.user_id == bindparam("target_user_id"))
+    .values(last_accessed_at=bindparam("now"), updated_at=bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
+
+_recently_active_github_users = (
+    select(GitHubIntegration.user_id)
+    .where(GitHubIntegration.is_configured.is_(True), GitHubIntegration.last_accessed_at >= bindparam("since"))
+    .order_by(GitHubIntegration.last_accessed_at.desc())
+    .limit(bindparam("limit"))
+)
+
+_github_sync_state = select(
+    GitHubIntegration.repos_etag,
+    GitHubIntegration.repos_since,
+    GitHubIntegration.repos_synced_at,
+    GitHubIntegration.repos_full_synced_at,
+).where(GitHubIntegration.user_id == bindparam("user_id"))
+
+_update_github_sync_state = (
+    update(GitHubIntegration)
+    .where(GitHubIntegration.user_id == bindparam("target_user_id"))
+    .values(
+        repos_etag=bindparam("etag"),
+        repos_since=bindparam("since"),
+        repos_synced_at=bindparam("synced_at"),
+        repos_full_synced_at=bindparam("full_synced_at"),
+    )
+    .execution_options(synchronize_session=False)
+)
+
+# Columns refreshed on conflict; rows whose values are all unchanged are left alone
+_REPO_MUTABLE = ("name", "full_name", "description", "private", "html_url", "language",
+                 "stargazers_count", "forks_count", "created_at", "updated_at")
+
+_repo_insert = insert(GitHubRepo)
+_upsert_github_repositories = _repo_insert.on_conflict_do_update(
+    index_elements=[GitHubRepo.user_id, GitHubRepo.repo_id],
+    set_={**{c: _repo_insert.excluded[c] for c in _REPO_MUTABLE}, "synced_at": _repo_insert.excluded.synced_at},
+    where=tuple_(*(GitHubRepo.__table__.c[c] for c in _REPO_MUTABLE)).is_distinct_from(
+        tuple_(*(_repo_insert.excluded[c] for c in _REPO_MUTABLE))
+    ),
+)
+
+_delete_github_repositories_except = delete(GitHubRepo).where(
+    GitHubRepo.user_id == bindparam("target_user_id"),
+    GitHubRepo.repo_id != all_(bindparam("keep", type_=ARRAY(BigInteger))),
+).execution_options(synchronize_session=False)
+
+_delete_github_repositories = delete(GitHubRepo).where(
+    GitHubRepo.user_id == bindparam("target_user_id")
+).execution_options(synchronize_session=False)
+
+_github_repositories_by_user = select(
+    GitHubRepo.repo_id,
+    GitHubRepo.name,
+    GitHubRepo.full_name,
+    GitHubRepo.description,
+    GitHubRepo.private,
+    GitHubRepo.html_url,
+    GitHubRepo.created_at,
+    GitHubRepo.updated_at,
+    GitHubRepo.language,
+    GitHubRepo.stargazers_count,
+    GitHubRepo.forks_count,
+).where(GitHubRepo.user_id == bindparam("user_id"))
+
+# Refresh token row + the user columns needed to mint an access token, locked
+# so concurrent refreshes of one token serialize
+_refresh_token_for_update = (
+    select(
+        RefreshToken.id.label("token_id"),
+        RefreshToken.family_id,
+        RefreshToken.expires_at,
+        RefreshToken.rotated_at,
+        RefreshToken.revoked_at,
+        *USER_COLUMNS,
+    )
+    .join(User, User.id == RefreshToken.user_id)
+    .where(RefreshToken.token_hash == bindparam("token_hash"))
+    .with_for_update(of=RefreshToken)
+)
+
+_insert_refresh_token = insert(RefreshToken).values(
+    user_id=bindparam("user_id"),
+    token_hash=bindparam("token_hash"),
+    family_id=bindparam("family_id"),
+    parent_id=bindparam("parent_id"),
+    created_at=bindparam("now"),
+    expires_at=bindparam("expires_at"),
+)
+
+_mark_refresh_token_rotated = (
+    update(RefreshToken)
+    .where(RefreshToken.id == bindparam("token_id"))
+    .values(rotated_at=bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
+
+_revoke_refresh_token_family = (
+    update(RefreshToken)
+    .where(RefreshToken.family_id == bindparam("target_family_id"), RefreshToken.revoked_at.is_(None))
+    .values(revoked_at=bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
+
+_delete_expired_refresh_tokens = (
+    delete(RefreshToken)
+    .where(RefreshToken.user_id == bindparam("user_id"), RefreshToken.expires_at < bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
+
+_insert_revoked_token = (
+    insert(RevokedToken)
+    .values(jti=bindparam("jti"), expires_at=bindparam("expires_at"), revoked_at=bindparam("now"))
+    .on_conflict_do_nothing(index_elements=["jti"])
+)
+
+_revoked_token_exists = select(RevokedToken.jti).where(RevokedToken.jti == bindparam("jti"))
+
+_revoked_tokens_since = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+    RevokedToken.revoked_at > bindparam("since"), RevokedToken.expires_at > bindparam("now")
+)
+
+_delete_expired_revoked_tokens = (
+    delete(RevokedToken)
+    .where(RevokedToken.expires_at < bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
+
+_insert_audit_events = insert(AuditLog)
+
+# Columns served by AuditEvent
+AUDIT_COLUMNS = (
+    AuditLog.id,
+    AuditLog.created_at,
+    AuditLog.action,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.details,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+)
+
+
+def _audit_page(after: bool, by_action: bool):
+    """Newest-first page of a user's audit events, optionally after a (created_at, id) key."""
+    stmt = select(*AUDIT_COLUMNS).where(AuditLog.user_id == bindparam("user_id"))
+    if by_action:
+        stmt = stmt.where(AuditLog.action == bindparam("action"))
+    if after:
+        # The plain bound on the partition key lets the planner prune newer partitions
+        stmt = stmt.where(
+            AuditLog.created_at <= bindparam("created_at"),
+            tuple_(AuditLog.created_at, AuditLog.id) < tuple_(bindparam("created_at"), bindparam("id")),
+        )
+    return stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(bindparam("limit"))
+
+
+# One statement per filter combination, so each keeps a stable prepared plan
+_audit_pages = {(after, by_action): _audit_page(after, by_action) for after in (False, True) for by_action in (False, True)}
+
+_audit_log_maintain = text("SELECT change, partition_name FROM audit_log_maintain(:months_ahead, :retention_months)")
+
+# Statements executed on every new pool connection before it serves traffic,
+# so a rotated engine starts with warm compiled + prepared statement caches.
+# Parameters match nothing - only the statement preparation matters.
+# Plain SELECTs only: these also run on the read replica (SELECT-only role,
+# read-only transactions).
+WARMUP_QUERIES: list[tuple[Any, dict]] = [
+    (_user_by_username, {"username": ""}),
+    (_user_by_id, {"user_id": 0}),
+    (_user_conflicts, {"username": "", "email": ""}),
+    (_github_integration_by_user, {"user_id": 0}),
+    (_revoked_token_exists, {"jti": ""}),
+]
+
+# Locking/write statements, warmed on the primary only
+PRIMARY_WARMUP_QUERIES: list[tuple[Any, dict]] = [
+    (_refresh_token_for_update, {"token_hash": ""}),
+]
+
+
+async def get_user_by_username(session: AsyncSession, username: str) -> Optional[Row]:
+    """
+    Fetch login columns (UserResponse fields + password_hash) by username.
+
+    Args:
+        session: Database session
+        username: Username to look up
+
+    Returns:
+        Row or None if the user does not exist
+    """
+    result = await session.execute(_user_by_username, {"username": username})
+    return result.one_or_none()
+
+
+async def get_user_by_id(session: AsyncSession, user_id: int) -> Optional[Row]:
+    """
+    Fetch UserResponse columns by user ID.
+
+    Args:
+        session: Database session
+        user_id: User ID to look up
+
+    Returns:
+        Row or None if the user does not exist
+    """
+    result = await session.execute(_user_by_id, {"user_id": user_id})
+    return result.one_or_none()
+
+
+async def find_user_conflict(session: AsyncSession, username: str, email: str) -> Optional[str]:
+    """
+    Check username and email uniqueness in a single round trip.
+
+    Args:
+        session: Database session
+        username: Requested username
+        email: Requested email
+
+    Returns:
+        "username" or "email" for the first conflicting field, None if both are free
+    """
+    result = await session.execute(_user_conflicts, {"username": username, "email": email})
+    rows = result.all()
+    if any(row.username == username for row in rows):
+        return "username"
+    if rows:
+        return "email"
+    return None
+
+
+async def get_github_integration(session: AsyncSession, user_id: int) -> Optional[Row]:
+    """
+    Fetch GitHub integration status columns for a user.
+
+    Args:
+        session: Database session
+        user_id: Owning user ID
+
+    Returns:
+        Row or None if the user never configured GitHub
+    """
+    result = await session.execute(_github_integration_by_user, {"user_id": user_id})
+    return result.one_or_none()
+
+
+async def update_password_hash(session: AsyncSession, user_id: int, password_hash: str) -> None:
+    """
+    Replace a user's password hash (rehash on login). Caller commits.
+
+    Args:
+        session: Database session
+        user_id: User ID
+        password_hash: New encoded hash
+    """
+    await session.execute(
+        _update_password_hash,
+        {"target_user_id": user_id, "password_hash": password_hash, "now": datetime.utcnow()},
+    )
+
+
+async def touch_github_integration(session: AsyncSession, user_id: int) -> None:
+    """
+    Update last_accessed_at with a single UPDATE (no load-modify-flush).
+    Caller commits.
+
+    Args:
+        session: Database session
+        user_id: Owning user ID
+    """
+    await session.execute(
+        _touch_github_integration,
+        {"target_user_id": user_id, "now": datetime.utcnow()},
+    )
+
+
+async def get_recently_active_github_users(session: AsyncSession, since: datetime, limit: int) -> List[int]:
+    """
+    User IDs with a configured GitHub integration accessed since a point in time,
+    most recent first.
+
+    Args:
+        session: Database session
+        since: Oldest last_accessed_at to include
+        limit: Maximum number of users
+
+    Returns:
+        List of user IDs
+    """
+    result = await session.execute(_recently_active_github_users, {"since": since, "limit": limit})
+    return list(result.scalars())
+
+
+async def get_github_sync_state(session: AsyncSession, user_id: int) -> Optional[Row]:
+    """
+    Fetch the repository sync state columns of a user's GitHub integration.
+
+    Args:
+        session: Database session
+        user_id: Owning user ID
+
+    Returns:
+        Row (repos_etag, repos_since, repos_synced_at, repos_full_synced_at) or None
+    """
+    result = await session.execute(_github_sync_state, {"user_id": user_id})
+    return result.one_or_none()
+
+
+async def update_github_sync_state(session: AsyncSession, user_id: int, etag: Optional[str],
+                                   since: Optional[datetime], synced_at: datetime,
+                                   full_synced_at: Optional[datetime]) -> None:
+    """
+    Store the repository sync state. Caller commits.
+
+    Args:
+        session: Database session
+        user_id: Owning user ID
+        etag: ETag of the next incremental request
+        since: Newest repo updated_at stored
+        synced_at: Time of this sync
+        full_synced_at: Time of the last full sync
+    """
+    await session.execute(_update_github_sync_state, {
+        "target_user_id": user_id, "etag": etag, "since": since,
+        "synced_at": synced_at, "full_synced_at": full_synced_at,
+    })
+
+
+async def upsert_github_repositories(session: AsyncSession, rows: List[Dict[str, Any]], batch_size: int = 1000) -> None:
+    """
+    Bulk INSERT ... ON CONFLICT DO UPDATE of repository rows; unchanged rows are
+    not rewritten. Caller commits.
+
+    Args:
+        session: Database session
+        rows: github_repositories column dicts
+        batch_size: Rows per executemany batch
+    """
+    for start in range(0, len(rows), batch_size):
+        await session.execute(_upsert_github_repositories, rows[start:start + batch_size])
+
+
+async def delete_github_repositories_except(session: AsyncSession, user_id: int, keep: List[int]) -> int:
+    """
+    Delete a user's repositories that are not in keep (gone from GitHub). Caller commits.
+
+    Args:
+        session: Database session
+        user_id: Owning user ID
+        keep: Repository IDs GitHub still returns
+
+    Returns:
+        Number of rows deleted
+    """
+    result = await session.execute(_delete_github_repositories_except, {"target_user_id": user_id, "keep": keep})
+    return result.rowcount
+
+
+async def delete_github_repositories(session: AsyncSession, user_id: int) -> int:
+    """
+    Delete a user's whole repository snapshot (e.g., the token changed). Caller commits.
+
+    Args:
+        session: Database session
+        user_id: Owning user ID
+
+    Returns:
+        Number of rows deleted
+    """
+    result = await session.execute(_delete_github_repositories, {"target_user_id": user_id})
+    return result.rowcount
+
+
+async def get_github_repositories(session: AsyncSession, user_id: int) -> List[Row]:
+    """
+    Fetch a user's stored repository snapshot.
+
+    Args:
+        session: Database session
+        user_id: Owning user ID
+
+    Returns:
+        List of rows in RepoRecord field order (repo_id first)
+    """
+    result = await session.execute(_github_repositories_by_user, {"user_id": user_id})
+    return result.all()
+
+
+async def get_refresh_token_for_update(session: AsyncSession, token_hash: str) -> Optional[Row]:
+    """
+    Fetch and lock a refresh token with its user's UserResponse columns.
+
+    Args:
+        session: Database session (primary - takes a row lock)
+        token_hash: SHA-256 hex of the presented token
+
+    Returns:
+        Row (token_id, family_id, expires_at, rotated_at, revoked_at + user columns) or None
+    """
+    result = await session.execute(_refresh_token_for_update, {"token_hash": token_hash})
+    return result.one_or_none()
+
+
+async def insert_refresh_token(session: AsyncSession, user_id: int, token_hash: str, family_id: Any,
+                               parent_id: Optional[int], now: datetime, expires_at: datetime) -> None:
+    """
+    Store a new refresh token. Caller commits.
+
+    Args:
+        session: Database session
+        user_id: Token owner
+        token_hash: SHA-256 hex of the token
+        family_id: Family (login) the token belongs to
+        parent_id: Token it replaces (None for the first of a family)
+        now: Creation time
+        expires_at: Expiry time
+    """
+    await session.execute(_insert_refresh_token, {
+        "user_id": user_id, "token_hash": token_hash, "family_id": family_id,
+        "parent_id": parent_id, "now": now, "expires_at": expires_at,
+    })
+
+
+async def mark_refresh_token_rotated(session: AsyncSession, token_id: int, now: datetime) -> None:
+    """
+    Mark a refresh token as exchanged for its successor. Caller commits.
+
+    Args:
+        session: Database session
+        token_id: Refresh token row ID
+        now: Rotation time
+    """
+    await session.execute(_mark_refresh_token_rotated, {"token_id": token_id, "now": now})
+
+
+async def revoke_refresh_token_family(session: AsyncSession, family_id: Any, now: datetime) -> int:
+    """
+    Revoke every live token of a family. Caller commits.
+
+    Args:
+        session: Database session
+        family_id: Family to revoke
+        now: Revocation time
+
+    Returns:
+        Number of tokens revoked
+    """
+    result = await session.execute(_revoke_refresh_token_family, {"target_family_id": family_id, "now": now})
+    return result.rowcount
+
+
+async def delete_expired_refresh_tokens(session: AsyncSession, user_id: int, now: datetime) -> int:
+    """
+    Delete a user's expired refresh tokens. Caller commits.
+
+    Args:
+        session: Database session
+        user_id: Token owner
+        now: Current time
+
+    Returns:
+        Number of rows deleted
+    """
+    result = await session.execute(_delete_expired_refresh_tokens, {"user_id": user_id, "now": now})
+    return result.rowcount
+
+
+async def insert_revoked_token(session: AsyncSession, jti: str, expires_at: datetime, now: datetime) -> None:
+    """
+    Record a revoked access token (no-op if already revoked). Caller commits.
+
+    Args:
+        session: Database session
+        jti: Token ID claim
+        expires_at: Token expiry - the row is useless after it
+        now: Revocation time
+    """
+    await session.execute(_insert_revoked_token, {"jti": jti, "expires_at": expires_at, "now": now})
+
+
+async def is_token_revoked(session: AsyncSession, jti: str) -> bool:
+    """
+    Check whether an access token has been revoked.
+
+    Args:
+        session: Database session
+        jti: Token ID claim
+
+    Returns:
+        True if a revocation row exists
+    """
+    result = await session.execute(_revoked_token_exists, {"jti": jti})
+    return result.first() is not None
+
+
+async def get_revoked_tokens_since(session: AsyncSession, since: datetime, now: datetime) -> List[Row]:
+    """
+    Unexpired revocations recorded after a point in time.
+
+    Args:
+        session: Database session
+        since: Exclusive lower bound on revoked_at
+        now: Current time - already expired tokens are skipped
+
+    Returns:
+        List of Row objects (jti, expires_at, revoked_at)
+    """
+    result = await session.execute(_revoked_tokens_since, {"since": since, "now": now})
+    return result.all()
+
+
+async def delete_expired_revoked_tokens(session: AsyncSession, now: datetime) -> int:
+    """
+    Delete revocations of tokens that have expired anyway. Caller commits.
+
+    Args:
+        session: Database session
+        now: Current time
+
+    Returns:
+        Number of rows deleted
+    """
+    result = await session.execute(_delete_expired_revoked_tokens, {"now": now})
+    return result.rowcount
+
+
+async def insert_audit_events(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert audit events in one executemany. Caller commits.
+
+    Args:
+        session: Database session
+        rows: Dicts with user_id, action, resource_type, resource_id, details,
+              ip_address, user_agent and created_at
+    """
+    if rows:
+        await session.execute(_insert_audit_events, rows)
+
+
+async def get_audit_events(session: AsyncSession, user_id: int, limit: int, action: Optional[str] = None,
+                           after: Optional[tuple] = None) -> List[Row]:
+    """
+    One page of a user's audit events, newest first.
+
+    Args:
+        session: Database session
+        user_id: User whose events to read
+        limit: Maximum rows
+        action: Only events with this action (None = all)
+        after: (created_at, id) of the last event of the previous page
+
+    Returns:
+        List of Row objects (AUDIT_COLUMNS)
+    """
+    params: Dict[str, Any] = {"user_id": user_id, "limit": limit}
+    if action is not None:
+        params["action"] = action
+    if after is not None:
+        params["created_at"], params["id"] = after
+    result = await session.execute(_audit_pages[(after is not None, action is not None)], params)
+    return result.all()
+
+
+async def maintain_audit_partitions(session: AsyncSession, months_ahead: int, retention_months: int) -> List[Row]:
+    """
+    Create upcoming audit_log partitions and drop expired ones. Caller commits.
+
+    Args:
+        session: Database session
+        months_ahead: Months after the current one that must have a partition
+        retention_months: Whole months kept before the current one (0 = keep all)
+
+    Returns:
+        List of Row objects (change, partition_name) - "created" or "dropped"
+    """
+    result = await session.execute(
+        _audit_log_maintain, {"months_ahead": months_ahead, "retention_months": retention_months}
+    )
+    return result.all()
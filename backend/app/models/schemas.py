@@ -4,7 +4,7 @@ Pydantic schemas for request/response validation.
 
 from datetime import datetime
 from typing import Optional, Any
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, IPvAnyAddress
 
 
 # ============================================================================
@@ -170,6 +170,13 @@ class GitHubRepository(BaseModel):
     )
 
 
+class GitHubRepositoryPage(BaseModel):
+    """Schema for one page of repository search results."""
+    items: list[GitHubRepository]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to get the next page (null on the last page)")
+    total: int = Field(..., description="Repositories matching the filters")
+
+
 class GitHubUser(BaseModel):
     """Schema for GitHub user profile."""
     login: str
@@ -209,6 +216,44 @@ class GitHubUser(BaseModel):
     )
 
 
+# ============================================================================
+# Audit Schemas
+# ============================================================================
+
+class AuditEvent(BaseModel):
+    """Schema for one audit log event."""
+    id: int
+    created_at: datetime
+    action: str
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
+    details: Optional[dict[str, Any]] = None
+    ip_address: Optional[IPvAnyAddress] = None
+    user_agent: Optional[str] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "id": 4242,
+                "created_at": "2025-01-01T12:00:00",
+                "action": "configure_github",
+                "resource_type": "github",
+                "resource_id": "github/user-1/token",
+                "details": None,
+                "ip_address": "10.0.0.12",
+                "user_agent": "Mozilla/5.0"
+            }
+        }
+    )
+
+
+class AuditEventPage(BaseModel):
+    """Schema for one page of audit events, newest first."""
+    items: list[AuditEvent]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to get the next page (null on the last page)")
+
+
 # ============================================================================
 # Common Schemas
 # ============================================================================
@@ -0,0 +1,121 @@
+"""
+Connect-latency benchmark: p50/p95/p99 TCP connect and TLS handshake time
+to one or more endpoints, sequentially and in concurrent bursts.
+
+Run it from a backend pod against the real services, once with Cilium policy
+enforcement and once without, to see what enforcement adds per hop:
+    python -m benchmarks.connect_latency --target postgresql.99-apps.svc.cluster.local:5432 --tls --postgres
+    python -m benchmarks.connect_latency --target openbao.openbao.svc.cluster.local:8200 --tls
+
+Without --target it starts a plain and a TLS (self-signed) listener on
+localhost and measures those, as a baseline for the harness itself.
+
+Usage (from backend/):
+    python -m benchmarks.connect_latency [--target host:port ...] [--tls] [--postgres]
+        [--sequential 50] [--concurrent 20] [--timeout 3] [--output result.json]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import ssl
+import tempfile
+from typing import Dict, List
+
+from app.core.connect_latency import handshake_context, measure
+
+
+def _self_signed_context() -> ssl.SSLContext:
+    """Server context with a throwaway self-signed localhost certificate."""
+    # cryptography is only needed for the local TLS listener
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now).not_valid_after(now + datetime.timedelta(hours=1))
+        .sign(key, hashes.SHA256())
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_path, key_path = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+        with open(cert_path, "wb") as f:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        with open(key_path, "wb") as f:
+            f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                      serialization.NoEncryption()))
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+async def _drop(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    writer.close()
+
+
+async def run(args: argparse.Namespace) -> List[Dict]:
+    results = []
+    if args.target:
+        for target in args.target:
+            host, port = target.rsplit(":", 1)
+            results.append(await measure(
+                host, int(port), args.sequential, args.concurrent, args.timeout,
+                handshake_context() if args.tls else None, args.postgres,
+            ))
+        return results
+
+    plain = await asyncio.start_server(_drop, "127.0.0.1", 0)
+    secure = await asyncio.start_server(_drop, "127.0.0.1", 0, ssl=_self_signed_context())
+    try:
+        for server, tls in ((plain, None), (secure, handshake_context())):
+            port = server.sockets[0].getsockname()[1]
+            results.append(await measure("127.0.0.1", port, args.sequential, args.concurrent, args.timeout, tls))
+    finally:
+        for server in (plain, secure):
+            server.close()
+            await server.wait_closed()
+    return results
+
+
+def _line(label: str, phase: Dict, key: str) -> str:
+    stats = {k: "-" if v is None else f"{v}ms" for k, v in phase[key].items()}
+    return (f"  {label:<22} p50 {stats['p50_ms']}  p95 {stats['p95_ms']}  "
+            f"p99 {stats['p99_ms']}  max {stats['max_ms']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", action="append", help="host:port to measure (repeatable; default: localhost listeners)")
+    parser.add_argument("--tls", action="store_true", help="Time a TLS handshake after each connect")
+    parser.add_argument("--postgres", action="store_true", help="Negotiate TLS with a PostgreSQL SSLRequest")
+    parser.add_argument("--sequential", type=int, default=50, help="Connects made one after another")
+    parser.add_argument("--concurrent", type=int, default=20, help="Connects started at once")
+    parser.add_argument("--timeout", type=float, default=3.0, help="Seconds per connect/handshake")
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    for result in results:
+        print(f"{result['host']}:{result['port']}{' (TLS)' if result['tls'] else ''}")
+        for phase_name in ("sequential", "concurrent"):
+            phase = result[phase_name]
+            print(_line(f"{phase_name} connect", phase, "connect"))
+            if result["tls"]:
+                print(_line(f"{phase_name} handshake", phase, "handshake"))
+            print(f"  {phase_name + ' failures':<22} {phase['failures']}/{phase['attempts']} {phase['errors'] or ''}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Token denylist benchmark: per-request cost of the in-memory revocation check
+and the false-positive rate of the filters at their sized capacity.
+
+Fills one bucket per token lifetime slice with --revoked jtis, then measures:
+- ns per check for a live token (filter miss - the common case) and a
+  revoked one (filter hit, before the DB confirmation)
+- a plain set lookup of the same jtis for reference
+- the share of never-revoked jtis the filter reports as maybe-revoked, each
+  of which costs one primary-key lookup
+
+No database is needed - only the in-memory path is timed.
+
+Usage (from backend/):
+    python -m benchmarks.denylist [--revoked 50000] [--checks 200000] [--output result.json]
+"""
+
+import argparse
+import json
+import secrets
+import time
+import timeit
+
+from app.config import settings
+from app.core.token_denylist import TokenDenylist
+
+
+def _ns_per_call(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--revoked", type=int, default=settings.TOKEN_DENYLIST_BUCKET_CAPACITY,
+                        help="Revoked jtis per bucket")
+    parser.add_argument("--checks", type=int, default=200000, help="Lookups per measurement")
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    denylist = TokenDenylist()
+    exp = int(time.time()) + settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    revoked = [secrets.token_urlsafe(16) for _ in range(args.revoked)]
+    for jti in revoked:
+        denylist._add(jti, exp)
+    revoked_set = set(revoked)
+
+    live = [secrets.token_urlsafe(16) for _ in range(args.checks)]
+    live_jti, revoked_jti = live[0], revoked[0]
+    check = denylist.might_be_revoked
+
+    false_positives = sum(check(jti, exp) for jti in live)
+    report = {
+        "revoked": args.revoked,
+        "bucket_capacity": settings.TOKEN_DENYLIST_BUCKET_CAPACITY,
+        "miss_ns": round(_ns_per_call(lambda: check(live_jti, exp), args.checks), 1),
+        "hit_ns": round(_ns_per_call(lambda: check(revoked_jti, exp), args.checks), 1),
+        "set_lookup_ns": round(_ns_per_call(lambda: live_jti in revoked_set, args.checks), 1),
+        "false_positive_rate": round(false_positives / len(live), 5),
+        "filter_bytes": sum(b._words.itemsize * len(b._words) for b in denylist._buckets.values()),
+    }
+
+    print(f"revoked jtis:        {report['revoked']} (bucket capacity {report['bucket_capacity']})")
+    print(f"check, live token:   {report['miss_ns']:.0f} ns")
+    print(f"check, revoked:      {report['hit_ns']:.0f} ns (+ one DB lookup to confirm)")
+    print(f"set lookup (ref):    {report['set_lookup_ns']:.0f} ns")
+    print(f"false positives:     {report['false_positive_rate']:.3%} of live tokens")
+    print(f"filter memory:       {report['filter_bytes'] / 1024:.0f} KiB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,550 @@
+"""
+In-process fakes for the backend's external dependencies.
+
+- FakeWorkloadAPI: SPIFFE Workload API gRPC server on a unix socket, issuing a
+  self-signed X.509-SVID and JWT-SVIDs for spiffe://demo.local/ns/99-apps/sa/backend
+- FakeOpenBao: HTTP server covering the OpenBao paths the backend uses
+  (token lookup, cert/jwt login, KV v2, database creds, lease renew/revoke)
+- FakeGitHub: HTTP server for /user and /user/repos with synthetic repos
+  (paging, sort=updated, since and ETag/If-None-Match like GitHub's)
+
+The HTTP fakes run in their own threads: hvac is synchronous and would
+deadlock against a server sharing the application's event loop.
+"""
+
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import ssl
+import threading
+import time
+import uuid
+from concurrent import futures
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+import grpc
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from jose import jwk, jwt
+from spiffe._proto import workload_pb2, workload_pb2_grpc
+
+SPIFFE_ID = "spiffe://demo.local/ns/99-apps/sa/backend"
+TRUST_DOMAIN = "demo.local"
+
+Route = Callable[["_Request"], tuple]  # (status, body) or (status, body, headers)
+
+
+# ============================================================================
+# SPIFFE Workload API
+# ============================================================================
+
+def _issue_svid(spiffe_id: str, ttl: timedelta) -> Tuple[bytes, bytes, bytes, ec.EllipticCurvePrivateKey]:
+    """
+    Create a CA and a leaf X.509-SVID signed by it.
+
+    Returns:
+        Tuple of (leaf DER, leaf key PKCS8 DER, CA DER, CA key)
+    """
+    now = datetime.now(timezone.utc)
+    ca_key = ec.generate_private_key(ec.SECP256R1())
+    ca_name = x509.Name([x509.NameAttribute(NameOID.ORGANIZATION_NAME, "SPIRE fake CA")])
+    ca_cert = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name)
+        .issuer_name(ca_name)
+        .public_key(ca_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1))
+        .not_valid_after(now + timedelta(days=1))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(x509.KeyUsage(
+            digital_signature=True, content_commitment=False, key_encipherment=False,
+            data_encipherment=False, key_agreement=False, key_cert_sign=True,
+            crl_sign=True, encipher_only=False, decipher_only=False), critical=True)
+        .add_extension(x509.SubjectAlternativeName(
+            [x509.UniformResourceIdentifier(f"spiffe://{TRUST_DOMAIN}")]), critical=False)
+        .sign(ca_key, hashes.SHA256())
+    )
+
+    leaf_key = ec.generate_private_key(ec.SECP256R1())
+    leaf_cert = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.ORGANIZATION_NAME, "SPIRE fake")]))
+        .issuer_name(ca_name)
+        .public_key(leaf_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1))
+        .not_valid_after(now + ttl)
+        .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+        .add_extension(x509.KeyUsage(
+            digital_signature=True, content_commitment=False, key_encipherment=True,
+            data_encipherment=False, key_agreement=True, key_cert_sign=False,
+            crl_sign=False, encipher_only=False, decipher_only=False), critical=True)
+        .add_extension(x509.SubjectAlternativeName(
+            [x509.UniformResourceIdentifier(spiffe_id)]), critical=False)
+        .sign(ca_key, hashes.SHA256())
+    )
+
+    key_der = leaf_key.private_bytes(
+        serialization.Encoding.DER,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return (
+        leaf_cert.public_bytes(serialization.Encoding.DER),
+        key_der,
+        ca_cert.public_bytes(serialization.Encoding.DER),
+        ca_key,
+    )
+
+
+def make_server_tls(workdir: str, client_ca_der: Optional[bytes] = None) -> Tuple[ssl.SSLContext, str]:
+    """
+    Create a server TLS context for 127.0.0.1 signed by a throwaway CA.
+
+    Args:
+        workdir: Directory for the PEM files
+        client_ca_der: CA to verify optional client certificates against (SVID bundle)
+
+    Returns:
+        Tuple of (SSLContext, path to CA certificate for clients' VAULT_CACERT)
+    """
+    now = datetime.now(timezone.utc)
+    ca_key = ec.generate_private_key(ec.SECP256R1())
+    ca_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "fake-openbao-ca")])
+    ca_cert = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name).issuer_name(ca_name)
+        .public_key(ca_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1)).not_valid_after(now + timedelta(days=1))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(ca_key, hashes.SHA256())
+    )
+    key = ec.generate_private_key(ec.SECP256R1())
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")]))
+        .issuer_name(ca_name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1)).not_valid_after(now + timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([
+            x509.IPAddress(ipaddress.ip_address("127.0.0.1")), x509.DNSName("localhost")]), critical=False)
+        .sign(ca_key, hashes.SHA256())
+    )
+
+    ca_path = os.path.join(workdir, "openbao-ca.crt")
+    cert_path = os.path.join(workdir, "openbao.crt")
+    key_path = os.path.join(workdir, "openbao.key")
+    with open(ca_path, "wb") as f:
+        f.write(ca_cert.public_bytes(serialization.Encoding.PEM))
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    if client_ca_der:
+        context.verify_mode = ssl.CERT_OPTIONAL
+        context.load_verify_locations(cadata=x509.load_der_x509_certificate(client_ca_der)
+                                      .public_bytes(serialization.Encoding.PEM).decode())
+    return context, ca_path
+
+
+class _WorkloadServicer(workload_pb2_grpc.SpiffeWorkloadAPIServicer):
+    """Serves a fixed SVID; JWT-SVIDs are minted per request."""
+
+    def __init__(self, spiffe_id: str, svid_ttl: timedelta):
+        self.spiffe_id = spiffe_id
+        self.leaf_der, self.key_der, self.ca_der, ca_key = _issue_svid(spiffe_id, svid_ttl)
+        self._jwt_key_pem = ca_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = ca_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        key = jwk.construct(public_pem, "ES256").to_dict()
+        key.update({"kid": "fake", "use": "jwt-svid"})
+        self._jwks = json.dumps({"keys": [key]}).encode()
+
+    def FetchX509SVID(self, request, context):
+        yield workload_pb2.X509SVIDResponse(svids=[workload_pb2.X509SVID(
+            spiffe_id=self.spiffe_id,
+            x509_svid=self.leaf_der,
+            x509_svid_key=self.key_der,
+            bundle=self.ca_der,
+        )])
+
+    def FetchX509Bundles(self, request, context):
+        yield workload_pb2.X509BundlesResponse(bundles={TRUST_DOMAIN: self.ca_der})
+
+    def FetchJWTSVID(self, request, context):
+        now = int(time.time())
+        token = jwt.encode(
+            {"sub": self.spiffe_id, "aud": list(request.audience), "iat": now, "exp": now + 300},
+            self._jwt_key_pem,
+            algorithm="ES256",
+            headers={"kid": "fake", "typ": "JWT"},
+        )
+        return workload_pb2.JWTSVIDResponse(svids=[workload_pb2.JWTSVID(spiffe_id=self.spiffe_id, svid=token)])
+
+    def FetchJWTBundles(self, request, context):
+        yield workload_pb2.JWTBundlesResponse(bundles={TRUST_DOMAIN: self._jwks})
+
+
+class FakeWorkloadAPI:
+    """SPIFFE Workload API served over a unix socket."""
+
+    def __init__(self, socket_path: str, spiffe_id: str = SPIFFE_ID, svid_ttl: timedelta = timedelta(hours=1)):
+        self.socket_path = socket_path
+        self.servicer = _WorkloadServicer(spiffe_id, svid_ttl)
+        self._server: Optional[grpc.Server] = None
+
+    def start(self) -> None:
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        workload_pb2_grpc.add_SpiffeWorkloadAPIServicer_to_server(self.servicer, self._server)
+        self._server.add_insecure_port(f"unix:{self.socket_path}")
+        self._server.start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.stop(grace=None)
+
+
+# ============================================================================
+# HTTP fakes
+# ============================================================================
+
+class _Request:
+    """Parsed request passed to route handlers."""
+
+    def __init__(self, method: str, path: str, match: re.Match, body: Any, headers, query: Dict[str, str]):
+        self.method = method
+        self.path = path
+        self.match = match
+        self.body = body
+        self.headers = headers
+        self.query = query
+
+
+class _FakeHTTPServer:
+    """
+    Threaded JSON HTTP server with regex routing.
+    Subclasses register routes as (method, pattern) -> handler(request) ->
+    (status, body) or (status, body, headers).
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._routes: list[tuple[str, re.Pattern, Route]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tls: Optional[ssl.SSLContext] = None
+        self._lock = threading.Lock()
+
+    def route(self, method: str, pattern: str, handler: Route) -> None:
+        self._routes.append((method, re.compile(pattern + "$"), handler))
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        scheme = "https" if self._tls else "http"
+        return f"{scheme}://{host}:{port}"
+
+    def start(self, tls: Optional[ssl.SSLContext] = None) -> None:
+        """
+        Start serving in a daemon thread.
+
+        Args:
+            tls: Server SSL context (see make_server_tls); plain HTTP when None
+        """
+        fake = self
+        self._tls = tls
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else None
+                status, payload, *extra = fake._handle(self.command, self.path, body, self.headers)
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in {**fake.extra_headers(self.path), **(extra[0] if extra else {})}.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_LIST = _dispatch
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        if tls:
+            self._server.socket = tls.wrap_socket(self._server.socket, server_side=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def extra_headers(self, path: str) -> Dict[str, str]:
+        return {}
+
+    def _handle(self, method: str, raw_path: str, body: Any, headers) -> tuple:
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        parsed = urlparse(raw_path)
+        path, query = parsed.path, dict(parse_qsl(parsed.query))
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                return handler(_Request(method, path, match, body, headers, query))
+        return 404, {"errors": [f"no route for {method} {path}"]}
+
+
+class FakeOpenBao(_FakeHTTPServer):
+    """
+    OpenBao API subset used by VaultClient.
+
+    Database credentials are handed out as-is (typically a pre-created role
+    on the benchmark Postgres) with a fresh lease ID per request.
+    """
+
+    def __init__(self, db_username: str, db_password: str, lease_duration: int = 3600,
+                 token_ttl: int = 3600, latency: float = 0.0):
+        super().__init__(latency)
+        self.db_username = db_username
+        self.db_password = db_password
+        self.lease_duration = lease_duration
+        self.token_ttl = token_ttl
+        self.kv: Dict[str, Dict[str, Any]] = {}
+        self.leases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+        self.route("GET", r"/v1/auth/token/lookup-self", self._lookup_self)
+        self.route("POST", r"/v1/auth/cert/login", self._login)
+        self.route("POST", r"/v1/auth/jwt/login", self._login)
+        self.route("POST", r"/v1/(?P<mount>[^/]+)/data/(?P<path>.+)", self._kv_write)
+        self.route("PUT", r"/v1/(?P<mount>[^/]+)/data/(?P<path>.+)", self._kv_write)
+        self.route("GET", r"/v1/(?P<mount>[^/]+)/data/(?P<path>.+)", self._kv_read)
+        self.route("GET", r"/v1/(?P<mount>[^/]+)/creds/(?P<role>[^/]+)", self._db_creds)
+        self.route("PUT", r"/v1/sys/leases/renew", self._renew)
+        self.route("PUT", r"/v1/sys/leases/revoke", self._revoke)
+
+    def _count(self, op: str) -> None:
+        with self._lock:
+            self.counts[op] = self.counts.get(op, 0) + 1
+
+    def _lookup_self(self, req: _Request):
+        self._count("lookup_self")
+        return 200, {"data": {"id": "root", "ttl": self.token_ttl, "expire_time": None, "policies": ["root"]}}
+
+    def _login(self, req: _Request):
+        self._count("login")
+        return 200, {"auth": {
+            "client_token": f"s.{uuid.uuid4().hex}",
+            "lease_duration": self.token_ttl,
+            "renewable": True,
+            "policies": ["backend-policy"],
+            "entity_id": "fake-entity",
+        }}
+
+    def _kv_write(self, req: _Request):
+        self._count("kv_write")
+        key = f"{req.match['mount']}/{req.match['path']}"
+        self.kv[key] = (req.body or {}).get("data", {})
+        return 200, {"data": {"version": 1, "created_time": datetime.utcnow().isoformat() + "Z"}}
+
+    def _kv_read(self, req: _Request):
+        self._count("kv_read")
+        key = f"{req.match['mount']}/{req.match['path']}"
+        if key not in self.kv:
+            return 404, {"errors": []}
+        return 200, {"data": {"data": self.kv[key], "metadata": {"version": 1, "deletion_time": "", "destroyed": False}}}
+
+    def _db_creds(self, req: _Request):
+        self._count("db_creds")
+        lease_id = f"{req.match['mount']}/creds/{req.match['role']}/{uuid.uuid4().hex}"
+        self.leases[lease_id] = time.time() + self.lease_duration
+        return 200, {
+            "lease_id": lease_id,
+            "lease_duration": self.lease_duration,
+            "renewable": True,
+            "data": {"username": self.db_username, "password": self.db_password},
+        }
+
+    def _renew(self, req: _Request):
+        self._count("renew")
+        lease_id = req.body["lease_id"]
+        if lease_id not in self.leases:
+            return 400, {"errors": ["lease not found"]}
+        increment = req.body.get("increment") or self.lease_duration
+        self.leases[lease_id] = time.time() + increment
+        return 200, {"lease_id": lease_id, "lease_duration": increment, "renewable": True}
+
+    def _revoke(self, req: _Request):
+        self._count("revoke")
+        self.leases.pop(req.body["lease_id"], None)
+        return 204, None
+
+
+def make_repo(owner: str, index: int) -> Dict[str, Any]:
+    """Synthetic repository with a realistic subset of GitHub's ~100 fields."""
+    name = f"repo-{index:05d}"
+    url = f"https://api.github.com/repos/{owner}/{name}"
+    updated = datetime(2025, 1, 1) - timedelta(hours=index)
+    repo = {
+        "id": 100000 + index,
+        "node_id": f"R_kgDO{index:08d}",
+        "name": name,
+        "full_name": f"{owner}/{name}",
+        "private": index % 3 == 0,
+        "owner": {"login": owner, "id": 1, "type": "User", "site_admin": False,
+                  "avatar_url": "https://avatars.githubusercontent.com/u/1",
+                  "url": f"https://api.github.com/users/{owner}"},
+        "html_url": f"https://github.com/{owner}/{name}",
+        "description": f"Synthetic repository number {index} for benchmarks" if index % 4 else None,
+        "fork": index % 7 == 0,
+        "url": url,
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "pushed_at": updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "homepage": None,
+        "size": index * 13 % 5000,
+        "stargazers_count": (index * 37) % 1000,
+        "watchers_count": (index * 37) % 1000,
+        "language": ("Python", "Go", "TypeScript", "Rust", None)[index % 5],
+        "forks_count": (index * 11) % 200,
+        "open_issues_count": index % 17,
+        "default_branch": "main",
+        "visibility": "private" if index % 3 == 0 else "public",
+        "topics": ["demo", "benchmark"],
+        "permissions": {"admin": True, "maintain": True, "push": True, "triage": True, "pull": True},
+    }
+    for rel in ("forks", "keys", "collaborators", "teams", "hooks", "issue_events", "events",
+                "assignees", "branches", "tags", "blobs", "git_tags", "git_refs", "trees",
+                "statuses", "languages", "stargazers", "contributors", "subscribers",
+                "subscription", "commits", "git_commits", "comments", "issue_comment",
+                "contents", "compare", "merges", "archive", "downloads", "issues", "pulls",
+                "milestones", "notifications", "labels", "releases", "deployments"):
+        repo[f"{rel}_url"] = f"{url}/{rel}"
+    return repo
+
+
+class FakeGitHub(_FakeHTTPServer):
+    """
+    GitHub REST API subset: /user and /user/repos.
+    /user/repos without query parameters returns every repo in one page;
+    with page/per_page/sort/direction/since it pages like GitHub (Link
+    rel="next", ETag, 304 for a matching If-None-Match).
+    Enforces a per-token primary rate limit of `rate_limit` requests per hour
+    with X-RateLimit-* headers, answering 403 once a token is exhausted.
+    Like GitHub, 304 answers don't count against the limit.
+    """
+
+    def __init__(self, login: str = "jake", repo_count: int = 100, latency: float = 0.0,
+                 rate_limit: int = 5000):
+        super().__init__(latency)
+        self.login = login
+        self.repos = [make_repo(login, i) for i in range(repo_count)]
+        self.rate_limit = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.used: Dict[str, int] = {}
+        self.rejected = 0
+        self.not_modified = 0
+        self.route("GET", r"/user", self._limited(self._user))
+        self.route("GET", r"/user/repos", self._limited(self._user_repos))
+
+    def _limited(self, handler: Route) -> Route:
+        def wrapper(req: _Request):
+            token = req.headers.get("Authorization", "")
+            with self._lock:
+                used = self.used[token] = self.used.get(token, 0) + 1
+                if used > self.rate_limit:
+                    self.rejected += 1
+            headers = {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(max(0, self.rate_limit - used)),
+                "X-RateLimit-Reset": str(self.reset_at),
+            }
+            if used > self.rate_limit:
+                return 403, {"message": "API rate limit exceeded"}, headers
+            status, body, *extra = handler(req)
+            if status == 304:
+                with self._lock:
+                    used = self.used[token] = self.used[token] - 1
+                    self.not_modified += 1
+                headers["X-RateLimit-Remaining"] = str(max(0, self.rate_limit - used))
+            return status, body, {**headers, **(extra[0] if extra else {})}
+        return wrapper
+
+    def _user(self, req: _Request):
+        return 200, {
+            "login": self.login, "id": 1, "avatar_url": "https://avatars.githubusercontent.com/u/1",
+            "html_url": f"https://github.com/{self.login}", "name": "Jake Peralta", "company": "NYPD",
+            "blog": "", "location": "Brooklyn, NY", "email": None, "bio": None,
+            "public_repos": len(self.repos), "followers": 99, "following": 15,
+            "created_at": "2010-01-01T12:00:00Z",
+        }
+
+    def _user_repos(self, req: _Request):
+        query = req.query
+        if not query:
+            return 200, self.repos
+
+        with self._lock:
+            repos = list(self.repos)
+        if query.get("sort") == "updated":
+            repos.sort(key=lambda r: r["updated_at"], reverse=query.get("direction", "desc") == "desc")
+        if "since" in query:
+            repos = [r for r in repos if r["updated_at"] >= query["since"]]
+
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        chunk = repos[(page - 1) * per_page:page * per_page]
+        etag = '"' + hashlib.sha1(json.dumps(chunk, sort_keys=True).encode()).hexdigest() + '"'
+        if req.headers.get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+
+        headers = {"ETag": etag}
+        if page * per_page < len(repos):
+            next_query = "&".join(f"{k}={v}" for k, v in {**query, "page": page + 1}.items())
+            headers["Link"] = f'<{self.url}/user/repos?{next_query}>; rel="next"'
+        return 200, chunk, headers
+
+    def touch(self, count: int, offset: int = 0) -> None:
+        """Mark `count` repos (starting at `offset`) as just updated, with one more star."""
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self._lock:
+            for repo in self.repos[offset:offset + count]:
+                repo["updated_at"] = repo["pushed_at"] = now
+                repo["stargazers_count"] += 1
+
+    def delete(self, count: int) -> None:
+        """Drop the last `count` repos."""
+        with self._lock:
+            del self.repos[len(self.repos) - count:]
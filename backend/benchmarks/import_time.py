@@ -0,0 +1,113 @@
+"""
+Import-time benchmark: how long `import app.main` takes in a fresh
+interpreter, with a budget check for pod cold start.
+
+For each configuration (all routers / production routers) measures:
+- wall-clock import time, median over --runs fresh processes
+- the heaviest top-level packages by self time (from -X importtime)
+- modules that must stay lazy (LAZY_MODULES) but were imported anyway
+
+Exits non-zero if the production configuration goes over --budget-ms or
+imports a lazy module, so it can gate CI.
+
+Usage (from backend/):
+    python -m benchmarks.import_time [--runs 7] [--budget-ms 1000] [--top 12] [--output result.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+# Loaded on first use (GitHub calls, SPIRE connect), never by the import itself
+LAZY_MODULES = ("httpx", "spiffe", "grpc")
+
+CONFIGURATIONS = [
+    {"name": "all routers", "env": {"DEMO_ENABLED": "true", "ADMIN_API_ENABLED": "true"}},
+    {"name": "production", "env": {"DEMO_ENABLED": "false", "ADMIN_API_ENABLED": "true"},
+     "lazy": LAZY_MODULES + ("app.api.v1.demo", "app.core.probe_monitor", "app.core.connect_latency")},
+]
+
+# Prints wall time (ms) and the imported module names
+_PROBE = (
+    "import json, sys, time; t = time.perf_counter(); import app.main; "
+    "print(json.dumps([(time.perf_counter() - t) * 1000, sorted(sys.modules)]))"
+)
+
+
+def _python(env: Dict[str, str], *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], env={**os.environ, "LOG_LEVEL": "WARNING", **env},
+        capture_output=True, text=True, check=True,
+    )
+
+
+def _heaviest(importtime_output: str, top: int) -> List[Dict]:
+    """Self time per top-level package from -X importtime stderr."""
+    self_us: Dict[str, int] = defaultdict(int)
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        self_us[name.strip().split(".")[0]] += int(self_time)
+    ranked = sorted(self_us.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": name, "self_ms": round(us / 1000, 1)} for name, us in ranked]
+
+
+def measure(env: Dict[str, str], runs: int, top: int, lazy: tuple) -> Dict:
+    """Import app.main in fresh interpreters and summarise one configuration."""
+    times = []
+    modules: List[str] = []
+    for _ in range(runs):
+        elapsed_ms, modules = json.loads(_python(env, "-c", _PROBE).stdout.strip().splitlines()[-1])
+        times.append(elapsed_ms)
+    profile = _python(env, "-X", "importtime", "-c", "import app.main").stderr
+
+    loaded = set(modules)
+    return {
+        "median_ms": round(statistics.median(times), 1),
+        "min_ms": round(min(times), 1),
+        "modules": len(modules),
+        "heaviest": _heaviest(profile, top),
+        "lazy_violations": [m for m in lazy if m in loaded],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters per configuration")
+    parser.add_argument("--budget-ms", type=float, default=1000.0,
+                        help="Median import budget for the production configuration")
+    parser.add_argument("--top", type=int, default=12, help="Heaviest packages listed")
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    report = {"budget_ms": args.budget_ms, "results": []}
+    for config in CONFIGURATIONS:
+        result = measure(config["env"], args.runs, args.top, config.get("lazy", ()))
+        report["results"].append({"configuration": config["name"], **result})
+        print(f"{config['name']:<12} median {result['median_ms']:>7.1f}ms  min {result['min_ms']:>7.1f}ms  "
+              f"{result['modules']} modules")
+        print("  heaviest: " + ", ".join(f"{h['package']} {h['self_ms']}ms" for h in result["heaviest"]))
+        if result["lazy_violations"]:
+            print(f"  ❌ imported eagerly: {', '.join(result['lazy_violations'])}")
+
+    production = report["results"][-1]
+    report["passed"] = production["median_ms"] <= args.budget_ms and not production["lazy_violations"]
+    print(f"{'✅' if report['passed'] else '❌'} production import {production['median_ms']:.1f}ms "
+          f"(budget {args.budget_ms:.0f}ms)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    if not report["passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Load test for the backend API against in-process fakes.
+
+Boots app.main:app under uvicorn (in a background thread with its own event
+loop) wired to FakeWorkloadAPI, FakeOpenBao and FakeGitHub, plus a local
+Postgres reachable with --db-user/--db-password (FakeOpenBao hands these out
+as the "dynamic" credentials). Each endpoint is driven at --concurrency for
+--requests requests; the report has RPS, p50/p95/p99 latency and the
+server event-loop lag observed during each phase.
+
+Usage (from backend/):
+    docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres -e POSTGRES_DB=appdb postgres:15-alpine
+    python -m benchmarks.loadtest --init-schema --concurrency 32 --requests 2000 --output before.json
+
+Client and server share one process (and the GIL), so compare reports from
+the same machine and settings rather than reading absolute numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fakes import FakeGitHub, FakeOpenBao, FakeWorkloadAPI, make_server_tls
+
+ENDPOINTS = ("health", "login", "me", "repos")
+BENCH_USER = {"username": "bench_user", "email": "bench@precinct99.nypd", "password": "bench-precinct99"}
+BENCH_GITHUB_TOKEN = "ghp_" + "b" * 40
+INIT_SQL = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "database", "init-db.sql")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(len(sorted_values) * pct / 100) - 1)
+    return sorted_values[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max/mean in milliseconds for a list of seconds."""
+    ordered = sorted(values)
+    return {
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 3),
+        "mean_ms": round((sum(ordered) / len(ordered) if ordered else 0.0) * 1000, 3),
+    }
+
+
+class LoopLagProbe:
+    """Samples how late a periodic sleep wakes up on the loop it runs on."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[tuple[float, float]] = []  # (monotonic time, lag seconds)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            self.samples.append((time.monotonic(), max(0.0, now - expected)))
+
+    def window(self, start: float, end: float) -> List[float]:
+        return [lag for t, lag in self.samples if start <= t <= end]
+
+
+class ServerThread:
+    """Runs uvicorn in a daemon thread with a LoopLagProbe on the server loop."""
+
+    def __init__(self, app, port: int):
+        import uvicorn
+
+        self.port = port
+        self.probe = LoopLagProbe()
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.error: Optional[BaseException] = None
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        probe_task = loop.create_task(self.probe.run())
+        try:
+            loop.run_until_complete(self.server.serve())
+        except BaseException as e:  # surfaced to the main thread in start()
+            self.error = e
+        finally:
+            probe_task.cancel()
+            loop.run_until_complete(asyncio.gather(probe_task, return_exceptions=True))
+            loop.close()
+
+    def start(self, timeout: float = 60.0) -> None:
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if self.error or not self.thread.is_alive():
+                raise RuntimeError(f"Server failed to start: {self.error or 'lifespan startup failed (see log above)'}")
+            if time.monotonic() > deadline:
+                raise TimeoutError("Server did not start in time")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+async def init_schema(args: argparse.Namespace) -> None:
+    """Apply scripts/database/init-db.sql to the benchmark database."""
+    import asyncpg
+
+    conn = await asyncpg.connect(host=args.db_host, port=args.db_port, database=args.db_name,
+                                 user=args.db_user, password=args.db_password)
+    try:
+        with open(INIT_SQL) as f:
+            await conn.execute(f.read())
+    finally:
+        await conn.close()
+
+
+async def run_phase(name: str, request: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]],
+                    client: httpx.AsyncClient, concurrency: int, total: int,
+                    probe: LoopLagProbe) -> Dict:
+    """Issue `total` requests from `concurrency` workers and summarise them."""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await request(client)
+                key = str(response.status_code)
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[key] = statuses.get(key, 0) + 1
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    errors = sum(count for code, count in statuses.items() if not code.startswith("2"))
+    return {
+        "endpoint": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "errors": errors,
+        "statuses": statuses,
+        "latency": summarize(latencies),
+        "event_loop_lag": summarize(probe.window(started, started + elapsed)),
+    }
+
+
+async def drive(args: argparse.Namespace, server: ServerThread, fakes: Dict) -> Dict:
+    """Seed the benchmark user and run each endpoint phase."""
+    base = f"http://127.0.0.1:{server.port}/api/v1"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60.0) as client:
+        await client.post("/auth/register", json=BENCH_USER)
+        login = await client.post("/auth/login", json={k: BENCH_USER[k] for k in ("username", "password")})
+        login.raise_for_status()
+        (await client.post("/github/configure", json={"github_token": BENCH_GITHUB_TOKEN})).raise_for_status()
+
+        requests = {
+            "health": lambda c: c.get("/health"),
+            "login": lambda c: c.post("/auth/login", json={k: BENCH_USER[k] for k in ("username", "password")}),
+            "me": lambda c: c.get("/auth/me"),
+            "repos": lambda c: c.get("/github/repos"),
+        }
+
+        results = []
+        for name in args.endpoints:
+            # Short warmup so pool growth and first-call costs stay out of the numbers
+            await run_phase(name, requests[name], client, args.concurrency,
+                            min(args.requests, args.concurrency * 2), server.probe)
+            result = await run_phase(name, requests[name], client, args.concurrency, args.requests, server.probe)
+            results.append(result)
+            lat = result["latency"]
+            print(f"{name:<8} {result['rps']:>9.1f} rps  p50 {lat['p50_ms']:>8.2f}ms  "
+                  f"p95 {lat['p95_ms']:>8.2f}ms  p99 {lat['p99_ms']:>8.2f}ms  "
+                  f"loop lag p99 {result['event_loop_lag']['p99_ms']:>7.2f}ms  errors {result['errors']}")
+
+    return {
+        "results": results,
+        "fake_calls": {
+            "openbao": dict(fakes["openbao"].counts),
+            "github": fakes["github"].requests,
+            "github_rate_limited": fakes["github"].rejected,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint")
+    parser.add_argument("--endpoints", type=lambda v: v.split(","), default=list(ENDPOINTS),
+                        help=f"Comma-separated subset of {','.join(ENDPOINTS)}")
+    parser.add_argument("--repos", type=int, default=100, help="Repositories returned by FakeGitHub")
+    parser.add_argument("--github-latency", type=float, default=0.0, help="Seconds added to each GitHub call")
+    parser.add_argument("--github-rate-limit", type=int, default=5000, help="FakeGitHub requests per token per hour")
+    parser.add_argument("--vault-latency", type=float, default=0.0, help="Seconds added to each OpenBao call")
+    parser.add_argument("--vault-auth", choices=("token", "cert", "jwt"), default="token",
+                        help="token = HTTP dev mode; cert/jwt = HTTPS with SVID login")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="Override BCRYPT_ROUNDS")
+    parser.add_argument("--admission", action="store_true",
+                        help="Keep admission control on (every request comes from 127.0.0.1, so per-IP "
+                             "limits cap login at ADMISSION_AUTH_IP_RATE)")
+    parser.add_argument("--db-host", default="127.0.0.1")
+    parser.add_argument("--db-port", type=int, default=5432)
+    parser.add_argument("--db-name", default="appdb")
+    parser.add_argument("--db-user", default="postgres")
+    parser.add_argument("--db-password", default="postgres")
+    parser.add_argument("--init-schema", action="store_true", help="Apply init-db.sql before the run")
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    socket_path = os.path.join(workdir, "agent.sock")
+
+    workload_api = FakeWorkloadAPI(socket_path)
+    workload_api.start()
+    openbao = FakeOpenBao(args.db_user, args.db_password, latency=args.vault_latency)
+    github = FakeGitHub(repo_count=args.repos, latency=args.github_latency, rate_limit=args.github_rate_limit)
+    github.start()
+
+    env = {
+        "SPIRE_SOCKET_PATH": socket_path,
+        "DB_HOST": args.db_host,
+        "DB_PORT": str(args.db_port),
+        "DB_NAME": args.db_name,
+        "LOG_LEVEL": "WARNING",
+        # One client IP for every request - per-IP/per-user buckets would turn the run into a 429 count
+        "ADMISSION_ENABLED": "true" if args.admission else "false",
+    }
+    if args.vault_auth == "token":
+        openbao.start()
+    else:
+        tls, ca_path = make_server_tls(workdir, workload_api.servicer.ca_der)
+        openbao.start(tls)
+        env.update(VAULT_CACERT=ca_path, VAULT_AUTH_METHOD=args.vault_auth)
+    env.update(VAULT_ADDR=openbao.url, GITHUB_API_URL=github.url)
+    if args.bcrypt_rounds:
+        env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ.update(env)
+
+    if args.init_schema:
+        asyncio.run(init_schema(args))
+
+    # Settings are read at import time - import the app only after env is set
+    from app.config import settings
+    from app.main import app
+
+    server = ServerThread(app, _free_port())
+    server.start()
+    try:
+        report = asyncio.run(drive(args, server, {"openbao": openbao, "github": github}))
+    finally:
+        server.stop()
+        github.stop()
+        openbao.stop()
+        workload_api.stop()
+
+    report.update({
+        "app_version": settings.APP_VERSION,
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("db_password", "output")},
+    })
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Per-query CPU benchmark: ORM entity lookups vs precompiled Core queries.
+
+Runs each hot lookup against a sync engine (in-memory SQLite by default, so
+no Postgres is needed) and reports CPU time per query from
+time.process_time(). The driver cost is the same for both variants; the
+difference is statement construction, cache-key generation, compilation
+and ORM hydration.
+
+Usage (from backend/):
+    python -m benchmarks.query_cpu [--url sqlite://] [--iterations 20000] [--output result.json]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.models import User, GitHubIntegration
+from app.models import queries
+
+
+def _seed(session: Session, users: int) -> None:
+    """Insert users with GitHub integrations to look up."""
+    now = datetime.utcnow()
+    for i in range(users):
+        session.add(User(id=i + 1, username=f"user{i}", email=f"user{i}@precinct99.nypd", password_hash="x" * 60))
+        session.add(GitHubIntegration(user_id=i + 1, is_configured=True, configured_at=now))
+    session.commit()
+
+
+def _measure(name: str, iterations: int, users: int, fn: Callable[[int], object]) -> dict:
+    """Run fn(i) `iterations` times and return CPU microseconds per call."""
+    for i in range(min(iterations, 200)):
+        fn(i % users)  # warm caches
+    start = time.process_time()
+    for i in range(iterations):
+        fn(i % users)
+    elapsed = time.process_time() - start
+    return {"query": name, "iterations": iterations, "cpu_us_per_query": round(elapsed / iterations * 1e6, 2)}
+
+
+def run(url: str, iterations: int, users: int) -> dict:
+    """Run all query variants and return a JSON-serialisable report."""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[User.__table__, GitHubIntegration.__table__])
+
+    with Session(engine) as session:
+        _seed(session, users)
+
+    results = []
+    with Session(engine) as session:
+        def orm_by_username(i):
+            session.expunge_all()  # per-request sessions never share an identity map
+            return session.execute(select(User).where(User.username == f"user{i}")).scalar_one_or_none()
+
+        def core_by_username(i):
+            return session.execute(queries._user_by_username, {"username": f"user{i}"}).one_or_none()
+
+        def orm_by_id(i):
+            session.expunge_all()
+            return session.execute(select(User).where(User.id == i + 1)).scalar_one_or_none()
+
+        def core_by_id(i):
+            return session.execute(queries._user_by_id, {"user_id": i + 1}).one_or_none()
+
+        def orm_integration(i):
+            session.expunge_all()
+            return session.execute(
+                select(GitHubIntegration).where(GitHubIntegration.user_id == i + 1)
+            ).scalar_one_or_none()
+
+        def core_integration(i):
+            return session.execute(queries._github_integration_by_user, {"user_id": i + 1}).one_or_none()
+
+        for name, fn in (
+            ("user_by_username/orm", orm_by_username),
+            ("user_by_username/core", core_by_username),
+            ("user_by_id/orm", orm_by_id),
+            ("user_by_id/core", core_by_id),
+            ("github_integration/orm", orm_integration),
+            ("github_integration/core", core_integration),
+        ):
+            results.append(_measure(name, iterations, users, fn))
+
+    engine.dispose()
+    return {"url": engine.url.render_as_string(hide_password=True), "users": users, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="sqlite://", help="Sync SQLAlchemy URL (default: in-memory SQLite)")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.url, args.iterations, args.users)
+    for row in report["results"]:
+        print(f"{row['query']:<28} {row['cpu_us_per_query']:>8.2f} us/query")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
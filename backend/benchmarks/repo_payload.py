@@ -0,0 +1,103 @@
+"""
+Repo payload benchmark: full GitHub dicts + pydantic/stock JSON vs projected
+RepoRecords + orjson.
+
+For a synthetic /user/repos body of --repos repositories, measures per request:
+- CPU to parse the body and keep it (ingestion)
+- CPU to turn the kept list into the HTTP response body (serialization)
+- memory retained by the kept list (tracemalloc)
+
+The baseline mirrors the previous path: response.json() keeps every field,
+FastAPI validates the list against list[GitHubRepository] and encodes it
+with jsonable_encoder + json.dumps.
+
+Usage (from backend/):
+    python -m benchmarks.repo_payload [--repos 1000] [--iterations 50] [--output result.json]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.github import parse_repositories
+from app.models.schemas import GitHubRepository
+from benchmarks.fakes import make_repo
+
+
+def _cpu_ms(fn: Callable[[], object], iterations: int) -> float:
+    fn()  # warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return round((time.process_time() - start) / iterations * 1000, 3)
+
+
+def _retained_kb(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    kept = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return round(size / 1024, 1)
+
+
+def run(repos: int, iterations: int) -> dict:
+    """Measure both paths and return a JSON-serialisable report."""
+    body = json.dumps([make_repo("jake", i) for i in range(repos)]).encode()
+    adapter = TypeAdapter(list[GitHubRepository])
+
+    baseline_kept = json.loads(body)
+    records = parse_repositories(body)
+
+    def baseline_serialize():
+        validated = adapter.validate_python(baseline_kept)
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+    results = {
+        "baseline": {
+            "ingest_cpu_ms": _cpu_ms(lambda: json.loads(body), iterations),
+            "serialize_cpu_ms": _cpu_ms(baseline_serialize, iterations),
+            "retained_kb": _retained_kb(lambda: json.loads(body)),
+            "response_bytes": len(baseline_serialize()),
+        },
+        "projected": {
+            "ingest_cpu_ms": _cpu_ms(lambda: parse_repositories(body), iterations),
+            "serialize_cpu_ms": _cpu_ms(lambda: orjson.dumps(records), iterations),
+            "retained_kb": _retained_kb(lambda: parse_repositories(body)),
+            "response_bytes": len(orjson.dumps(records)),
+        },
+    }
+
+    # Both paths must produce the same response document
+    assert orjson.loads(baseline_serialize()) == orjson.loads(orjson.dumps(records))
+
+    return {"repos": repos, "body_bytes": len(body), "iterations": iterations, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repos", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.repos, args.iterations)
+    print(f"{args.repos} repos, {report['body_bytes'] / 1024:.0f} KB body")
+    for name, r in report["results"].items():
+        print(f"{name:<10} ingest {r['ingest_cpu_ms']:>8.2f}ms  serialize {r['serialize_cpu_ms']:>8.2f}ms  "
+              f"retained {r['retained_kb']:>9.1f} KB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Repo search benchmark: whole-list response + client-side filtering vs the
+server-side RepoIndex query.
+
+For --repos synthetic repositories, measures per scenario:
+- CPU per request (baseline: serialize the full list and filter/sort it the
+  way a client would; indexed: RepoIndex.query + serialize one page)
+- response bytes sent to the client
+plus the one-off index build cost paid per cache fill.
+
+Usage (from backend/):
+    python -m benchmarks.repo_search [--repos 5000] [--limit 30] [--iterations 200] [--output result.json]
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+import orjson
+
+from app.core.github import parse_repositories
+from app.core.repo_index import RepoIndex, SORT_KEYS
+from benchmarks.fakes import make_repo
+
+SCENARIOS = [
+    {"name": "first page", "args": {}},
+    {"name": "search", "args": {"q": "synthetic 12"}},
+    {"name": "language by stars", "args": {"language": "Rust", "sort": "stars"}},
+    {"name": "name asc", "args": {"sort": "name", "order": "asc"}},
+]
+
+
+def _ms(fn: Callable[[], object], iterations: int) -> float:
+    fn()  # warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return round((time.process_time() - start) / iterations * 1000, 3)
+
+
+def _client_side(records, q=None, language=None, sort="updated", order="desc"):
+    """What a client does with the full list: filter by substring, then sort."""
+    repos = orjson.loads(orjson.dumps(records))
+    terms = (q or "").lower().split()
+    matched = [
+        r for r in repos
+        if (not language or (r["language"] or "").lower() == language.lower())
+        and all(t in f"{r['name']} {r['description'] or ''}".lower() for t in terms)
+    ]
+    field = {"stars": "stargazers_count", "updated": "updated_at", "name": "name"}[sort]
+    matched.sort(key=lambda r: r[field], reverse=order == "desc")
+    return matched
+
+
+def run(repos: int, limit: int, iterations: int) -> dict:
+    """Measure each scenario on both paths and return a JSON-serialisable report."""
+    records = parse_repositories(json.dumps([make_repo("jake", i) for i in range(repos)]).encode())
+
+    start = time.process_time()
+    index = RepoIndex(records)
+    build_ms = round((time.process_time() - start) * 1000, 3)
+
+    results = []
+    for scenario in SCENARIOS:
+        args = scenario["args"]
+        page = index.query(limit=limit, **args)
+        results.append({
+            "scenario": scenario["name"],
+            "matches": page["total"],
+            "baseline_cpu_ms": _ms(lambda: _client_side(records, **args), iterations),
+            "baseline_bytes": len(orjson.dumps(records)),
+            "indexed_cpu_ms": _ms(lambda: orjson.dumps(index.query(limit=limit, **args)), iterations),
+            "indexed_bytes": len(orjson.dumps(page)),
+        })
+
+    return {"repos": repos, "limit": limit, "iterations": iterations, "sorts": list(SORT_KEYS),
+            "index_build_ms": build_ms, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repos", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.repos, args.limit, args.iterations)
+    print(f"{args.repos} repos, page size {args.limit}, index build {report['index_build_ms']:.1f}ms")
+    for r in report["results"]:
+        print(f"{r['scenario']:<18} {r['matches']:>6} matches  "
+              f"baseline {r['baseline_cpu_ms']:>8.3f}ms {r['baseline_bytes'] / 1024:>8.0f} KB  "
+              f"indexed {r['indexed_cpu_ms']:>7.3f}ms {r['indexed_bytes'] / 1024:>6.1f} KB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
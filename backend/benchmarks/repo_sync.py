@@ -0,0 +1,155 @@
+"""
+Repo sync benchmark: incremental GitHub -> github_repositories sync for a
+large account against FakeGitHub and a local Postgres.
+
+Runs GitHubRepoSync directly (no HTTP layer) through these phases:
+- cold: first (full) sync, every page fetched and upserted
+- first incremental: since the newest stored repo, no ETag yet
+- unchanged: incremental with a matching ETag (one 304)
+- changed: incremental after --changed repos were updated on GitHub
+- full, unchanged: forced full sync; ON CONFLICT skips every row
+- cold cache: reading the snapshot from Postgres and indexing it, i.e.
+  what a cold cache costs now instead of a full crawl
+
+Usage (from backend/):
+    docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres -e POSTGRES_DB=appdb postgres:15-alpine
+    python -m benchmarks.repo_sync --init-schema [--repos 5000] [--changed 50] [--github-latency 0.05] [--output result.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable, Dict
+
+from benchmarks.fakes import FakeGitHub, FakeOpenBao
+from benchmarks.loadtest import init_schema
+
+BENCH_USERNAME = "sync_bench"
+BENCH_TOKEN = "ghp_" + "s" * 40
+
+
+async def _timed(fn: Callable[[], Awaitable[object]]) -> tuple:
+    start = time.perf_counter()
+    result = await fn()
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+async def drive(args: argparse.Namespace, github: FakeGitHub) -> Dict:
+    """Connect to the fakes/Postgres and run every sync phase."""
+    from sqlalchemy import text
+
+    from app.core.database import db_manager
+    from app.core.github_sync import github_repo_sync
+    from app.core.repo_index import RepoIndex
+    from app.core.vault import vault_client
+
+    await vault_client.connect()
+    await db_manager.connect()
+    try:
+        async with db_manager.get_session() as session:
+            user_id = (await session.execute(text(
+                "INSERT INTO users (username, email, password_hash) VALUES (:u, :e, 'x') "
+                "ON CONFLICT (username) DO UPDATE SET email = EXCLUDED.email RETURNING id"
+            ), {"u": BENCH_USERNAME, "e": f"{BENCH_USERNAME}@precinct99.nypd"})).scalar_one()
+            await session.execute(text("DELETE FROM github_repositories WHERE user_id = :id"), {"id": user_id})
+            await session.execute(text("DELETE FROM github_integrations WHERE user_id = :id"), {"id": user_id})
+            await session.execute(text(
+                "INSERT INTO github_integrations (user_id, is_configured, configured_at) VALUES (:id, true, now())"
+            ), {"id": user_id})
+            await session.commit()
+
+        async def sync():
+            return await github_repo_sync.sync(user_id, BENCH_TOKEN)
+
+        async def force_full():
+            async with db_manager.get_session() as session:
+                await session.execute(text(
+                    "UPDATE github_integrations SET repos_full_synced_at = NULL WHERE user_id = :id"
+                ), {"id": user_id})
+                await session.commit()
+            return await sync()
+
+        async def changed():
+            github.touch(args.changed)
+            return await sync()
+
+        async def cold_cache():
+            return len(RepoIndex(await github_repo_sync.load_snapshot(user_id)))
+
+        phases = [
+            ("cold", sync),
+            ("first incremental", sync),
+            ("unchanged", sync),
+            ("changed", changed),
+            ("full, unchanged", force_full),
+        ]
+        results = []
+        for name, fn in phases:
+            requests_before = github.requests
+            result, elapsed_ms = await _timed(fn)
+            results.append({"phase": name, "ms": elapsed_ms, "github_requests": github.requests - requests_before,
+                            **result})
+            print(f"{name:<18} {elapsed_ms:>9.1f}ms  {result['mode']:<11} pages {result['pages']:>3}  "
+                  f"upserted {result['upserted']:>5}  deleted {result['deleted']:>3}  "
+                  f"304 {str(result['not_modified']).lower()}")
+
+        repos, elapsed_ms = await _timed(cold_cache)
+        results.append({"phase": "cold cache", "ms": elapsed_ms, "github_requests": 0, "repos": repos})
+        print(f"{'cold cache':<18} {elapsed_ms:>9.1f}ms  snapshot read + index of {repos} repos")
+
+        return {"results": results, "github_not_modified": github.not_modified}
+    finally:
+        await db_manager.close()
+        await vault_client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repos", type=int, default=5000, help="Repositories on the fake account")
+    parser.add_argument("--changed", type=int, default=50, help="Repos updated before the 'changed' phase")
+    parser.add_argument("--github-latency", type=float, default=0.05, help="Seconds added to each GitHub call")
+    parser.add_argument("--db-host", default="127.0.0.1")
+    parser.add_argument("--db-port", type=int, default=5432)
+    parser.add_argument("--db-name", default="appdb")
+    parser.add_argument("--db-user", default="postgres")
+    parser.add_argument("--db-password", default="postgres")
+    parser.add_argument("--init-schema", action="store_true", help="Apply init-db.sql before the run")
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    openbao = FakeOpenBao(args.db_user, args.db_password)
+    openbao.start()
+    github = FakeGitHub(repo_count=args.repos, latency=args.github_latency)
+    github.start()
+
+    os.environ.update({
+        "VAULT_ADDR": openbao.url,
+        "VAULT_AUTH_METHOD": "token",
+        "GITHUB_API_URL": github.url,
+        "DB_HOST": args.db_host,
+        "DB_PORT": str(args.db_port),
+        "DB_NAME": args.db_name,
+        "LOG_LEVEL": "WARNING",
+    })
+
+    if args.init_schema:
+        asyncio.run(init_schema(args))
+
+    try:
+        # Settings are read at import time - drive() imports the app after env is set
+        report = asyncio.run(drive(args, github))
+    finally:
+        github.stop()
+        openbao.stop()
+
+    report["config"] = {k: v for k, v in vars(args).items() if k not in ("db_password", "output")}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
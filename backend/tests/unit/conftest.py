@@ -0,0 +1,57 @@
+"""
+Shared fixtures for unit tests (no SPIRE, OpenBao or PostgreSQL).
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+
+class FakeSession:
+    """
+    Stand-in for AsyncSession: query functions are patched, so it only
+    records commits and holds row locks until commit or close.
+    """
+
+    def __init__(self, readonly: bool = False):
+        self.readonly = readonly
+        self.commits = 0
+        self.locks: List[asyncio.Lock] = []
+
+    async def lock(self, lock: asyncio.Lock) -> None:
+        """Take a row lock (SELECT ... FOR UPDATE) held until commit or close."""
+        await lock.acquire()
+        self.locks.append(lock)
+
+    def _release(self) -> None:
+        while self.locks:
+            self.locks.pop().release()
+
+    async def commit(self) -> None:
+        self.commits += 1
+        self._release()
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._release()
+
+
+class FakeDatabaseManager:
+    """Stand-in for db_manager handing out FakeSessions."""
+
+    def __init__(self):
+        self.sessions: List[FakeSession] = []
+
+    def get_session(self, readonly: bool = False) -> FakeSession:
+        session = FakeSession(readonly)
+        self.sessions.append(session)
+        return session
+
+
+@pytest.fixture
+def fake_db() -> FakeDatabaseManager:
+    """A db_manager replacement; patch it into the module under test."""
+    return FakeDatabaseManager()
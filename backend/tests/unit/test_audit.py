@@ -0,0 +1,74 @@
+"""
+Tests for the batched audit writer's shutdown (app.core.audit).
+"""
+
+import asyncio
+
+import pytest
+
+import app.core.audit as audit
+from app.core.audit import AuditLogger
+
+
+@pytest.fixture
+def audit_table(monkeypatch, fake_db):
+    """Patch the audit queries; inserts take `delay` seconds (None = hang)."""
+    table = {"rows": [], "delay": 0.05}
+
+    async def insert_audit_events(session, batch):
+        if table["delay"] is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(table["delay"])
+        table["rows"].extend(batch)
+
+    async def maintain_audit_partitions(session, ahead, retention):
+        return []
+
+    monkeypatch.setattr(audit, "db_manager", fake_db)
+    monkeypatch.setattr(audit, "insert_audit_events", insert_audit_events)
+    monkeypatch.setattr(audit, "maintain_audit_partitions", maintain_audit_partitions)
+    return table
+
+
+def record(logger: AuditLogger, count: int) -> None:
+    for i in range(count):
+        logger.record(i, "login", ip_address="10.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_stop_finishes_the_batch_being_written(audit_table):
+    logger = AuditLogger(batch_size=2)
+    await logger.start()
+    record(logger, 5)
+    await asyncio.sleep(0.01)  # Writer is partway through its first insert
+
+    report = await logger.stop()
+
+    assert len(audit_table["rows"]) == 5
+    assert report == {"audit_events_dropped": 0}
+    stats = logger.get_stats()
+    assert stats["recorded"] == stats["written"] == 5 and stats["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_with_idle_writer(audit_table):
+    logger = AuditLogger()
+    await logger.start()
+
+    assert await logger.stop() == {"audit_events_dropped": 0}
+    assert not logger.get_stats()["running"]
+
+
+@pytest.mark.asyncio
+async def test_stuck_writer_reports_every_unwritten_event(audit_table):
+    audit_table["delay"] = None
+    logger = AuditLogger(batch_size=2)
+    await logger.start()
+    record(logger, 5)
+    await asyncio.sleep(0.01)
+
+    report = await logger.stop(drain_timeout=0.05)
+
+    assert audit_table["rows"] == []
+    assert report == {"audit_events_dropped": 5}
+    assert logger.get_stats()["dropped"] == 5
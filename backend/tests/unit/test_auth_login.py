@@ -0,0 +1,105 @@
+"""
+Tests for login against a lagging read replica (app.api.v1.auth).
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+import app.api.v1.auth as auth
+from app.core.password_hashing import BCRYPT, hash_with
+from app.models.schemas import UserLogin
+
+
+class Users:
+    """users table on the primary, plus the replica's (possibly stale) copy."""
+
+    def __init__(self):
+        self.primary = {}
+        self.replica = {}
+        self.reads = []
+        self.updates = []
+
+    def add(self, username, password_hash, replicated=True):
+        now = datetime.utcnow()
+        row = SimpleNamespace(id=len(self.primary) + 1, username=username, email=f"{username}@precinct99.com",
+                              password_hash=password_hash, created_at=now, updated_at=now)
+        self.primary[username] = row
+        if replicated:
+            self.replica[username] = SimpleNamespace(**vars(row))
+        return row
+
+    async def get_user_by_username(self, session, username):
+        self.reads.append("replica" if session.readonly else "primary")
+        return (self.replica if session.readonly else self.primary).get(username)
+
+    async def update_password_hash(self, session, user_id, password_hash):
+        self.updates.append(user_id)
+        next(r for r in self.primary.values() if r.id == user_id).password_hash = password_hash
+
+
+@pytest.fixture
+def users(monkeypatch, fake_db):
+    users = Users()
+
+    async def issue(user_id):
+        return "refresh-token"
+
+    monkeypatch.setattr(auth, "db_manager", fake_db)
+    monkeypatch.setattr(auth, "get_user_by_username", users.get_user_by_username)
+    monkeypatch.setattr(auth, "update_password_hash", users.update_password_hash)
+    monkeypatch.setattr(auth.refresh_token_store, "issue", issue)
+    monkeypatch.setattr(auth.password_hasher, "scheme", BCRYPT)
+    monkeypatch.setattr(auth.password_hasher, "cost", 5)
+    return users
+
+
+def request() -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/api/v1/auth/login", "headers": [],
+                    "client": ("127.0.0.1", 50000)})
+
+
+async def login(username, password):
+    return await auth.login(UserLogin(username=username, password=password), request(), Response())
+
+
+@pytest.mark.asyncio
+async def test_login_right_after_register_falls_back_to_primary(users):
+    users.add("jake", hash_with("Password123!", BCRYPT, 5), replicated=False)
+
+    result = await login("jake", "Password123!")
+
+    assert result.user.username == "jake"
+    assert users.reads == ["replica", "primary"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_user_is_rejected(users):
+    with pytest.raises(HTTPException) as exc:
+        await login("nobody", "Password123!")
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_replica_hit_does_not_touch_primary(users):
+    users.add("jake", hash_with("Password123!", BCRYPT, 5))
+
+    await login("jake", "Password123!")
+
+    assert users.reads == ["replica"]
+
+
+@pytest.mark.asyncio
+async def test_stale_replica_hash_is_not_rehashed_twice(users):
+    users.add("jake", hash_with("Password123!", BCRYPT, 4))  # Below the current cost
+
+    await login("jake", "Password123!")
+    assert users.updates == [1]
+    # The replica still serves the cost-4 hash; the primary already has the upgrade
+    await login("jake", "Password123!")
+
+    assert users.updates == [1]
+    assert users.primary["jake"].password_hash.startswith("$2b$05$")
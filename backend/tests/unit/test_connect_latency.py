@@ -0,0 +1,138 @@
+"""
+Tests for connect-latency sampling and summaries (app.core.connect_latency),
+against listeners on 127.0.0.1.
+"""
+
+import asyncio
+import socket
+
+import pytest
+import pytest_asyncio
+
+from app.core.connect_latency import connect_once, handshake_context, measure, percentiles
+
+HOST = "127.0.0.1"
+
+
+async def _close(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    writer.close()
+
+
+async def _refuse_tls(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer a PostgreSQL SSLRequest like a server without TLS."""
+    await reader.readexactly(8)
+    writer.write(b"N")
+    await writer.drain()
+    writer.close()
+
+
+async def _listen(handler) -> asyncio.AbstractServer:
+    return await asyncio.start_server(handler, HOST, 0)
+
+
+def _port(server: asyncio.AbstractServer) -> int:
+    return server.sockets[0].getsockname()[1]
+
+
+@pytest_asyncio.fixture
+async def plain_port():
+    server = await _listen(_close)
+    yield _port(server)
+    server.close()
+    await server.wait_closed()
+
+
+@pytest_asyncio.fixture
+async def refusing_port():
+    server = await _listen(_refuse_tls)
+    yield _port(server)
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.fixture
+def closed_port():
+    """A port nothing listens on (bound once to pick it, then released)."""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_connect_once_plain_listener(plain_port):
+    connect_ms, handshake_ms, error = await connect_once(HOST, plain_port, timeout=2.0)
+
+    assert connect_ms is not None and connect_ms >= 0
+    assert handshake_ms is None and error is None
+
+
+@pytest.mark.asyncio
+async def test_connect_once_tls_refused(refusing_port):
+    connect_ms, handshake_ms, error = await connect_once(
+        HOST, refusing_port, timeout=2.0, tls=handshake_context(), postgres=True
+    )
+
+    assert connect_ms is not None
+    assert handshake_ms is None and error == "tls_refused"
+
+
+@pytest.mark.asyncio
+async def test_connect_once_closed_port(closed_port):
+    assert await connect_once(HOST, closed_port, timeout=2.0) == (None, None, "ConnectionRefusedError")
+
+
+@pytest.mark.asyncio
+async def test_measure_plain_listener(plain_port):
+    result = await measure(HOST, plain_port, sequential=5, concurrent=3, timeout=2.0)
+
+    assert result["tls"] is False
+    for phase, attempts in (("sequential", 5), ("concurrent", 3)):
+        summary = result[phase]
+        assert summary["attempts"] == attempts
+        assert summary["failures"] == 0 and summary["connect_failures"] == 0
+        assert summary["failure_rate"] == 0.0 and summary["errors"] == {}
+        assert summary["connect"]["p50_ms"] is not None
+        assert "handshake" not in summary
+
+
+@pytest.mark.asyncio
+async def test_measure_tls_refused(refusing_port):
+    result = await measure(HOST, refusing_port, sequential=4, concurrent=2, timeout=2.0,
+                           tls=handshake_context(), postgres=True)
+
+    for phase, attempts in (("sequential", 4), ("concurrent", 2)):
+        summary = result[phase]
+        assert summary["attempts"] == attempts
+        assert summary["failures"] == attempts and summary["failure_rate"] == 1.0
+        assert summary["connect_failures"] == 0  # The TCP connect itself succeeded
+        assert summary["errors"] == {"tls_refused": attempts}
+        assert summary["connect"]["p50_ms"] is not None
+        assert summary["handshake"]["p50_ms"] is None
+
+
+@pytest.mark.asyncio
+async def test_measure_closed_port(closed_port):
+    result = await measure(HOST, closed_port, sequential=3, concurrent=2, timeout=2.0)
+
+    for phase, attempts in (("sequential", 3), ("concurrent", 2)):
+        summary = result[phase]
+        assert summary["attempts"] == attempts
+        assert summary["failures"] == attempts and summary["connect_failures"] == attempts
+        assert summary["errors"] == {"ConnectionRefusedError": attempts}
+        assert summary["connect"]["p50_ms"] is None
+
+
+def test_nearest_rank_percentiles():
+    result = percentiles([float(v) for v in range(100, 0, -1)])  # 1..100, unsorted
+
+    assert result == {"p50_ms": 50.0, "p95_ms": 95.0, "p99_ms": 99.0, "max_ms": 100.0}
+
+
+def test_small_samples_round_rank_up():
+    assert percentiles([1.0, 2.0, 3.0])["p50_ms"] == 2.0
+    assert percentiles([1.0, 2.0, 3.0, 4.0])["p50_ms"] == 2.0
+    assert percentiles([7.0])["p99_ms"] == 7.0
+
+
+def test_empty():
+    assert set(percentiles([]).values()) == {None}
@@ -0,0 +1,208 @@
+"""
+Tests for the lease renew/rotate scheduler in ManagedEngine (app.core.database).
+
+Vault, the lease revoker and the engines are fakes; the scheduler's jitter
+is scaled down so a lease "TTL" of a few seconds plays out in milliseconds.
+"""
+
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+import app.core.database as database
+from app.core.database import ManagedEngine
+
+# Scheduler delays are divided by this (a 60s TTL -> ~40ms to the first action)
+TIME_SCALE = 1000
+
+
+class FakeVault:
+    """Issues numbered leases; renewals grant whatever is queued in `grants`."""
+
+    def __init__(self, lease_duration: int = 60, renewable: bool = True):
+        self.lease_duration = lease_duration
+        self.renewable = renewable
+        self.grants = []  # Durations granted by successive renewals (default: full TTL)
+        self.fail_renewals = 0
+        self.issued = []
+        self.renewed = []
+        self._ids = itertools.count(1)
+
+    async def get_database_credentials(self, role: str):
+        n = next(self._ids)
+        lease_id = f"database/creds/{role}/lease-{n:04d}"
+        self.issued.append(lease_id)
+        return {"username": f"v-user-{n}", "password": "secret", "lease_id": lease_id,
+                "lease_duration": self.lease_duration, "renewable": self.renewable}
+
+    async def renew_lease(self, lease_id: str, increment: int):
+        if self.fail_renewals:
+            self.fail_renewals -= 1
+            raise RuntimeError("vault unavailable")
+        self.renewed.append(lease_id)
+        granted = self.grants.pop(0) if self.grants else increment
+        return {"lease_id": lease_id, "lease_duration": granted, "renewable": True}
+
+
+class FakeRevoker:
+    def __init__(self):
+        self.released = []
+
+    def release(self, lease_id, expires_at=None):
+        self.released.append(lease_id)
+
+
+class FakeConnection:
+    async def execute(self, *args):
+        return None
+
+
+class FakeEngine:
+    def __init__(self, username: str, fail_connect: bool = False, fail_dispose: bool = False):
+        self.username = username
+        self.fail_connect = fail_connect
+        self.fail_dispose = fail_dispose
+        self.disposed = False
+
+    def begin(self):
+        return self
+
+    async def __aenter__(self):
+        if self.fail_connect:
+            raise ConnectionError("connection refused")
+        return FakeConnection()
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def dispose(self):
+        self.disposed = True
+        if self.fail_dispose:
+            raise OSError("close failed")
+
+
+@pytest.fixture
+def env(monkeypatch):
+    vault, revoker, engines = FakeVault(), FakeRevoker(), []
+    failures = {"connect": set(), "dispose": set()}
+
+    def create_engine(self, username, password):
+        engine = FakeEngine(username, username in failures["connect"], username in failures["dispose"])
+        engines.append(engine)
+        return engine
+
+    monkeypatch.setattr(database, "vault_client", vault)
+    monkeypatch.setattr(database, "lease_revoker", revoker)
+    monkeypatch.setattr(database.settings, "DB_WARMUP_CONNECTIONS", 0)
+    monkeypatch.setattr(database.settings, "DB_ROTATION_RETRY_BASE", 5)
+    monkeypatch.setattr(ManagedEngine, "_create_engine", create_engine)
+    monkeypatch.setattr(ManagedEngine, "_jitter", staticmethod(lambda delay: delay / TIME_SCALE))
+    return SimpleNamespace(vault=vault, revoker=revoker, engines=engines, failures=failures)
+
+
+@pytest_asyncio.fixture
+async def engine(env):
+    managed = ManagedEngine("primary", "db", 5432, "backend-role")
+    yield managed
+    if managed._rotation_task:
+        managed._rotation_task.cancel()
+        await asyncio.gather(managed._rotation_task, return_exceptions=True)
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_first_action_after_renew_fraction_of_ttl(env, monkeypatch, engine):
+    monkeypatch.setattr(ManagedEngine, "_jitter", staticmethod(lambda delay: delay))
+    env.vault.lease_duration = 3600
+    await engine.connect()
+
+    delay = engine._next_lease_action_delay(failures=0)
+
+    assert delay == pytest.approx(3600 * database.settings.DB_LEASE_RENEW_FRACTION, rel=0.01)
+    assert engine.get_lease_info()["next_action"] == "renew"
+
+
+@pytest.mark.asyncio
+async def test_renews_until_capped_then_rotates(env, engine):
+    env.vault.grants = [60, 20]  # Second renewal clipped by max_ttl
+    await engine.connect()
+    first_lease, first_engine = engine.lease_id, engine.engine
+
+    await wait_until(lambda: len(env.vault.issued) == 2)
+
+    assert env.vault.renewed == [first_lease, first_lease]
+    assert engine.lease_id == env.vault.issued[1]
+    assert engine.engine is not first_engine and first_engine.disposed
+    assert env.revoker.released == [first_lease]
+
+
+@pytest.mark.asyncio
+async def test_non_renewable_lease_is_rotated(env, engine):
+    env.vault.renewable = False
+    await engine.connect()
+
+    await wait_until(lambda: len(env.vault.issued) == 3)
+
+    assert env.vault.renewed == []
+    assert env.revoker.released[:2] == env.vault.issued[:2]
+
+
+@pytest.mark.asyncio
+async def test_failed_renewal_is_retried_as_rotation(env, engine):
+    env.vault.fail_renewals = 1
+    await engine.connect()
+    first_lease = engine.lease_id
+
+    await wait_until(lambda: len(env.vault.issued) == 2)
+
+    assert env.vault.renewed == []
+    assert env.revoker.released == [first_lease]
+    assert engine.healthy
+
+
+@pytest.mark.asyncio
+async def test_manual_rotation_reschedules(env, monkeypatch, engine):
+    monkeypatch.setattr(ManagedEngine, "_jitter", staticmethod(lambda delay: delay))
+    await engine.connect()
+
+    await engine.rotate_credentials()
+    await asyncio.sleep(0.01)  # Scheduler wakes and re-arms for the new lease
+
+    assert env.vault.renewed == []
+    assert engine.get_lease_info()["seconds_remaining"] == pytest.approx(60, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_old_lease_released_when_dispose_fails(env, engine):
+    env.failures["dispose"].add("v-user-1")
+    await engine.connect()
+    old_lease = engine.lease_id
+
+    await engine.rotate_credentials()
+
+    assert env.revoker.released == [old_lease]
+    assert engine.lease_id == env.vault.issued[1]
+    assert engine.engine.username == "v-user-2"
+
+
+@pytest.mark.asyncio
+async def test_failed_rotation_keeps_old_engine_and_releases_new_lease(env, engine):
+    env.failures["connect"].add("v-user-2")
+    await engine.connect()
+    old_lease, old_engine = engine.lease_id, engine.engine
+
+    with pytest.raises(ConnectionError):
+        await engine.rotate_credentials()
+
+    assert engine.lease_id == old_lease and engine.engine is old_engine
+    assert not old_engine.disposed
+    assert env.engines[1].disposed
+    assert env.revoker.released == [env.vault.issued[1]]
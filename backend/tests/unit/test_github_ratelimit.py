@@ -0,0 +1,79 @@
+"""
+Tests for the per-token GitHub rate-limit scheduler (app.core.github_ratelimit).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import app.core.github_ratelimit as github_ratelimit
+from app.core.github_ratelimit import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, GitHubRateLimiter, QuotaExhausted
+
+
+@pytest.fixture
+def one_slot_per_token(monkeypatch):
+    monkeypatch.setattr(github_ratelimit.settings, "GITHUB_MAX_CONCURRENCY_PER_TOKEN", 1)
+
+
+def below_background_reserve(limiter: GitHubRateLimiter, token: str) -> None:
+    """Leave interactive headroom only: background requests must wait for the reset."""
+    quota = limiter._quota(token, user_id=1)
+    quota.limit, quota.remaining, quota.reset_at = 100, 10, time.time() + 5
+
+
+@pytest.mark.asyncio
+async def test_delayed_background_request_does_not_hold_the_slot(one_slot_per_token):
+    limiter = GitHubRateLimiter()
+    below_background_reserve(limiter, "token")
+
+    async def background():
+        async with limiter.slot("token", priority=PRIORITY_BACKGROUND):
+            pass
+
+    held_back = asyncio.ensure_future(background())
+    await asyncio.sleep(0.01)
+    try:
+        async with asyncio.timeout(1):
+            async with limiter.slot("token", priority=PRIORITY_INTERACTIVE) as quota:
+                assert quota.inflight == 1
+        assert not held_back.done()
+    finally:
+        held_back.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await held_back
+
+
+@pytest.mark.asyncio
+async def test_request_past_its_wait_budget_is_rejected(one_slot_per_token, monkeypatch):
+    monkeypatch.setattr(github_ratelimit.settings, "GITHUB_RATELIMIT_BACKGROUND_MAX_WAIT", 1.0)
+    limiter = GitHubRateLimiter()
+    below_background_reserve(limiter, "token")
+
+    with pytest.raises(QuotaExhausted):
+        async with limiter.slot("token", priority=PRIORITY_BACKGROUND):
+            pass
+    assert limiter._quota("token", None).slots.try_acquire()  # Slot never taken
+
+
+@pytest.mark.asyncio
+async def test_slot_waiters_are_served_interactive_first(one_slot_per_token):
+    limiter = GitHubRateLimiter()
+    order = []
+    release = asyncio.Event()
+
+    async def request(name, priority):
+        async with limiter.slot("token", priority=priority):
+            order.append(name)
+            if name == "first":
+                await release.wait()
+
+    first = asyncio.ensure_future(request("first", PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+    waiters = [asyncio.ensure_future(request("background", PRIORITY_BACKGROUND)),
+               asyncio.ensure_future(request("interactive", PRIORITY_INTERACTIVE))]
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(first, *waiters)
+
+    assert order == ["first", "interactive", "background"]
@@ -0,0 +1,138 @@
+"""
+Tests for token generations in the GitHub repo sync and cache
+(app.core.github_sync, app.core.github_cache): work started with a replaced
+token must not be written or cached.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import app.core.github_cache as github_cache_module
+import app.core.github_sync as github_sync_module
+from app.core.github import RepoPage, RepoRecord
+from app.core.github_cache import REPOS, GitHubCache
+from app.core.github_sync import GitHubRepoSync
+
+
+def repo(repo_id: int) -> RepoRecord:
+    return RepoRecord(
+        id=repo_id, name=f"repo-{repo_id}", full_name=f"jake/repo-{repo_id}", description=None, private=False,
+        html_url=f"https://github.com/jake/repo-{repo_id}", created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-03-01T00:00:00Z", language="Python", stargazers_count=0, forks_count=0,
+    )
+
+
+@pytest.fixture
+def repo_sync(monkeypatch, fake_db):
+    """A GitHubRepoSync over an in-memory table, with GitHub held until `release` is set."""
+    repo_sync = GitHubRepoSync()
+    table = SimpleNamespace(upserted=[], states=[], release=asyncio.Event(), tokens=[])
+
+    async def fetch_repository_page(token, page, since=None, etag=None, user_id=None, priority=None):
+        table.tokens.append(token)
+        await table.release.wait()
+        return RepoPage([repo(1), repo(2)], '"etag"', has_next=False)
+
+    async def get_github_sync_state(session, user_id):
+        return None
+
+    async def upsert_github_repositories(session, rows):
+        table.upserted.extend(rows)
+
+    async def delete_github_repositories_except(session, user_id, repo_ids):
+        return 0
+
+    async def update_github_sync_state(session, user_id, etag, since, synced_at, full_synced_at):
+        table.states.append(etag)
+
+    monkeypatch.setattr(github_sync_module, "db_manager", fake_db)
+    monkeypatch.setattr(github_sync_module.github_client, "fetch_repository_page", fetch_repository_page)
+    monkeypatch.setattr(github_sync_module, "get_github_sync_state", get_github_sync_state)
+    monkeypatch.setattr(github_sync_module, "upsert_github_repositories", upsert_github_repositories)
+    monkeypatch.setattr(github_sync_module, "delete_github_repositories_except", delete_github_repositories_except)
+    monkeypatch.setattr(github_sync_module, "update_github_sync_state", update_github_sync_state)
+    monkeypatch.setattr(github_cache_module, "github_repo_sync", repo_sync)
+    repo_sync.table = table
+    return repo_sync
+
+
+@pytest.mark.asyncio
+async def test_sync_with_replaced_token_writes_nothing(repo_sync, fake_db):
+    old = asyncio.ensure_future(repo_sync.sync(7, "old-token"))
+    await asyncio.sleep(0)
+
+    repo_sync.token_changed(7)
+    repo_sync.table.release.set()
+    result = await old
+
+    assert result["discarded"] and result["upserted"] == 0
+    assert repo_sync.table.upserted == []
+    assert sum(session.commits for session in fake_db.sessions) == 0
+    assert repo_sync.get_stats()["discarded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_after_token_change_is_not_coalesced_with_old_one(repo_sync):
+    old = asyncio.ensure_future(repo_sync.sync(7, "old-token"))
+    await asyncio.sleep(0)
+    repo_sync.token_changed(7)
+
+    new = asyncio.ensure_future(repo_sync.sync(7, "new-token"))
+    await asyncio.sleep(0)
+    repo_sync.table.release.set()
+    old_result, new_result = await asyncio.gather(old, new)
+
+    assert repo_sync.table.tokens == ["old-token", "new-token"]
+    assert old_result["discarded"] and not new_result["discarded"]
+    assert [row["repo_id"] for row in repo_sync.table.upserted] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_sync_with_current_token_writes(repo_sync):
+    repo_sync.table.release.set()
+
+    result = await repo_sync.sync(7, "token")
+
+    assert not result["discarded"] and result["upserted"] == 2
+    assert repo_sync.table.states == [None]  # Full sync: no ETag for the next request
+
+
+@pytest.mark.asyncio
+async def test_cache_drops_fetch_started_before_invalidate(repo_sync):
+    cache = GitHubCache()
+    release = asyncio.Event()
+    tokens = []
+
+    def fetch(token):
+        async def call():
+            tokens.append(token)
+            await release.wait()
+            return token
+        return call
+
+    generation = cache.generation(7)
+    old = asyncio.ensure_future(cache.fetch(7, REPOS, fetch("old-token"), generation))
+    await asyncio.sleep(0)
+    cache.invalidate(7)
+    new = asyncio.ensure_future(cache.fetch(7, REPOS, fetch("new-token")))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(old, new) == ["old-token", "new-token"]
+    assert tokens == ["old-token", "new-token"]  # Not coalesced across the token change
+    assert cache.get(7, REPOS) == "new-token"
+
+
+@pytest.mark.asyncio
+async def test_cache_put_with_replaced_generation_is_ignored(repo_sync):
+    cache = GitHubCache()
+    generation = cache.generation(7)
+
+    cache.invalidate(7)
+    cache.put(7, REPOS, "old-index", generation)  # e.g. a slow sync re-caching its index
+
+    assert cache.get(7, REPOS) is None
+    cache.put(7, REPOS, "new-index", cache.generation(7))
+    assert cache.get(7, REPOS) == "new-index"
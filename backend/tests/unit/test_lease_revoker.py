@@ -0,0 +1,95 @@
+"""
+Tests for the background lease revocation queue (app.core.lease_revoker).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import app.core.lease_revoker as lease_revoker_module
+from app.core.lease_revoker import LeaseRevoker
+
+
+class FakeVault:
+    def __init__(self):
+        self.revoked = []
+        self.failing = set()
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def revoke_lease(self, lease_id):
+        await self.gate.wait()
+        if lease_id in self.failing:
+            raise RuntimeError("vault unavailable")
+        self.revoked.append(lease_id)
+
+
+@pytest.fixture
+def vault(monkeypatch):
+    vault = FakeVault()
+    monkeypatch.setattr(lease_revoker_module, "vault_client", vault)
+    return vault
+
+
+def read_journal(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_release_does_not_write_the_journal_inline(vault, tmp_path, monkeypatch):
+    journal = tmp_path / "leases.json"
+    revoker = LeaseRevoker(journal_path=str(journal))
+
+    def no_disk_on_loop(*args):
+        raise AssertionError("journal written on the event loop")
+
+    monkeypatch.setattr(revoker, "_save_journal", no_disk_on_loop)
+    revoker.release("lease-1", expires_at=None)
+    assert not journal.exists()
+
+
+@pytest.mark.asyncio
+async def test_journal_holds_leases_until_revoked(vault, tmp_path):
+    journal = tmp_path / "leases.json"
+    revoker = LeaseRevoker(journal_path=str(journal))
+    vault.gate.clear()  # Hold revocations in flight
+    await revoker.start()
+
+    revoker.release("lease-1", expires_at=None)
+    await wait_until(journal.exists)
+    assert read_journal(journal) == {"lease-1": None}
+
+    vault.gate.set()
+    await wait_until(lambda: read_journal(journal) == {})
+    assert vault.revoked == ["lease-1"]
+    await revoker.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_revocations_survive_a_restart(vault, tmp_path, monkeypatch):
+    monkeypatch.setattr(lease_revoker_module.settings, "LEASE_REVOKE_RETRY_BASE", 60)
+    journal = tmp_path / "leases.json"
+    vault.failing.add("lease-2")
+    revoker = LeaseRevoker(journal_path=str(journal))
+    await revoker.start()
+    revoker.release("lease-1", expires_at=None)
+    revoker.release("lease-2", expires_at=None)
+    await wait_until(lambda: revoker.get_stats()["failures"] == 1)
+
+    await revoker.stop(drain_timeout=0.1)  # lease-2 fails again
+    assert read_journal(journal) == {"lease-2": None}
+
+    vault.failing.clear()
+    restarted = LeaseRevoker(journal_path=str(journal))
+    await restarted.start()
+    await wait_until(lambda: "lease-2" in vault.revoked)
+    await restarted.stop()
+    assert read_journal(journal) == {}
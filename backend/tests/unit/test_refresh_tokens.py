@@ -0,0 +1,164 @@
+"""
+Tests for rotating refresh tokens and reuse detection (app.core.refresh_tokens).
+"""
+
+import asyncio
+import itertools
+from collections import defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import app.core.refresh_tokens as refresh_tokens
+from app.core.refresh_tokens import RefreshTokenError, RefreshTokenStore, hash_refresh_token
+
+
+class RefreshTokenTable:
+    """
+    In-memory refresh_tokens table behind the patched query functions.
+
+    get_refresh_token_for_update takes a per-row lock held by the session
+    until commit or close, like SELECT ... FOR UPDATE.
+    """
+
+    def __init__(self):
+        self.rows = {}  # token_hash -> row namespace
+        self.locks = defaultdict(asyncio.Lock)
+        self._ids = itertools.count(1)
+
+    async def get_for_update(self, session, token_hash):
+        await session.lock(self.locks[token_hash])
+        await asyncio.sleep(0)  # Let a racing request reach the lock
+        row = self.rows.get(token_hash)
+        return SimpleNamespace(**vars(row)) if row else None
+
+    async def insert(self, session, user_id, token_hash, family_id, parent_id, now, expires_at):
+        self.rows[token_hash] = SimpleNamespace(
+            token_id=next(self._ids), id=user_id, family_id=family_id, parent_id=parent_id,
+            expires_at=expires_at, rotated_at=None, revoked_at=None,
+        )
+
+    async def mark_rotated(self, session, token_id, now):
+        self._by_id(token_id).rotated_at = now
+
+    async def revoke_family(self, session, family_id, now):
+        live = [r for r in self.rows.values() if r.family_id == family_id and r.revoked_at is None]
+        for row in live:
+            row.revoked_at = now
+        return len(live)
+
+    async def delete_expired(self, session, user_id, now):
+        return 0
+
+    def _by_id(self, token_id):
+        return next(r for r in self.rows.values() if r.token_id == token_id)
+
+    def row(self, token):
+        return self.rows[hash_refresh_token(token)]
+
+
+@pytest.fixture
+def table(monkeypatch, fake_db):
+    table = RefreshTokenTable()
+    monkeypatch.setattr(refresh_tokens, "db_manager", fake_db)
+    monkeypatch.setattr(refresh_tokens, "get_refresh_token_for_update", table.get_for_update)
+    monkeypatch.setattr(refresh_tokens, "insert_refresh_token", table.insert)
+    monkeypatch.setattr(refresh_tokens, "mark_refresh_token_rotated", table.mark_rotated)
+    monkeypatch.setattr(refresh_tokens, "revoke_refresh_token_family", table.revoke_family)
+    monkeypatch.setattr(refresh_tokens, "delete_expired_refresh_tokens", table.delete_expired)
+    return table
+
+
+@pytest.mark.asyncio
+async def test_rotate_issues_successor_in_same_family(table):
+    store = RefreshTokenStore()
+    token = await store.issue(user_id=7)
+
+    new_token, user = await store.rotate(token)
+
+    assert user.id == 7
+    assert new_token != token
+    assert table.row(new_token).family_id == table.row(token).family_id
+    assert table.row(new_token).parent_id == table.row(token).token_id
+    assert table.row(token).rotated_at is not None
+    assert (await store.rotate(new_token))[1].id == 7
+
+
+@pytest.mark.asyncio
+async def test_replay_after_grace_window_revokes_family(table):
+    store = RefreshTokenStore()
+    token = await store.issue(user_id=7)
+    successor, _ = await store.rotate(token)
+    # The rotation happened longer ago than the grace window
+    table.row(token).rotated_at -= timedelta(seconds=refresh_tokens.settings.JWT_REFRESH_REUSE_GRACE_SECONDS + 1)
+
+    with pytest.raises(RefreshTokenError, match="reuse"):
+        await store.rotate(token)
+
+    assert table.row(successor).revoked_at is not None
+    with pytest.raises(RefreshTokenError):
+        await store.rotate(successor)  # The thief's (or victim's) successor is dead too
+    assert store.get_stats()["reuse_detected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_inside_grace_window_keeps_family(table):
+    store = RefreshTokenStore()
+    token = await store.issue(user_id=7)
+    successor, _ = await store.rotate(token)
+
+    with pytest.raises(RefreshTokenError, match="already used"):
+        await store.rotate(token)
+
+    assert table.row(successor).revoked_at is None
+    await store.rotate(successor)
+    assert store.get_stats()["reuse_detected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_double_rotate_succeeds_once(table):
+    store = RefreshTokenStore()
+    token = await store.issue(user_id=7)
+
+    results = await asyncio.gather(store.rotate(token), store.rotate(token), return_exceptions=True)
+
+    successes = [r for r in results if not isinstance(r, BaseException)]
+    failures = [r for r in results if isinstance(r, BaseException)]
+    assert len(successes) == 1
+    assert len(failures) == 1 and isinstance(failures[0], RefreshTokenError)
+    assert "already used" in str(failures[0])
+    successor, _ = successes[0]
+    assert table.row(successor).revoked_at is None  # A racing tab isn't treated as theft
+    assert sum(1 for r in table.rows.values() if r.parent_id == table.row(token).token_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_logout_revoke_invalidates_family(table):
+    store = RefreshTokenStore()
+    token = await store.issue(user_id=7)
+    successor, _ = await store.rotate(token)
+    other_login = await store.issue(user_id=7)
+
+    assert await store.revoke(successor) == 2  # Both tokens of the family
+
+    with pytest.raises(RefreshTokenError, match="Invalid"):
+        await store.rotate(successor)
+    with pytest.raises(RefreshTokenError):
+        await store.rotate(token)
+    assert table.row(other_login).revoked_at is None  # Other sessions survive
+
+
+@pytest.mark.asyncio
+async def test_revoke_unknown_token_is_noop(table):
+    assert await RefreshTokenStore().revoke("not-a-token") == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_rejected(table):
+    store = RefreshTokenStore()
+    token = await store.issue(user_id=7)
+    table.row(token).expires_at = datetime.utcnow() - timedelta(seconds=1)
+
+    with pytest.raises(RefreshTokenError, match="Invalid or expired"):
+        await store.rotate(token)
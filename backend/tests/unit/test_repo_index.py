@@ -0,0 +1,126 @@
+"""
+Tests for the repo search index and its keyset cursor (app.core.repo_index).
+"""
+
+import base64
+
+import orjson
+import pytest
+
+from app.core.github import RepoRecord
+from app.core.repo_index import ORDERS, SORT_KEYS, RepoIndex, decode_cursor, encode_cursor
+
+
+def repo(repo_id: int, name: str, stars: int, updated_at: str, language: str = "Python",
+         description: str = None) -> RepoRecord:
+    return RepoRecord(
+        id=repo_id, name=name, full_name=f"jake/{name}", description=description, private=False,
+        html_url=f"https://github.com/jake/{name}", created_at="2024-01-01T00:00:00Z",
+        updated_at=updated_at, language=language, stargazers_count=stars, forks_count=0,
+    )
+
+
+@pytest.fixture
+def records():
+    """Repos with many ties on stars, updated_at and (case-insensitive) name; ids out of order."""
+    stamps = ["2024-03-01T00:00:00Z", "2024-02-01T00:00:00Z", "2024-03-01T00:00:00Z"]
+    return [
+        repo(repo_id=(i * 37) % 101 + 1, name=f"Repo-{i % 7}" if i % 2 else f"repo-{i % 7}",
+             stars=i % 4, updated_at=stamps[i % 3], language="Go" if i % 5 == 0 else "Python",
+             description="vault helper" if i % 3 == 0 else None)
+        for i in range(40)
+    ]
+
+
+def walk(index: RepoIndex, limit: int, cursor: str = None, **query):
+    """Follow next_cursor to the end, returning every page."""
+    pages = []
+    while True:
+        page = index.query(limit=limit, cursor=cursor, **query)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def expected_ids(records, sort: str, order: str):
+    key = SORT_KEYS[sort]
+    ordered = sorted(records, key=lambda r: (key(r), r.id), reverse=order == "desc")
+    return [r.id for r in ordered]
+
+
+@pytest.mark.parametrize("sort", sorted(SORT_KEYS))
+@pytest.mark.parametrize("order", ORDERS)
+@pytest.mark.parametrize("limit", [1, 3, 7, 40, 100])
+def test_paging_visits_every_repo_once_in_order(records, sort, order, limit):
+    index = RepoIndex(records)
+
+    pages = walk(index, limit, sort=sort, order=order)
+
+    ids = [r.id for page in pages for r in page["items"]]
+    assert ids == expected_ids(records, sort, order)
+    assert len(set(ids)) == len(records)
+    assert all(len(page["items"]) == limit for page in pages[:-1])
+    assert all(page["total"] == len(records) for page in pages)
+
+
+@pytest.mark.parametrize("order", ORDERS)
+def test_paging_with_filters(records, order):
+    index = RepoIndex(records)
+
+    pages = walk(index, 2, q="vault hel", language="python", sort="stars", order=order)
+
+    matching = [r for r in records if r.description and r.language == "Python"]
+    assert [r.id for page in pages for r in page["items"]] == expected_ids(matching, "stars", order)
+    assert pages[0]["total"] == len(matching)
+
+
+@pytest.mark.parametrize("order", ORDERS)
+def test_cursor_survives_inserts_before_it(records, order):
+    first = RepoIndex(records).query(sort="stars", order=order, limit=10)
+    # A tie with the last item of the first page, sorting before it
+    last = first["items"][-1]
+    inserted = repo(0, "new", last.stargazers_count, last.updated_at)
+    reindexed = RepoIndex(records + [inserted])
+
+    rest = walk(reindexed, 10, cursor=first["next_cursor"], sort="stars", order=order)
+    seen = [r.id for r in first["items"]] + [r.id for page in rest for r in page["items"]]
+
+    # Id 0 sorts before its tie: in asc order it lands on the page already read
+    expected = expected_ids(records + [inserted], "stars", order)
+    if order == "asc":
+        expected.remove(0)
+    assert seen == expected
+
+
+def test_empty_and_unmatched_queries(records):
+    assert RepoIndex([]).query() == {"items": [], "next_cursor": None, "total": 0}
+    assert RepoIndex(records).query(q="nothing-like-this")["total"] == 0
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("stars", "desc", 3, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "stars", "desc") == (3, 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(orjson.dumps(["stars", "desc", 3])).decode(),  # Too short
+    base64.urlsafe_b64encode(orjson.dumps({"sort": "stars"})).decode(),
+    encode_cursor("stars", "desc", 3, "42"),  # Non-integer repo id
+    encode_cursor("name", "desc", "repo-1", 42),  # Other sort
+    encode_cursor("stars", "asc", 3, 42),  # Other order
+    encode_cursor("stars", "desc", "three", 42),  # Value of the wrong type
+])
+def test_malformed_cursors_are_rejected(records, cursor):
+    with pytest.raises(ValueError):
+        RepoIndex(records).query(sort="stars", order="desc", cursor=cursor)
+
+
+def test_unknown_sort_or_order_is_rejected(records):
+    with pytest.raises(ValueError):
+        RepoIndex(records).query(sort="forks")
+    with pytest.raises(ValueError):
+        RepoIndex(records).query(order="sideways")
@@ -0,0 +1,239 @@
+"""
+Tests for the circuit breaker and hedging in app.core.resilience.
+"""
+
+import asyncio
+
+import pytest
+
+import app.core.resilience as resilience
+from app.core.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, DependencyGuard
+
+
+class Unavailable(Exception):
+    """A dependency failure (counts against the breaker)."""
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the breaker."""
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_guard(**kwargs) -> DependencyGuard:
+    options = dict(
+        name="test", is_failure=lambda e: isinstance(e, Unavailable),
+        failure_threshold=3, recovery_timeout=30.0, max_retries=0, retry_base=0.0,
+    )
+    options.update(kwargs)
+    return DependencyGuard(**options)
+
+
+async def fail():
+    raise Unavailable()
+
+
+async def succeed():
+    return "ok"
+
+
+# =============================================================================
+# Circuit breaker
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_consecutive_failures(clock):
+    guard = make_guard()
+
+    for _ in range(3):
+        assert guard.breaker.state == CLOSED
+        with pytest.raises(Unavailable):
+            await guard.call(fail)
+
+    assert guard.breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        await guard.call(succeed)
+    assert guard.breaker.counters == {"opened": 1, "rejected": 1}
+
+
+@pytest.mark.asyncio
+async def test_success_resets_failure_count(clock):
+    guard = make_guard()
+
+    for _ in range(2):
+        with pytest.raises(Unavailable):
+            await guard.call(fail)
+    assert await guard.call(succeed) == "ok"
+    for _ in range(2):
+        with pytest.raises(Unavailable):
+            await guard.call(fail)
+
+    assert guard.breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_non_failure_errors_do_not_open_breaker(clock):
+    guard = make_guard(failure_threshold=1)
+
+    async def not_found():
+        raise KeyError("404")
+
+    with pytest.raises(KeyError):
+        await guard.call(not_found)
+    assert guard.breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_success_closes(clock):
+    guard = make_guard(failure_threshold=1)
+    with pytest.raises(Unavailable):
+        await guard.call(fail)
+
+    clock[0] += 29
+    assert guard.breaker.get_state() == OPEN
+    clock[0] += 1
+    assert guard.breaker.get_state() == HALF_OPEN
+
+    assert await guard.call(succeed) == "ok"
+    assert guard.breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_failure_reopens(clock):
+    guard = make_guard(failure_threshold=1)
+    with pytest.raises(Unavailable):
+        await guard.call(fail)
+    clock[0] += 30
+
+    with pytest.raises(Unavailable):
+        await guard.call(fail)
+
+    assert guard.breaker.state == OPEN
+    assert guard.breaker.counters["opened"] == 2
+    with pytest.raises(CircuitOpenError):
+        await guard.call(succeed)
+
+
+def test_half_open_admits_one_probe_at_a_time(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=30.0)
+    breaker.on_failure()
+    clock[0] += 30
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.on_abandoned()  # Probe cancelled - the next call may probe
+    breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_half_open_slot(clock):
+    guard = make_guard(failure_threshold=1)
+    with pytest.raises(Unavailable):
+        await guard.call(fail)
+    clock[0] += 30
+
+    probe = asyncio.ensure_future(guard.call(asyncio.Event().wait))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert await guard.call(succeed) == "ok"
+    assert guard.breaker.state == CLOSED
+
+
+# =============================================================================
+# Hedging
+# =============================================================================
+
+
+class SlowCalls:
+    """fn() for the guard: every call blocks until cancelled, recording both."""
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+def hedging_guard(delay: float) -> DependencyGuard:
+    guard = make_guard(hedge=True)
+    guard._hedge_delay = delay
+    return guard
+
+
+@pytest.mark.asyncio
+async def test_caller_cancelled_before_hedge_cancels_primary():
+    guard = hedging_guard(delay=10.0)
+    calls = SlowCalls()
+
+    task = asyncio.ensure_future(guard.call(calls, idempotent=True))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+
+    assert calls.started == 1
+    assert calls.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_caller_timeout_during_hedge_cancels_both_attempts():
+    guard = hedging_guard(delay=0.01)
+    calls = SlowCalls()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(guard.call(calls, idempotent=True), timeout=0.1)
+    await asyncio.sleep(0)
+
+    assert calls.started == 2
+    assert calls.cancelled == 2
+    assert guard.counters["hedges"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_win_cancels_primary():
+    guard = hedging_guard(delay=0.01)
+    primary_cancelled = asyncio.Event()
+    attempts = []
+
+    async def fn():
+        attempts.append(None)
+        if len(attempts) == 1:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return "hedge"
+
+    assert await guard.call(fn, idempotent=True) == "hedge"
+    await asyncio.sleep(0)
+    assert primary_cancelled.is_set()
+    assert guard.counters["hedge_wins"] == 1
+
+
+def test_hedge_delay_is_nearest_rank_p95():
+    guard = make_guard(hedge=True)
+    for ms in range(1, 101):
+        guard._record_latency(ms / 1000)
+    assert guard._hedge_delay == pytest.approx(0.095)
+
+    guard = make_guard(hedge=True)
+    for ms in range(1, 31):  # 95% of 30 is 28.5 -> 29th value
+        guard._record_latency(ms / 1000)
+    assert guard._hedge_delay == pytest.approx(0.029)
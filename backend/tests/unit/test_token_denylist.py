@@ -0,0 +1,115 @@
+"""
+Tests for the in-memory access token denylist (app.core.token_denylist).
+"""
+
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+import app.core.token_denylist as token_denylist_module
+from app.core.token_denylist import TokenDenylist
+
+
+@pytest.fixture
+def revoked_table(monkeypatch, fake_db):
+    """Patch the revoked_tokens queries with an in-memory table (jti -> exp)."""
+    table = SimpleNamespace(rows={}, lookups=[])
+
+    async def insert_revoked_token(session, jti, expires_at, now):
+        table.rows[jti] = expires_at
+
+    async def is_token_revoked(session, jti):
+        table.lookups.append(jti)
+        return jti in table.rows
+
+    async def get_revoked_tokens_since(session, since, until):
+        return []
+
+    monkeypatch.setattr(token_denylist_module, "db_manager", fake_db)
+    monkeypatch.setattr(token_denylist_module, "insert_revoked_token", insert_revoked_token)
+    monkeypatch.setattr(token_denylist_module, "is_token_revoked", is_token_revoked)
+    monkeypatch.setattr(token_denylist_module, "get_revoked_tokens_since", get_revoked_tokens_since)
+    return table
+
+
+@pytest.mark.asyncio
+async def test_no_false_negatives_after_revoke(revoked_table):
+    denylist = TokenDenylist()
+    exp = int(time.time()) + 600
+    jtis = [str(uuid.uuid4()) for _ in range(5000)]
+
+    for jti in jtis:
+        await denylist.revoke(jti, exp)
+
+    assert all(denylist.might_be_revoked(jti, exp) for jti in jtis)
+    for jti in jtis[:100]:
+        assert await denylist.is_revoked(jti, exp)
+
+
+@pytest.mark.asyncio
+async def test_unrevoked_token_passes_without_lookup(revoked_table):
+    denylist = TokenDenylist()
+    exp = int(time.time()) + 600
+    await denylist.revoke(str(uuid.uuid4()), exp)
+
+    assert not await denylist.is_revoked(str(uuid.uuid4()), exp + 3600)  # No bucket for that exp
+    assert revoked_table.lookups == []
+
+
+@pytest.mark.asyncio
+async def test_expired_buckets_are_dropped_on_sync(revoked_table):
+    denylist = TokenDenylist()
+    width = denylist._bucket_seconds
+    expired_exp = int(time.time()) - 2 * width
+    live_exp = int(time.time()) + 600
+    expired_jti, live_jti = str(uuid.uuid4()), str(uuid.uuid4())
+    await denylist.revoke(expired_jti, expired_exp)
+    await denylist.revoke(live_jti, live_exp)
+    assert denylist.get_stats()["buckets"] == 2
+
+    await denylist.sync()
+
+    assert denylist.get_stats()["buckets"] == 1
+    assert not denylist.might_be_revoked(expired_jti, expired_exp)
+    assert denylist.might_be_revoked(live_jti, live_exp)
+
+
+@pytest.mark.asyncio
+async def test_false_positive_is_confirmed_then_cached(monkeypatch, revoked_table):
+    # A tiny, overfilled filter so a false positive is easy to find
+    monkeypatch.setattr(token_denylist_module.settings, "TOKEN_DENYLIST_BUCKET_CAPACITY", 1)
+    denylist = TokenDenylist()
+    exp = int(time.time()) + 600
+    for _ in range(200):
+        await denylist.revoke(str(uuid.uuid4()), exp)
+    false_positive = next(
+        jti for jti in (str(uuid.uuid4()) for _ in range(100000)) if denylist.might_be_revoked(jti, exp)
+    )
+
+    assert not await denylist.is_revoked(false_positive, exp)
+    assert revoked_table.lookups == [false_positive]
+    assert not denylist.might_be_revoked(false_positive, exp)
+
+    assert not await denylist.is_revoked(false_positive, exp)
+    assert revoked_table.lookups == [false_positive]  # Answered from the cache
+    stats = denylist.get_stats()
+    assert stats["hits"] == 1 and stats["false_positives"] == 1 and stats["confirmed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_revoking_a_cached_false_positive_takes_effect(monkeypatch, revoked_table):
+    monkeypatch.setattr(token_denylist_module.settings, "TOKEN_DENYLIST_BUCKET_CAPACITY", 1)
+    denylist = TokenDenylist()
+    exp = int(time.time()) + 600
+    for _ in range(200):
+        await denylist.revoke(str(uuid.uuid4()), exp)
+    false_positive = next(
+        jti for jti in (str(uuid.uuid4()) for _ in range(100000)) if denylist.might_be_revoked(jti, exp)
+    )
+    assert not await denylist.is_revoked(false_positive, exp)
+
+    await denylist.revoke(false_positive, exp)
+
+    assert await denylist.is_revoked(false_positive, exp)
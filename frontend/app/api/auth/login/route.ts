@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { forwardedForHeaders } from '@/lib/http/client-ip';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend.99-apps.svc.cluster.local:8000';
 
@@ -11,6 +12,8 @@ export async function POST(request: NextRequest) {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
+        // Backend rate-limits login/register per client IP (set here, never passed through)
+        ...forwardedForHeaders(request),
       },
       body: JSON.stringify(body),
     });
@@ -18,17 +21,18 @@ export async function POST(request: NextRequest) {
     const data = await response.json();
 
     if (!response.ok) {
-      return NextResponse.json(data, { status: response.status });
+      const retryAfter = response.headers.get('retry-after');
+      return NextResponse.json(data, {
+        status: response.status,
+        headers: retryAfter ? { 'Retry-After': retryAfter } : undefined,
+      });
     }
 
-    // Extract Set-Cookie header from backend response
-    const setCookieHeader = response.headers.get('set-cookie');
-
     const nextResponse = NextResponse.json(data);
 
-    // Forward cookie to browser
-    if (setCookieHeader) {
-      nextResponse.headers.set('Set-Cookie', setCookieHeader);
+    // Forward cookies (access + refresh token) to browser - one Set-Cookie header each
+    for (const cookie of response.headers.getSetCookie()) {
+      nextResponse.headers.append('Set-Cookie', cookie);
     }
 
     return nextResponse;
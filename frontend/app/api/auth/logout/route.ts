@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { forwardedForHeaders } from '@/lib/http/client-ip';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend.99-apps.svc.cluster.local:8000';
 
@@ -12,17 +13,18 @@ export async function POST(request: NextRequest) {
       headers: {
         'Content-Type': 'application/json',
         ...(cookieHeader && { 'Cookie': cookieHeader }),
+        // Backend records the client IP in the audit log (set here, never passed through)
+        ...forwardedForHeaders(request),
       },
     });
 
     const data = await response.json();
 
-    // Forward Set-Cookie header to clear auth cookie
-    const setCookieHeader = response.headers.get('set-cookie');
+    // Forward Set-Cookie headers to clear the auth and refresh cookies
     const nextResponse = NextResponse.json(data, { status: response.status });
 
-    if (setCookieHeader) {
-      nextResponse.headers.set('Set-Cookie', setCookieHeader);
+    for (const cookie of response.headers.getSetCookie()) {
+      nextResponse.headers.append('Set-Cookie', cookie);
     }
 
     return nextResponse;
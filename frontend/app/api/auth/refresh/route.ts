@@ -0,0 +1,34 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+const BACKEND_URL = process.env.BACKEND_URL || 'http://backend.99-apps.svc.cluster.local:8000';
+
+export async function POST(request: NextRequest) {
+  try {
+    // Forward cookies (refresh token) from browser request to backend
+    const cookieHeader = request.headers.get('cookie');
+
+    const response = await fetch(`${BACKEND_URL}/api/v1/auth/refresh`, {
+      method: 'POST',
+      headers: {
+        ...(cookieHeader && { 'Cookie': cookieHeader }),
+      },
+    });
+
+    const data = await response.json();
+
+    // Forward the new access + rotated refresh cookies to browser
+    const nextResponse = NextResponse.json(data, { status: response.status });
+
+    for (const cookie of response.headers.getSetCookie()) {
+      nextResponse.headers.append('Set-Cookie', cookie);
+    }
+
+    return nextResponse;
+  } catch (error) {
+    console.error('Refresh API route error:', error);
+    return NextResponse.json(
+      { detail: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { forwardedForHeaders } from '@/lib/http/client-ip';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend.99-apps.svc.cluster.local:8000';
 
@@ -10,13 +11,19 @@ export async function POST(request: NextRequest) {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
+        // Backend rate-limits login/register per client IP (set here, never passed through)
+        ...forwardedForHeaders(request),
       },
       body: JSON.stringify(body),
     });
 
     const data = await response.json();
 
-    return NextResponse.json(data, { status: response.status });
+    const retryAfter = response.headers.get('retry-after');
+    return NextResponse.json(data, {
+      status: response.status,
+      headers: retryAfter ? { 'Retry-After': retryAfter } : undefined,
+    });
   } catch (error) {
     console.error('Register API route error:', error);
     return NextResponse.json(
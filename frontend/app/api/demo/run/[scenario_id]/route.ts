@@ -8,7 +8,7 @@ export async function GET(
 ) {
   const { scenario_id } = await params;
   try {
-    const response = await fetch(`${BACKEND_URL}/api/v1/demo/run/${scenario_id}`);
+    const response = await fetch(`${BACKEND_URL}/api/v1/demo/run/${scenario_id}${request.nextUrl.search}`);
     const data = await response.json();
     return NextResponse.json(data, { status: response.status });
   } catch (error) {
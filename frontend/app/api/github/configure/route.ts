@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { forwardedForHeaders } from '@/lib/http/client-ip';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend.99-apps.svc.cluster.local:8000';
 
@@ -12,6 +13,8 @@ export async function POST(request: NextRequest) {
       headers: {
         'Content-Type': 'application/json',
         ...(cookieHeader && { 'Cookie': cookieHeader }),
+        // Backend records the client IP in the audit log (set here, never passed through)
+        ...forwardedForHeaders(request),
       },
       body: JSON.stringify(body),
     });
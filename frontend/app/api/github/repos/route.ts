@@ -6,7 +6,8 @@ export async function GET(request: NextRequest) {
   try {
     const cookieHeader = request.headers.get('cookie');
 
-    const response = await fetch(`${BACKEND_URL}/api/v1/github/repos`, {
+    // Forward search/sort/paging parameters unchanged
+    const response = await fetch(`${BACKEND_URL}/api/v1/github/repos${request.nextUrl.search}`, {
       method: 'GET',
       headers: {
         ...(cookieHeader && { 'Cookie': cookieHeader }),
@@ -30,11 +30,12 @@ import {
   Autorenew,
   Lock,
   Warning,
+  Speed,
 } from '@mui/icons-material';
 import NavBar from '@/components/NavBar';
 import ProtectedRoute from '@/components/ProtectedRoute';
 import { demoAPI } from '@/lib/api/client';
-import type { DemoScenarioMeta, ScenarioResult, RotationResult } from '@/types';
+import type { DemoScenarioMeta, ScenarioResult, RotationResult, MonitoredScenario, ProbeMonitorStats } from '@/types';
 
 // ── icons per scenario ──────────────────────────────────────────────────────
 const SCENARIO_ICONS: Record<string, React.ReactNode> = {
@@ -44,6 +45,8 @@ const SCENARIO_ICONS: Record<string, React.ReactNode> = {
   'dynamic-db-credentials':    <Shield fontSize="large" />,
   'blocked-spire-direct':      <Lock fontSize="large" />,
   'blocked-postgres-wrong-ns': <Warning fontSize="large" />,
+  'latency-backend-to-postgres': <Speed fontSize="large" />,
+  'latency-backend-to-openbao':  <Speed fontSize="large" />,
 };
 
 // ── small helpers ────────────────────────────────────────────────────────────
@@ -79,10 +82,26 @@ function ExtraDetails({ extra }: { extra: Record<string, unknown> }) {
   );
 }
 
+function MonitorSummary({ monitor }: { monitor: MonitoredScenario }) {
+  if (!monitor.last || monitor.as_expected_rate === null) return null;
+  const lastChecked = new Date(monitor.last.timestamp * 1000).toLocaleTimeString();
+  const since = monitor.oldest ? new Date(monitor.oldest * 1000).toLocaleString() : '';
+  const latency = monitor.p50_ms !== null ? ` · connect p50 ${monitor.p50_ms} ms, p95 ${monitor.p95_ms} ms` : '';
+  return (
+    <Tooltip title={`${monitor.samples} background probes since ${since}; ${monitor.transitions} outcome change(s)`}>
+      <Typography variant="caption" color={monitor.as_expected_rate < 1 ? 'warning.main' : 'text.secondary'}
+        sx={{ display: 'block', mt: 1 }}>
+        Monitored: {(monitor.as_expected_rate * 100).toFixed(1)}% as expected{latency} · last checked {lastChecked}
+      </Typography>
+    </Tooltip>
+  );
+}
+
 // ── scenario card ────────────────────────────────────────────────────────────
-function ScenarioCard({ scenario, result, running, onRun }: {
+function ScenarioCard({ scenario, result, monitor, running, onRun }: {
   scenario: DemoScenarioMeta;
   result: ScenarioResult | null;
+  monitor?: MonitoredScenario;
   running: boolean;
   onRun: () => void;
 }) {
@@ -116,6 +135,7 @@ function ScenarioCard({ scenario, result, running, onRun }: {
         <Typography variant="body2" color="text.secondary" sx={{ mb: 2 }}>
           {scenario.description}
         </Typography>
+        {monitor && <MonitorSummary monitor={monitor} />}
 
         {hasResult && (
           <Box>
@@ -340,11 +360,14 @@ export default function DemoPage() {
   const [running, setRunning] = useState<Record<string, boolean>>({});
   const [loadError, setLoadError] = useState<string | null>(null);
   const [runningAll, setRunningAll] = useState(false);
+  const [monitor, setMonitor] = useState<ProbeMonitorStats | null>(null);
 
   useEffect(() => {
     demoAPI.listScenarios()
       .then(data => setScenarios(data.scenarios))
       .catch(() => setLoadError('Failed to load scenarios — is the backend running?'));
+    // Background probe history - optional, the cards work without it
+    demoAPI.getMonitor().then(setMonitor).catch(() => setMonitor(null));
   }, []);
 
   const runScenario = async (id: string) => {
@@ -371,6 +394,7 @@ export default function DemoPage() {
 
   const allowed = scenarios.filter(s => s.category === 'allowed');
   const blocked = scenarios.filter(s => s.category === 'blocked');
+  const latency = scenarios.filter(s => s.category === 'latency');
 
   const allRan = scenarios.length > 0 && scenarios.every(s => results[s.id]);
   const allPassed = allRan && scenarios.every(s => results[s.id].status === results[s.id].expected);
@@ -442,6 +466,7 @@ export default function DemoPage() {
               <Box sx={{ display: 'grid', gridTemplateColumns: { xs: '1fr', md: 'repeat(2, 1fr)' }, gap: 3 }}>
                 {allowed.map(s => (
                   <ScenarioCard key={s.id} scenario={s} result={results[s.id] ?? null}
+                    monitor={monitor?.scenarios[s.id]}
                     running={!!running[s.id]} onRun={() => runScenario(s.id)} />
                 ))}
               </Box>
@@ -461,6 +486,27 @@ export default function DemoPage() {
               </Typography>
               <Box sx={{ display: 'grid', gridTemplateColumns: { xs: '1fr', md: 'repeat(2, 1fr)' }, gap: 3 }}>
                 {blocked.map(s => (
+                  <ScenarioCard key={s.id} scenario={s} result={results[s.id] ?? null}
+                    monitor={monitor?.scenarios[s.id]}
+                    running={!!running[s.id]} onRun={() => runScenario(s.id)} />
+                ))}
+              </Box>
+            </Box>
+          )}
+
+          {/* LATENCY section */}
+          {latency.length > 0 && (
+            <Box sx={{ mb: 4 }}>
+              <Box sx={{ display: 'flex', alignItems: 'center', gap: 1, mb: 2 }}>
+                <Speed color="primary" />
+                <Typography variant="h5" fontWeight={600}>Connect Latency — Cost of Enforcement</Typography>
+              </Box>
+              <Typography variant="body2" color="text.secondary" sx={{ mb: 2 }}>
+                Sequential and concurrent connects (and TLS handshakes) from the backend pod. Run with Cilium policy
+                enforcement on and off and compare the percentiles to see what each hop pays.
+              </Typography>
+              <Box sx={{ display: 'grid', gridTemplateColumns: { xs: '1fr', md: 'repeat(2, 1fr)' }, gap: 3 }}>
+                {latency.map(s => (
                   <ScenarioCard key={s.id} scenario={s} result={results[s.id] ?? null}
                     running={!!running[s.id]} onRun={() => runScenario(s.id)} />
                 ))}
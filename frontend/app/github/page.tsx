@@ -58,6 +58,10 @@ export default function GitHubPage() {
   // Repos tab state
   const [repos, setRepos] = useState<GitHubRepo[]>([]);
   const [loadingRepos, setLoadingRepos] = useState(false);
+  const [repoSearch, setRepoSearch] = useState('');
+  const [repoSort, setRepoSort] = useState<'updated' | 'stars' | 'name'>('updated');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [totalRepos, setTotalRepos] = useState(0);
 
   // User tab state
   const [user, setUser] = useState<GitHubUser | null>(null);
@@ -87,16 +91,27 @@ export default function GitHubPage() {
     }
   };
 
-  const handleFetchRepos = async () => {
+  // Search, sort and paging happen server-side; "Load more" follows the cursor
+  const handleFetchRepos = async (more = false) => {
     setLoadingRepos(true);
     try {
-      const data = await githubAPI.getRepositories();
-      setRepos(data);
-      enqueueSnackbar(`Loaded ${data.length} repositories`, { variant: 'success' });
+      const data = await githubAPI.getRepositories({
+        q: repoSearch.trim() || undefined,
+        sort: repoSort,
+        order: repoSort === 'name' ? 'asc' : 'desc',
+        cursor: more ? nextCursor ?? undefined : undefined,
+      });
+      setRepos(more ? [...repos, ...data.items] : data.items);
+      setNextCursor(data.next_cursor);
+      setTotalRepos(data.total);
+      if (!more) {
+        enqueueSnackbar(`Found ${data.total} repositories`, { variant: 'success' });
+      }
     } catch (err) {
       const error = err as APIError;
       enqueueSnackbar(error.detail, { variant: 'error' });
       setRepos([]);
+      setNextCursor(null);
     } finally {
       setLoadingRepos(false);
     }
@@ -199,13 +214,37 @@ export default function GitHubPage() {
                   </Typography>
                   <Button
                     variant="contained"
-                    onClick={handleFetchRepos}
+                    onClick={() => handleFetchRepos()}
                     disabled={loadingRepos}
                   >
                     {loadingRepos ? <CircularProgress size={24} /> : 'Load Repositories'}
                   </Button>
                 </Box>
 
+                <Box sx={{ display: 'flex', gap: 2, mb: 2 }}>
+                  <TextField
+                    size="small"
+                    label="Search name or description"
+                    value={repoSearch}
+                    onChange={(e) => setRepoSearch(e.target.value)}
+                    onKeyDown={(e) => e.key === 'Enter' && handleFetchRepos()}
+                    sx={{ flexGrow: 1 }}
+                  />
+                  <TextField
+                    select
+                    size="small"
+                    label="Sort"
+                    value={repoSort}
+                    onChange={(e) => setRepoSort(e.target.value as 'updated' | 'stars' | 'name')}
+                    SelectProps={{ native: true }}
+                    sx={{ minWidth: 160 }}
+                  >
+                    <option value="updated">Recently updated</option>
+                    <option value="stars">Stars</option>
+                    <option value="name">Name</option>
+                  </TextField>
+                </Box>
+
                 {repos.length === 0 && !loadingRepos && (
                   <Alert severity="info">
                     Click "Load Repositories" to fetch your GitHub repos using the token stored in Vault.
@@ -249,6 +288,14 @@ export default function GitHubPage() {
                     </Card>
                   ))}
                 </Box>
+
+                {nextCursor && (
+                  <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+                    <Button onClick={() => handleFetchRepos(true)} disabled={loadingRepos}>
+                      Load more ({repos.length} of {totalRepos})
+                    </Button>
+                  </Box>
+                )}
               </Box>
             </TabPanel>
 
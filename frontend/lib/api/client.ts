@@ -1,16 +1,18 @@
-import axios, { AxiosError, AxiosInstance } from 'axios';
+import axios, { AxiosError, AxiosInstance, InternalAxiosRequestConfig } from 'axios';
 import type {
   User,
   LoginRequest,
   RegisterRequest,
   AuthResponse,
-  GitHubRepo,
+  GitHubRepoPage,
+  GitHubRepoQuery,
   GitHubUser,
   GitHubConfigureRequest,
   HealthResponse,
   APIError,
   DemoScenarioMeta,
   ScenarioResult,
+  ProbeMonitorStats,
   RotationResult,
 } from '@/types';
 
@@ -27,10 +29,45 @@ const apiClient: AxiosInstance = axios.create({
   withCredentials: true, // Important for httpOnly cookies
 });
 
-// Response interceptor for error handling
+// Auth endpoints that must not trigger a session refresh on 401
+const NO_REFRESH_PATHS = ['/auth/login', '/auth/register', '/auth/refresh'];
+
+// One refresh in flight at a time - concurrent 401s wait for the same one
+let refreshPromise: Promise<void> | null = null;
+
+const refreshSession = (): Promise<void> => {
+  if (!refreshPromise) {
+    refreshPromise = apiClient
+      .post('/auth/refresh')
+      .then(() => undefined)
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
+// Response interceptor: renew an expired access token once via the refresh
+// cookie and retry, then map errors to APIError
 apiClient.interceptors.response.use(
   (response) => response,
-  (error: AxiosError<APIError>) => {
+  async (error: AxiosError<APIError>) => {
+    const original = error.config as (InternalAxiosRequestConfig & { _retried?: boolean }) | undefined;
+    if (
+      error.response?.status === 401 &&
+      original &&
+      !original._retried &&
+      !NO_REFRESH_PATHS.includes(original.url || '')
+    ) {
+      original._retried = true;
+      try {
+        await refreshSession();
+        return apiClient(original);
+      } catch {
+        // Refresh failed - fall through with the original 401
+      }
+    }
+
     const apiError: APIError = {
       detail: error.response?.data?.detail || error.message || 'An error occurred',
       status: error.response?.status,
@@ -69,8 +106,8 @@ export const githubAPI = {
     return response.data;
   },
 
-  getRepositories: async (): Promise<GitHubRepo[]> => {
-    const response = await apiClient.get<GitHubRepo[]>('/github/repos');
+  getRepositories: async (query: GitHubRepoQuery = {}): Promise<GitHubRepoPage> => {
+    const response = await apiClient.get<GitHubRepoPage>('/github/repos', { params: query });
     return response.data;
   },
 
@@ -98,6 +135,10 @@ export const demoAPI = {
     const response = await apiClient.get<ScenarioResult>(`/demo/run/${scenarioId}`);
     return response.data;
   },
+  getMonitor: async (): Promise<ProbeMonitorStats> => {
+    const response = await apiClient.get<ProbeMonitorStats>('/demo/monitor');
+    return response.data;
+  },
   rotateCredentials: async (): Promise<RotationResult> => {
     const response = await apiClient.post<RotationResult>('/demo/rotate-credentials');
     return response.data;
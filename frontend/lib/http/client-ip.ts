@@ -0,0 +1,27 @@
+import { NextRequest } from 'next/server';
+
+/**
+ * Address of the peer that connected to this server, for the backend's
+ * per-IP rate limits and audit log.
+ *
+ * Only the rightmost X-Forwarded-For hop is used: it is the one recorded by
+ * the hop in front of us (the Next.js server itself fills the header from the
+ * socket when the request has none). Hops to its left are client-supplied
+ * and would let anyone pick a fresh rate-limit bucket per request.
+ */
+export function clientIp(request: NextRequest): string | null {
+  const hops = (request.headers.get('x-forwarded-for') ?? '')
+    .split(',')
+    .map((hop) => hop.trim())
+    .filter(Boolean);
+  return hops.length ? hops[hops.length - 1] : request.headers.get('x-real-ip');
+}
+
+/**
+ * Headers for a backend call that carry exactly one X-Forwarded-For hop -
+ * the client address - replacing whatever the browser sent.
+ */
+export function forwardedForHeaders(request: NextRequest): Record<string, string> {
+  const ip = clientIp(request);
+  return ip ? { 'X-Forwarded-For': ip } : {};
+}
@@ -35,6 +35,21 @@ export interface GitHubRepo {
   updated_at: string;
 }
 
+export interface GitHubRepoPage {
+  items: GitHubRepo[];
+  next_cursor: string | null;
+  total: number;
+}
+
+export interface GitHubRepoQuery {
+  q?: string;
+  language?: string;
+  sort?: 'updated' | 'stars' | 'name';
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string;
+}
+
 export interface GitHubUser {
   login: string;
   id: number;
@@ -71,7 +86,7 @@ export interface DemoScenarioMeta {
   title: string;
   description: string;
   expected: 'allowed' | 'blocked';
-  category: 'allowed' | 'blocked';
+  category: 'allowed' | 'blocked' | 'latency';
 }
 
 export interface ScenarioResult {
@@ -85,6 +100,39 @@ export interface ScenarioResult {
   extra?: Record<string, unknown>;
 }
 
+export interface ProbeSample {
+  timestamp: number;
+  connected: boolean;
+  latency_ms: number;
+}
+
+export interface MonitoredScenario {
+  scenario: string;
+  host: string;
+  port: number;
+  expected: 'allowed' | 'blocked';
+  status: 'allowed' | 'blocked' | null;
+  transitions: number;
+  last_transition: number | null;
+  as_expected_rate: number | null;
+  last: ProbeSample | null;
+  samples: number;
+  connected: number;
+  connect_rate: number | null;
+  p50_ms: number | null;
+  p95_ms: number | null;
+  p99_ms: number | null;
+  oldest: number | null;
+}
+
+export interface ProbeMonitorStats {
+  running: boolean;
+  interval: number;
+  timeout: number;
+  rounds: number;
+  scenarios: Record<string, MonitoredScenario>;
+}
+
 export interface RotationResult {
   old_username: string;
   new_username: string;
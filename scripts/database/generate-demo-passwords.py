@@ -2,8 +2,20 @@
 """
 Generate bcrypt password hashes for demo users.
 Run this script to get the actual hashes to use in init-db.sql
+
+Usage:
+    python generate-demo-passwords.py [--rounds 12]
+
+Use the backend's BCRYPT_ROUNDS (see `python -m app.core.password_hashing`).
+Seed hashes below the backend's cost are upgraded on the user's next login.
+
+For bulk accounts (onboarding, load-test fixtures) use the provisioning CLI,
+which hashes in parallel and loads with COPY (from backend/):
+    python -m app.core.user_provisioning users.csv
 """
 
+import argparse
+
 import bcrypt
 
 # Demo users (Brooklyn Nine-Nine theme)
@@ -17,13 +29,16 @@ users = [
     ("gina", "gina-precinct99"),
 ]
 
-print("-- Demo User Password Hashes (bcrypt, cost factor 12)")
+parser = argparse.ArgumentParser(description="Generate bcrypt hashes for the demo users")
+parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+args = parser.parse_args()
+
+print(f"-- Demo User Password Hashes (bcrypt, cost factor {args.rounds})")
 print("-- Copy these into init-db.sql")
 print()
 
 for username, password in users:
-    # Generate bcrypt hash with cost factor 12
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=args.rounds)
     password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
     hash_str = password_hash.decode('utf-8')
 
@@ -32,9 +32,76 @@ CREATE TABLE IF NOT EXISTS github_integrations (
 -- Create index on user_id for faster lookups
 CREATE INDEX IF NOT EXISTS idx_github_integrations_user_id ON github_integrations(user_id);
 
--- Audit log table
+-- Recently active users, scanned by the background GitHub refresher
+CREATE INDEX IF NOT EXISTS idx_github_integrations_last_accessed ON github_integrations(last_accessed_at DESC) WHERE is_configured;
+
+-- GitHub repository sync state (incremental sync: since high-water mark + ETag)
+ALTER TABLE github_integrations ADD COLUMN IF NOT EXISTS repos_etag VARCHAR(255);
+ALTER TABLE github_integrations ADD COLUMN IF NOT EXISTS repos_since TIMESTAMP;
+ALTER TABLE github_integrations ADD COLUMN IF NOT EXISTS repos_synced_at TIMESTAMP;
+ALTER TABLE github_integrations ADD COLUMN IF NOT EXISTS repos_full_synced_at TIMESTAMP;
+
+-- GitHub repository snapshot (served when GitHub is slow or rate-limited)
+CREATE TABLE IF NOT EXISTS github_repositories (
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    repo_id BIGINT NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    full_name VARCHAR(255) NOT NULL,
+    description TEXT,
+    private BOOLEAN NOT NULL,
+    html_url VARCHAR(512) NOT NULL,
+    language VARCHAR(100),
+    stargazers_count INTEGER DEFAULT 0 NOT NULL,
+    forks_count INTEGER DEFAULT 0 NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_id, repo_id)
+);
+
+-- Refresh tokens: opaque tokens stored as SHA-256, rotated on every use.
+-- Tokens from one login share a family_id; replaying a rotated token revokes the family.
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    token_hash CHAR(64) NOT NULL UNIQUE,
+    family_id UUID NOT NULL,
+    parent_id BIGINT REFERENCES refresh_tokens(id) ON DELETE SET NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    rotated_at TIMESTAMP,
+    revoked_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family_id ON refresh_tokens(family_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_expires ON refresh_tokens(user_id, expires_at);
+
+-- Access tokens revoked before expiry (logout), by jti claim
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(64) PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_revoked_at ON revoked_tokens(revoked_at);
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at ON revoked_tokens(expires_at);
+
+-- Audit log, range-partitioned by month on created_at. Partitions are created
+-- ahead and dropped whole for retention by audit_log_maintain() (called by the
+-- backend); queries page by (created_at, id) within each user's history.
+-- No DEFAULT partition: it would disable ordered Append (pages would merge
+-- every partition) and make each new partition scan it.
+-- An unpartitioned audit_log from an earlier schema is set aside.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('audit_log') AND relkind = 'r') THEN
+        ALTER TABLE audit_log RENAME TO audit_log_unpartitioned;
+        RAISE NOTICE 'Renamed unpartitioned audit_log to audit_log_unpartitioned';
+    END IF;
+END $$;
+
 CREATE TABLE IF NOT EXISTS audit_log (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
     action VARCHAR(100) NOT NULL,
     resource_type VARCHAR(50),
@@ -42,13 +109,71 @@ CREATE TABLE IF NOT EXISTS audit_log (
     details JSONB,
     ip_address INET,
     user_agent TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
-);
+    created_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'UTC') NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Keyset pages per user, optionally filtered by action (created on every partition)
+CREATE INDEX IF NOT EXISTS idx_audit_log_user_created ON audit_log(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_log_user_action_created ON audit_log(user_id, action, created_at DESC, id DESC);
+
+-- Create the monthly partitions from this month to months_ahead months out and
+-- drop those entirely older than retention_months before this month (0 keeps
+-- everything). SECURITY DEFINER: the backend's Vault-issued roles only have
+-- DML grants. Returns one row per partition created or dropped.
+CREATE OR REPLACE FUNCTION audit_log_maintain(months_ahead INTEGER, retention_months INTEGER)
+RETURNS TABLE (change TEXT, partition_name TEXT)
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    this_month DATE := date_trunc('month', CURRENT_TIMESTAMP AT TIME ZONE 'UTC')::date;
+    month_start DATE;
+    expired RECORD;
+BEGIN
+    -- Replicas run this concurrently; serialize so CREATE/DROP never race
+    PERFORM pg_advisory_xact_lock(hashtext('audit_log_maintain'));
+
+    FOR i IN 0..months_ahead LOOP
+        month_start := (this_month + make_interval(months => i))::date;
+        partition_name := 'audit_log_p' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+                           partition_name, month_start, (month_start + interval '1 month')::date);
+            change := 'created';
+            RETURN NEXT;
+        END IF;
+    END LOOP;
+
+    IF retention_months > 0 THEN
+        FOR expired IN
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'audit_log'::regclass
+              AND c.relname ~ '^audit_log_p[0-9]{6}$'
+              AND to_date(substr(c.relname, 12), 'YYYYMM') < this_month - make_interval(months => retention_months)
+            ORDER BY c.relname
+        LOOP
+            EXECUTE format('DROP TABLE %I', expired.relname);
+            change := 'dropped';
+            partition_name := expired.relname;
+            RETURN NEXT;
+        END LOOP;
+    END IF;
+END;
+$$;
+
+-- The function runs with its owner's rights and can drop partitions: only
+-- members of audit_maintainer may call it. Vault's backend-role grants the
+-- membership to each read-write credential; the read-only role never gets it.
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'audit_maintainer') THEN
+        CREATE ROLE audit_maintainer NOLOGIN;
+    END IF;
+END $$;
+
+REVOKE EXECUTE ON FUNCTION audit_log_maintain(INTEGER, INTEGER) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION audit_log_maintain(INTEGER, INTEGER) TO audit_maintainer;
 
--- Create indexes on audit_log for faster queries
-CREATE INDEX IF NOT EXISTS idx_audit_log_user_id ON audit_log(user_id);
-CREATE INDEX IF NOT EXISTS idx_audit_log_action ON audit_log(action);
-CREATE INDEX IF NOT EXISTS idx_audit_log_created_at ON audit_log(created_at);
+SELECT * FROM audit_log_maintain(2, 0);
 
 -- Insert demo users (Brooklyn Nine-Nine theme)
 -- Passwords are bcrypt hashed with cost factor 12